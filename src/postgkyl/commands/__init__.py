@@ -7,6 +7,7 @@ from postgkyl.commands.agyro import mom_agyro
 from postgkyl.commands.animate import animate
 from postgkyl.commands.bparrotate import bparrotate
 from postgkyl.commands.bperprotate import bperprotate
+from postgkyl.commands.cache import cache
 from postgkyl.commands.collect import collect
 from postgkyl.commands.current import current
 from postgkyl.commands.differentiate import differentiate
@@ -40,6 +41,7 @@ from postgkyl.commands.relchange import relchange
 from postgkyl.commands.select import select
 from postgkyl.commands.status import activate
 from postgkyl.commands.status import deactivate
+from postgkyl.commands.stats import stats
 from postgkyl.commands.style import style
 from postgkyl.commands.tenmoment import tenmoment
 from postgkyl.commands.trajectory import trajectory
@@ -3,6 +3,7 @@ import click
 import matplotlib.pyplot as plt
 import numpy as np
 
+from postgkyl.data import FramePrefetcher
 from postgkyl.utils import verb_print, set_frame
 import postgkyl.output.plot
 
@@ -63,17 +64,19 @@ def globalrange(data,kwargs):
   for dat in data:
     num_dims = dat.get_num_dims()
     if num_dims == 1:
-      val = dat.get_values()*kwargs["yscale"]
+      scale = kwargs["yscale"]
     else:
-      val = dat.get_values()*kwargs["zscale"]
+      scale = kwargs["zscale"]
     # end
-    if vmin > np.nanmin(val):
-      vmin = np.nanmin(val)
-    if vmax < np.nanmax(val):
-      vmax = np.nanmax(val)
+    # Uses the sidecar statistics when available instead of reading the values
+    val_min, val_max = sorted(np.multiply(dat.get_value_range(), scale))
+    if vmin > val_min:
+      vmin = val_min
+    if vmax < val_max:
+      vmax = val_max
     # end
-    v_extrema = np.append(v_extrema, np.nanmin(val))
-    v_extrema = np.append(v_extrema, np.nanmax(val))
+    v_extrema = np.append(v_extrema, val_min)
+    v_extrema = np.append(v_extrema, val_max)
   # end
   v_extrema = np.sort(v_extrema)
   if kwargs["cutoffglobalrange"]:
@@ -172,6 +175,8 @@ def globalrange(data,kwargs):
     help="Save individual frames as PNGS instead of an animation")
 @click.option("--figsize", help="Comma-separated values for x and y size.")
 @click.option("-m", "--multiblock", is_flag=True, help="Plots blocks from each frame together")
+@click.option("--prefetch", default=2, type=click.INT, show_default=True,
+    help="Number of frames read in the background ahead of rendering (lazily loaded data).")
 @click.pass_context
 def animate(ctx, **kwargs):
   """Animate the actively loaded dataset and show resulting plots in a loop.
@@ -196,7 +201,10 @@ def animate(ctx, **kwargs):
   # end
 
   if not kwargs["float"] and not kwargs["grouptags"]:
-    vmin, vmax, num_dims = globalrange(data.iterator(kwargs["use"]), kwargs)
+    # Frames without the sidecar statistics are read in the background and released
+    frames = data.iterator(kwargs["use"], prefetch=kwargs["prefetch"],
+        needed=lambda dat: dat.get_stats() is None)
+    vmin, vmax, num_dims = globalrange(frames, kwargs)
     if num_dims == 1:
       if kwargs["ymin"] is None:
         kwargs["ymin"] = vmin
@@ -261,6 +269,7 @@ def animate(ctx, **kwargs):
       for dat in data.iterator(tag):
         data_list.append([dat])
       # end
+      data_list = FramePrefetcher(data_list, depth=kwargs["prefetch"])
       figs.append(plt.figure(fig_num, figsize=figsize))
       fig_num += 1
       
@@ -300,9 +309,10 @@ def animate(ctx, **kwargs):
     data_list = []
     #organize data objects so each interior list includes blocks from one frame
     for frame in sorted_frame_list:
-      frame_data_list = [dat for dat in data.iterator(kwargs["use"]) if dat.ctx["frame"] == frame]
+      frame_data_list = data.get_frame(frame, kwargs["use"])
       data_list.append(frame_data_list)
     # end
+    data_list = FramePrefetcher(data_list, depth=kwargs["prefetch"])
 
     figs.append(plt.figure(figsize=figsize))
     #makes default color blue in 1D cases, this prevents blocks from having different colors
@@ -338,6 +348,7 @@ def animate(ctx, **kwargs):
     for dat in data.iterator(kwargs["use"]):
       data_list.append([dat])
     # end
+    data_list = FramePrefetcher(data_list, depth=kwargs["prefetch"])
     if set_figure:
       figs.append(plt.figure(fig_num, figsize=figsize))
     else:
@@ -0,0 +1,49 @@
+import click
+import os
+
+from postgkyl.data import matrix_cache
+from postgkyl.utils import verb_print
+
+_basis_types = {"ms": "serendipity", "mo": "maximal-order", "mt": "tensor",
+    "gkhyb": "gkhybrid", "pkpmhyb": "hybrid"}
+
+
+@click.command()
+@click.option("--warm", "-w", is_flag=True,
+    help="Pre-compute interpolation and derivative matrices.")
+@click.option("--clear", is_flag=True, help="Remove all cached matrices.")
+@click.option("--basis_type", "-b", type=click.Choice(list(_basis_types.keys())),
+    multiple=True, help="Limit warming to DG basis (default all).")
+@click.option("--poly_order", "-p", type=click.INT, multiple=True,
+    help="Limit warming to polynomial order (default all).")
+@click.option("--dims", "-d", type=click.INT, multiple=True,
+    help="Limit warming to number of dimensions (default all).")
+@click.pass_context
+def cache(ctx, **kwargs):
+  """Manage the on-disk cache of DG interpolation matrices.
+
+  Without options, the location of the cache and the number of cached matrices is
+  printed.
+  """
+  verb_print(ctx, "Starting cache")
+
+  if kwargs["clear"]:
+    matrix_cache.clear()
+  # end
+
+  if kwargs["warm"]:
+    basis_types = [_basis_types[b] for b in kwargs["basis_type"]]
+    cnt = matrix_cache.warm(dims=list(kwargs["dims"]),
+        poly_orders=list(kwargs["poly_order"]), basis_types=basis_types,
+        callback=lambda fn: verb_print(ctx, f"Cached {os.path.basename(fn):s}"))
+    click.echo(f"Generated {cnt:d} matrices")
+  # end
+
+  cache_dir = matrix_cache.get_cache_dir()
+  num_files = 0
+  if os.path.isdir(cache_dir):
+    num_files = len([fn for fn in os.listdir(cache_dir) if fn.endswith(".npz")])
+  # end
+  click.echo(f"Matrix cache: {cache_dir:s} ({num_files:d} matrices)")
+
+  verb_print(ctx, "Finishing cache")
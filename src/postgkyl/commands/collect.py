@@ -2,6 +2,7 @@ import click
 import numpy as np
 
 from postgkyl.data import GData
+from postgkyl.data.prefetch import prefetch as data_prefetch
 from postgkyl.utils import verb_print
 
 
@@ -17,6 +18,8 @@ from postgkyl.utils import verb_print
 @click.option("--use", "-u", default=None, help="Specify a 'tag' to apply to (default all tags).")
 @click.option("--tag", "-t", default=None, help="Specify a 'tag' for the result.")
 @click.option("--label", "-l", default=None, help="Specify the custom label for the result.")
+@click.option("--prefetch", default=2, type=click.INT, show_default=True,
+    help="Number of datasets read in the background ahead (lazily loaded data).")
 @click.pass_context
 def collect(ctx, **kwargs):
   """Collect data from the active datasets and create a new combined dataset.
@@ -34,38 +37,22 @@ def collect(ctx, **kwargs):
 
   tag_cnt = 0
   for tag in data.tag_iterator(kwargs["use"]):
-    time = [[]]
-    values = [[]]
-    grid = [[]]
-    cnt = 0
+    # The times are known from the metadata, so the frames are read only once, directly
+    # into the preallocated output in the sorted order
+    chunks = [[]]
     label = None
-
     for i, dat in data.iterator(tag, enum=True):
-      cnt += 1
-      if kwargs["chunk"] and cnt > kwargs["chunk"]:
-        cnt = 1
-        time.append([])
-        values.append([])
-        grid.append([])
+      if kwargs["chunk"] and len(chunks[-1]) == kwargs["chunk"]:
+        chunks.append([])
       # end
-      if dat.ctx["time"]:
-        time[-1].append(dat.ctx["time"])
-      elif dat.ctx["frame"]:
-        time[-1].append(dat.ctx["frame"])
+      if dat.ctx.get("time"):
+        t = dat.ctx["time"]
+      elif dat.ctx.get("frame"):
+        t = dat.ctx["frame"]
       else:
-        time[-1].append(i)
-      # end
-      val = dat.get_values()
-      if kwargs["sumdata"]:
-        num_dims = dat.get_num_dims()
-        axis = tuple(range(num_dims))
-        values[-1].append(np.nansum(val, axis=axis))
-      else:
-        values[-1].append(val)
-      # end
-      if not grid[-1]:
-        grid[-1] = dat.get_grid().copy()
+        t = i
       # end
+      chunks[-1].append((t, dat))
       label = dat.get_custom_label()
     # end
 
@@ -88,26 +75,36 @@ def collect(ctx, **kwargs):
       label = kwargs["label"]
     # end
 
-    for i in range(len(time)):
-      time[i] = np.array(time[i])
-      values[i] = np.array(values[i])
-
+    for chunk in chunks:
+      if not chunk:
+        continue
+      # end
+      time = np.array([np.squeeze(t) for t, _ in chunk], dtype=float)
       if kwargs.get("period"):
-        time[i] = (time[i] - kwargs["offset"]) % kwargs["period"]
+        time = (time - kwargs["offset"]) % kwargs["period"]
       # end
-
-      sort_idx = np.argsort(time[i])
-      time[i] = time[i][sort_idx]
-      values[i] = values[i][sort_idx]
+      sort_idx = np.argsort(time)
+      time = time[sort_idx]
+      datasets = [chunk[k][1] for k in sort_idx]
 
       if kwargs["sumdata"]:
-        grid[i] = [time[i]]
+        values = None
+        for k, dat in enumerate(data_prefetch(datasets, depth=kwargs["prefetch"],
+            release=True)):
+          axis = tuple(range(dat.get_num_dims()))
+          val = np.nansum(dat.get_values(), axis=axis)
+          if values is None:
+            values = np.empty((len(datasets),) + val.shape, dtype=val.dtype)
+          # end
+          values[k] = val
+        # end
+        out = GData(tag=out_tag, label=label, comp_grid=ctx.obj["compgrid"])
+        out.push([time], values)
       else:
-        grid[i].insert(0, np.array(time[i]))
+        # The frames become views into the collected values
+        out = GData.stack(datasets, time=time, prefetch=kwargs["prefetch"], tag=out_tag,
+            label=label, comp_grid=ctx.obj["compgrid"])
       # end
-
-      out = GData(tag=out_tag, label=label, comp_grid=ctx.obj["compgrid"])
-      out.push(grid[i], values[i])
       data.add(out)
     # end
   # end
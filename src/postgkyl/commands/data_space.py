@@ -1,23 +1,95 @@
 """Postgkyl submodule to provide iterators in hte command line mode."""
 from __future__ import annotations
 
+from bisect import bisect_left
+from collections import OrderedDict
+from functools import lru_cache
 import click
 import numpy as np
-from typing import Iterator, TYPE_CHECKING
+import tempfile
+from typing import Callable, Iterator
+
+from postgkyl.data.gdata import GData
+from postgkyl.data.prefetch import prefetch as data_prefetch
+
+
+_memory_units = {"": 1, "B": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_memory_size(size: str | int | None) -> int | None:
+  """Converts memory size like '512M' or '2.5G' to bytes (binary prefixes)."""
+  if size is None or isinstance(size, int):
+    return size
+  # end
+  s = str(size).strip().upper()
+  if s.endswith("IB"):
+    s = s[:-2]
+  elif s.endswith("B") and len(s) > 1 and s[-2] in _memory_units:
+    s = s[:-1]
+  # end
+  unit = s[-1] if s and s[-1] in _memory_units else ""
+  try:
+    return int(float(s[: len(s) - len(unit)]) * _memory_units[unit])
+  except ValueError:
+    raise ValueError(f"Cannot convert '{size}' to memory size")
+  # end
+
+
+@lru_cache(maxsize=64)
+def _parse_select(select: str) -> slice | tuple:
+  # 'lo:hi[:step]' or comma separated indices; the chains use the same strings for
+  # every dataset, so the parsed selections are cached
+  if ":" in select:
+    s = select.split(":")
+    lo = int(s[0]) if s[0] else None
+    up = int(s[1]) if s[1] else None
+    step = int(s[2]) if len(s) > 2 and s[2] else None
+    return slice(lo, up, step)
+  # end
+  return tuple(int(s) for s in select.split(","))
 
-if TYPE_CHECKING:
-  from postgkyl import GData
-#end
 
 class DataSpace(object):
-  """Postgkyl class to store information about datasets and provide iterators in the command line mode."""
+  """Postgkyl class to store information about datasets and provide iterators in the command line mode.
+
+  When 'max_memory' (bytes) is specified, the value arrays of the least recently used
+  datasets are evicted from memory once their total size exceeds the budget. The values
+  read from files are simply dropped and read again when needed; the computed ones are
+  spilled to temporary '.npy' files.
+  """
 
-  def __init__(self):
+  def __init__(self, max_memory: int | None = None):
     self._dataset_dict = {}
+    self.max_memory = max_memory
+    self._spill_dir = None
+    # Datasets known to hold values with their memory (ids to (dataset, bytes); the most
+    # recently used last) and the datasets touched since the last check (their values
+    # are usually read after they were touched)
+    self._resident = OrderedDict()
+    self._resident_bytes = 0
+    self._recent = []
+    # Ids of the datasets which must not be evicted, e.g., the ones being prefetched
+    self._pinned = set()
+    # Lookup indices, e.g., datasets by frame; dropped when datasets are added
+    self._indices = {}
+    # Numbers of the active datasets per tag and the status version they match
+    self._active_counts = {}
+    self._active_version = None
 
   # ---- Iterators ----
   def iterator(self, tag: str | None = None, enum: bool = False,
-      only_active: bool = True, select: int | slice | str | None = None) -> Iterator[GData]:
+      only_active: bool = True, select: int | slice | str | None = None,
+      prefetch: int = 0, needed: Callable | None = None) -> Iterator[GData]:
+    if prefetch > 0:
+      # The values of the following datasets are read in the background and evicted
+      # again after they were processed; until then, they are pinned in the memory
+      return data_prefetch(self.iterator(tag, enum, only_active, select), depth=prefetch,
+          release=True, needed=needed, pinned=self._pinned)
+    # end
+    return self._iterator(tag, enum, only_active, select)
+
+  def _iterator(self, tag: str | None, enum: bool, only_active: bool,
+      select: int | slice | str | None) -> Iterator[GData]:
     # Process 'select'
     if enum and select:
       click.echo(click.style("Error: 'select' and 'enum' cannot be selected simultaneously", fg="red"))
@@ -29,24 +101,7 @@ class DataSpace(object):
     elif isinstance(select, slice):
       idx_sel = select
     elif isinstance(select, str):
-      if ":" in select:
-        lo = None
-        up = None
-        step = None
-        s = select.split(":")
-        if s[0]:
-          lo = int(s[0])
-        # end
-        if s[1]:
-          up = int(s[1])
-        # end
-        if len(s) > 2:
-          step = int(s[2])
-        # end
-        idx_sel = slice(lo, up, step)
-      else:
-        idx_sel = list([int(s) for s in select.split(",")])
-      # end
+      idx_sel = _parse_select(select)
     # end
 
     if tag:
@@ -59,6 +114,7 @@ class DataSpace(object):
         if not select or isinstance(idx_sel, slice):
           for i, dat in enumerate(self._dataset_dict[t][idx_sel]):
             if (not only_active) or dat.get_status():  # implication
+              self._touch(dat)
               if enum:
                 yield i, dat
               else:
@@ -70,6 +126,7 @@ class DataSpace(object):
           for i in idx_sel:
             dat = self._dataset_dict[t][i]
             if (not only_active) or dat.get_status():  # implication
+              self._touch(dat)
               yield dat
             # end
           # end
@@ -82,22 +139,84 @@ class DataSpace(object):
         quit()
       # end
     # end
+    self.enforce_memory()
 
   def tag_iterator(self, tag: str | None = None, only_active: bool = True) -> Iterator[str]:
     if tag:
       out = tag.split(",")
     elif only_active:
-      out = []
-      for t in self._dataset_dict:
-        if True in (dat.get_status() for dat in self.iterator(t)):
-          out.append(t)
-        # end
-      # end
+      counts = self._get_active_counts()
+      out = [t for t in self._dataset_dict if counts[t]]
     else:
       out = list(self._dataset_dict)
     # end
     return iter(out)
 
+  # ---- Lookup indices ----
+  def _get_active_counts(self) -> dict:
+    # Counted again only after a dataset was added or (de)activated
+    version = GData.get_status_version()
+    if self._active_version != version:
+      self._active_counts = {t: sum(dat.get_status() for dat in lst)
+          for t, lst in self._dataset_dict.items()}
+      self._active_version = version
+    # end
+    return self._active_counts
+
+  def _get_index(self, key: str, tag: str | None) -> tuple:
+    # Datasets grouped by the context entry and the sorted entries
+    if (key, tag) not in self._indices:
+      index = {}
+      for t in (tag.split(",") if tag else list(self._dataset_dict)):
+        for dat in self._dataset_dict.get(t, []):
+          val = dat.ctx.get(key)
+          if val is not None:
+            index.setdefault(val, []).append(dat)
+          # end
+        # end
+      # end
+      self._indices[(key, tag)] = (index, sorted(index))
+    # end
+    return self._indices[(key, tag)]
+
+  def reindex(self) -> None:
+    """Drops the lookup indices.
+
+    Needed after the 'frame' or 'time' entries of the stored datasets were changed.
+    """
+    self._indices.clear()
+
+  def get_frame(self, frame: int, tag: str | None = None,
+      only_active: bool = True) -> list:
+    """Returns the datasets of the frame (e.g., the blocks of a multiblock frame).
+
+    The datasets are grouped by the 'frame' context entry once; the following
+    calls are dictionary lookups.
+    """
+    index, _ = self._get_index("frame", tag)
+    out = [dat for dat in index.get(frame, []) if (not only_active) or dat.get_status()]
+    for dat in out:
+      self._touch(dat)
+    # end
+    return out
+
+  def get_time(self, time: float, tag: str | None = None,
+      only_active: bool = True) -> list:
+    """Returns the datasets with the 'time' context entry closest to the time."""
+    index, times = self._get_index("time", tag)
+    if not times:
+      return []
+    # end
+    i = bisect_left(times, time)
+    if i == len(times) or (i > 0 and time - times[i - 1] <= times[i] - time):
+      i -= 1
+    # end
+    out = [dat for dat in index[times[i]] if (not only_active) or dat.get_status()]
+    for dat in out:
+      self._touch(dat)
+    # end
+    return out
+
   # ---- Labels ----
   def set_unique_labels(self) -> None:
     num_comps = []
@@ -150,11 +269,126 @@ class DataSpace(object):
     else:
       self._dataset_dict[tag_nm] = [data]
     # end
+    self._indices.clear()
+    if self._active_version is not None:
+      self._active_counts[tag_nm] = self._active_counts.get(tag_nm, 0) + data.get_status()
+    # end
+    self._touch(data)
+
+  # ---- Memory budget ----
+  def _touch(self, data: GData) -> None:
+    # Mark the dataset as the most recently used and make space for it
+    if self.max_memory is None:
+      return
+    # end
+    # Only the datasets touched since the last check are measured again
+    for dat in self._recent:
+      self._measure(dat)
+    # end
+    self._recent = [data]
+    if id(data) in self._resident:
+      self._resident.move_to_end(id(data))
+    # end
+    if self._resident_bytes > self.max_memory:
+      self._evict_oldest(keep=data)
+    # end
+
+  def _measure(self, data: GData) -> None:
+    # (Re)insert the dataset as the most recently used one
+    nbytes = data.get_nbytes()
+    self._resident_bytes += nbytes - self._resident.pop(id(data), (None, 0))[1]
+    if nbytes:
+      self._resident[id(data)] = (data, nbytes)
+    # end
+
+  def _evict_oldest(self, keep: GData | None = None) -> int:
+    # Pop the resident datasets from the oldest until the budget is met
+    released = 0
+    kept = []
+    while self._resident_bytes > self.max_memory and self._resident:
+      key, (dat, nbytes) = self._resident.popitem(last=False)
+      self._resident_bytes -= nbytes
+      if dat is not keep and key not in self._pinned:
+        dat.evict(self._get_spill_dir())
+      # end
+      left = dat.get_nbytes()
+      released += nbytes - left
+      if left:
+        kept.append((key, (dat, left)))
+      # end
+    # end
+    # Datasets which were kept or could not be evicted stay the oldest
+    for key, item in reversed(kept):
+      self._resident[key] = item
+      self._resident.move_to_end(key, last=False)
+      self._resident_bytes += item[1]
+    # end
+    return released
+
+  def get_nbytes(self) -> int:
+    """Returns the memory used by the values of all the datasets."""
+    return sum(dat.get_nbytes() for lst in self._dataset_dict.values() for dat in lst)
+
+  def enforce_memory(self, keep: GData | None = None) -> int:
+    """Evicts the least recently used values until the memory budget is met.
+
+    All the datasets are measured again, e.g., to account for the values read outside
+    of the iterators.
+
+    Args:
+      keep: GData | None = None
+        Dataset which is not evicted (the one currently in use).
+
+    Returns:
+      Number of released bytes.
+    """
+    if self.max_memory is None:
+      return 0
+    # end
+    datasets = {id(dat): dat for lst in self._dataset_dict.values() for dat in lst}
+    previous = self._resident
+    # Datasets which were never measured are the oldest and the recently touched ones
+    # the newest
+    self._resident = OrderedDict()
+    self._resident_bytes = 0
+    for key in [key for key in datasets if key not in previous] + list(previous):
+      if key in datasets:
+        self._measure(datasets[key])
+      # end
+    # end
+    for dat in self._recent:
+      if id(dat) in datasets:
+        self._measure(dat)
+      # end
+    # end
+    return self._evict_oldest(keep)
+
+  def get_slab_bytes(self, data: GData | None = None) -> int | None:
+    """Returns the slab size for streaming reductions under the memory budget.
+
+    Args:
+      data: GData | None = None
+        When specified, None is returned if its values are already in memory.
+
+    Returns:
+      A quarter of the budget or None when there is no budget.
+    """
+    if self.max_memory is None or (data is not None and data.is_loaded()):
+      return None
+    # end
+    return max(self.max_memory // 4, 1)
+
+  def _get_spill_dir(self) -> str:
+    # The directory and the spilled files are removed with the DataSpace or at exit
+    if self._spill_dir is None:
+      self._spill_dir = tempfile.TemporaryDirectory(prefix="pgkyl-")
+    # end
+    return self._spill_dir.name
 
   # ---- Staus control ----
   def activate_all(self, tag: str | None = None) -> None:
     for dat in self.iterator(tag=tag, only_active=False):
-      dat.deactivate()
+      dat.activate()
     # end
 
   # end
@@ -169,11 +403,22 @@ class DataSpace(object):
 
 
   def get_num_datasets(self, tag: str | None = None, only_active: bool = True):
-    num_sets = 0
-    for dat in self.iterator(tag=tag, only_active=only_active):
-      num_sets += 1
+    tags = tag.split(",") if tag else list(self._dataset_dict)
+    try:
+      if not only_active:
+        return sum(len(self._dataset_dict[t]) for t in tags)
+      # end
+      counts = self._get_active_counts()
+      return sum(counts[t] for t in tags)
+    except KeyError as err:
+      click.echo(click.style(f"ERROR: Failed to load the specified/default tag {err}", fg="red"))
+      quit()
     # end
-    return num_sets
 
   def clean(self):
-    self._dataset_dict = {}
\ No newline at end of file
+    self._dataset_dict = {}
+    self._resident.clear()
+    self._resident_bytes = 0
+    self._recent = []
+    self._indices.clear()
+    self._active_version = None
\ No newline at end of file
@@ -47,6 +47,10 @@ def _data(ctx, grid_stack, value_stack, ctx_stack, str_in, tags, only_active):
         else:
           ctx.fail(click.style(f"Wrong ctx key '{ctx_key:s}' specified", fg="red"))
         # end
+      elif ctx.obj["data"].get_slab_bytes(dat):
+        # Not loaded under the memory budget; reductions stream over the slabs
+        grid = None
+        values = cmd_base.SlabStream(dat, comp_idx, ctx.obj["data"].get_slab_bytes(dat))
       else:
         grid, values = pselect(dat, comp=comp_idx)
       # end
@@ -114,6 +118,18 @@ def _command(ctx, grid_stack, value_stack, ctx_stack, str_in):
       tmp_values.append(in_values[i][min(set_idx, num_sets[i] - 1)])
       tmp_ctx.append(in_ctx[i][min(set_idx, num_sets[i] - 1)])
     # end
+    # The dataset is always the last input; the others are loaded
+    stream_func = cmd_base.cmds[str_in].get("stream")
+    for i in range(num_in):
+      if isinstance(tmp_values[i], cmd_base.SlabStream) and (i < num_in - 1 or not stream_func):
+        tmp_grid[i], tmp_values[i] = tmp_values[i].load()
+      # end
+    # end
+    if isinstance(tmp_values[-1], cmd_base.SlabStream):
+      func = stream_func
+    else:
+      func = cmd_base.cmds[str_in]["func"]
+    # end
     try:
       out_grid, out_values = func(tmp_grid, tmp_values)
     except Exception as err:
@@ -204,6 +220,13 @@ def ev(ctx, **kwargs):
         click.style("WARNING: Length of the evaluate stack is bigger than 1, there is a posibility of unintended behavior",
             fg="yellow" ))
   # end
+  # Datasets which were not reduced are loaded
+  for i, values in enumerate(value_stack[-1]):
+    if isinstance(values, cmd_base.SlabStream):
+      grid_stack[-1][i], value_stack[-1][i] = values.load()
+    # end
+  # end
+
   if num_datasets_in_chain == 1 and kwargs["tag"] is None:
     cnt = 0
     tag = out_data_id[0]
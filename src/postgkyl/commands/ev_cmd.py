@@ -1,6 +1,8 @@
 import click
 import numpy as np
 from postgkyl.data.idx_parser import idx_parser
+from postgkyl.data.select import select as pselect
+from postgkyl.tools.calculus import reduce_slabs
 
 
 def _get_grid(grid0, grid1):
@@ -19,6 +21,11 @@ def _get_grid(grid0, grid1):
   # end
 
 
+def _float_dtype(values) -> np.dtype:
+  # Floating point type of the results; single precision inputs are not promoted
+  return np.result_type(np.asarray(values).dtype, np.float32)
+
+
 def add(in_grid, in_values):
   out_grid = _get_grid(in_grid[0], in_grid[1])
   out_values = in_values[0] + in_values[1]
@@ -169,7 +176,7 @@ def grad(in_grid, in_values):
   out_shape = list(in_values[0].shape)
   nc = in_values[0].shape[-1]
   out_shape[-1] = nc * nd
-  out_values = np.zeros(out_shape)
+  out_values = np.zeros(out_shape, _float_dtype(in_values[0]))
 
   for d in range(nd):
     zc = 0.5 * (in_grid[0][d][1:] + in_grid[0][d][:-1])  # get cell centered values
@@ -198,7 +205,7 @@ def grad2(in_grid, in_values):
   out_shape = list(in_values[1].shape)
   num_comps = in_values[1].shape[-1]
   out_shape[-1] = out_shape[-1] * num_dims
-  out_values = np.zeros(out_shape)
+  out_values = np.zeros(out_shape, _float_dtype(in_values[1]))
 
   for cnt, d in enumerate(rng):
     zc = 0.5 * (in_grid[1][d][1:] + in_grid[1][d][:-1])  # get cell centered values
@@ -209,11 +216,7 @@ def grad2(in_grid, in_values):
   return [out_grid], [out_values]
 
 
-def integrate(in_grid, in_values, avg=False):
-  grid = in_grid[1].copy()
-  values = np.array(in_values[1])
-
-  axis = in_values[0]
+def _parse_axis(axis, num_dims: int) -> tuple:
   if isinstance(axis, float):
     axis = tuple([int(axis)])
   elif isinstance(axis, tuple):
@@ -228,16 +231,22 @@ def integrate(in_grid, in_values, avg=False):
       bounds = axis.split(":")
       axis = tuple(range(bounds[0], bounds[1]))
     elif axis == "all":
-      num_dims = len(grid)
       axis = tuple(range(num_dims))
     # end
   else:
     raise TypeError("'axis' needs to be integer, tuple, string of comma separated integers, or a slice ('int:int')")
   # end
+  return axis
+
+
+def integrate(in_grid, in_values, avg=False):
+  grid = in_grid[1].copy()
+  values = np.asarray(in_values[1])
+  axis = _parse_axis(in_values[0], len(grid))
 
   dz = []
   for d, coord in enumerate(grid):
-    dz.append(coord[1:] - coord[:-1])
+    dz.append((coord[1:] - coord[:-1]).astype(_float_dtype(values), copy=False))
     if len(coord) == values.shape[d]:
       dz[-1] = np.append(dz[-1], dz[-1][-1])
     # end
@@ -266,6 +275,91 @@ def average(in_grid, in_values):
   return integrate(in_grid, in_values, True)
 
 
+# ---- Streaming reductions ----
+class SlabStream(object):
+  """Dataset which is reduced slab by slab instead of being loaded.
+
+  Placed on the stack instead of the values of datasets which are not loaded; commands
+  with a streaming implementation ('stream' in 'cmds') use the slabs, the others load
+  the values.
+  """
+
+  def __init__(self, data, comp=None, max_bytes: int = 2**28):
+    self.data = data
+    self.comp = comp
+    self.max_bytes = max_bytes
+
+  def iter_slabs(self):
+    return self.data.iter_slabs(max_bytes=self.max_bytes, comp=self.comp)
+
+  def load(self):
+    return pselect(self.data, comp=self.comp)
+
+
+def stream_integrate(in_grid, in_values, avg=False):
+  stream = in_values[1]
+  axis = _parse_axis(in_values[0], stream.data.get_num_dims())
+  slab = {}
+
+  def integrate_slab(grid, values):
+    slab["grid"], slab["shape"] = grid, values.shape
+    out_grid, out_values = integrate([None, grid], [in_values[0], values])
+    return out_grid[0], out_values[0]
+  # end
+
+  grid, values = reduce_slabs(stream.iter_slabs(), integrate_slab, axis)
+  coords = list(slab["grid"])
+  coords[0] = grid[0]  # joined from the slabs
+  num_cells = list(slab["shape"])
+  num_cells[0] = int(stream.data.get_num_cells()[0])
+  if 0 in axis:
+    grid[0] = np.array([0])
+  # end
+  if avg:
+    for ax in axis:
+      ln = coords[ax][-1] - coords[ax][0]
+      if len(coords[ax]) == num_cells[ax]:
+        ln += coords[ax][1] - coords[ax][0]
+      # end
+      values = values/ln
+    # end
+  # end
+  return [grid], [values]
+
+
+def stream_average(in_grid, in_values):
+  return stream_integrate(in_grid, in_values, True)
+
+
+def stream_minimum(in_grid, in_values):
+  out_values = None
+  for _, values in in_values[0].iter_slabs():
+    # 'fmin' ignores NaNs without warnings for the slabs full of them
+    slab_min = np.fmin.reduce(values, axis=None)
+    out_values = slab_min if out_values is None else np.fmin(out_values, slab_min)
+  # end
+  return [[]], [np.atleast_1d(out_values)]
+
+
+def stream_maximum(in_grid, in_values):
+  out_values = None
+  for _, values in in_values[0].iter_slabs():
+    slab_max = np.fmax.reduce(values, axis=None)
+    out_values = slab_max if out_values is None else np.fmax(out_values, slab_max)
+  # end
+  return [[]], [np.atleast_1d(out_values)]
+
+
+def stream_mean(in_grid, in_values):
+  total, count, dtype = 0.0, 0, np.float64
+  for _, values in in_values[0].iter_slabs():
+    total += values.sum(dtype=np.float64)
+    count += values.size
+    dtype = _float_dtype(values)
+  # end
+  return [[]], [np.atleast_1d(np.array(total / count, dtype=dtype))]
+
+
 def divergence(in_grid, in_values):
   out_grid = in_grid[0]
   num_dims = len(in_grid[0])
@@ -278,7 +372,7 @@ def divergence(in_grid, in_values):
     # end
   out_shape = list(in_values[0].shape)
   out_shape[-1] = 1
-  out_values = np.zeros(out_shape)
+  out_values = np.zeros(out_shape, _float_dtype(in_values[0]))
   for d in range(num_dims):
     zc = 0.5 * (in_grid[0][d][1:] + in_grid[0][d][:-1])  # get cell centered values
     out_values[..., 0] = out_values[..., 0] + np.gradient(
@@ -300,7 +394,7 @@ def curl(in_grid, in_values):
       raise ValueError(f"ERROR in 'ev curl': Curl in 1D requires 3-component input and {num_comps:d}-component field was provided.")
     # end
     zc0 = 0.5*(in_grid[0][0][1:] + in_grid[0][0][:-1])
-    out_values = np.zeros(out_shape)
+    out_values = np.zeros(out_shape, _float_dtype(in_values[0]))
     out_values[..., 1] = -np.gradient(in_values[0][..., 2], zc0, edge_order=2, axis=0)
     out_values[..., 2] = np.gradient(in_values[0][..., 1], zc0, edge_order=2, axis=0)
   elif num_dims == 2:
@@ -314,7 +408,7 @@ def curl(in_grid, in_values):
               fg="yellow")
       )
       out_shape[-1] = 1
-      out_values = np.zeros(out_shape)
+      out_values = np.zeros(out_shape, _float_dtype(in_values[0]))
       out_values[..., 0] = np.gradient(
           in_values[0][..., 1], zc0, edge_order=2, axis=0
       ) - np.gradient(in_values[0][..., 0], zc1, edge_order=2, axis=1)
@@ -326,7 +420,7 @@ def curl(in_grid, in_values):
                 fg="yellow")
         )
       # end
-      out_values = np.zeros(out_shape)
+      out_values = np.zeros(out_shape, _float_dtype(in_values[0]))
       out_values[..., 0] = np.gradient(in_values[0][..., 2], zc1, edge_order=2, axis=1)
       out_values[..., 1] = -np.gradient(in_values[0][..., 2], zc0, edge_order=2, axis=0)
       out_values[..., 2] = np.gradient( in_values[0][..., 1], zc0, edge_order=2, axis=0) - np.gradient(in_values[0][..., 0], zc1, edge_order=2, axis=1)
@@ -361,7 +455,7 @@ def scale_comp(in_grid, in_values):
   Usage: f 2:4 1000 scale_comp  (scales components 2 and 3 by 1000)
   """
   
-  out_grid = in_grid[2]  # Use grid from original data (f)
+  out_grid = list(in_grid[2])  # Use grid from original data (f)
   original_data = in_values[2].copy()  # Original data (make a copy)
   comp_spec = in_values[1]  # Component specification (can be string or number)
   scale_factor = in_values[0]  # Scaling factor
@@ -404,7 +498,7 @@ def scale_zi_axis(in_grid, in_values):
   scale_factor = in_values[0].item()  # Ensure scale_factor is a float
 
   # Scale the z_i axis
-  out_grid[int(idx_scale)] *= scale_factor
+  out_grid[int(idx_scale)] = out_grid[int(idx_scale)] * scale_factor
 
   return [out_grid], [original_data]
 
@@ -419,21 +513,21 @@ cmds = {
     "cos": {"num_in": 1, "num_out": 1, "func": pcos},
     "tan": {"num_in": 1, "num_out": 1, "func": ptan},
     "abs": {"num_in": 1, "num_out": 1, "func": absolute},
-    "avg": {"num_in": 2, "num_out": 1, "func": average},
+    "avg": {"num_in": 2, "num_out": 1, "func": average, "stream": stream_average},
     "log": {"num_in": 1, "num_out": 1, "func": log},
     "log10": {"num_in": 1, "num_out": 1, "func": log10},
-    "max": {"num_in": 1, "num_out": 1, "func": maximum},
-    "min": {"num_in": 1, "num_out": 1, "func": minimum},
+    "max": {"num_in": 1, "num_out": 1, "func": maximum, "stream": stream_maximum},
+    "min": {"num_in": 1, "num_out": 1, "func": minimum, "stream": stream_minimum},
     "max2": {"num_in": 2, "num_out": 1, "func": maximum2},
     "min2": {"num_in": 2, "num_out": 1, "func": minimum2},
-    "mean": {"num_in": 1, "num_out": 1, "func": mean},
+    "mean": {"num_in": 1, "num_out": 1, "func": mean, "stream": stream_mean},
     "len": {"num_in": 2, "num_out": 1, "func": length},
     "pow": {"num_in": 2, "num_out": 1, "func": power},
     "sq": {"num_in": 1, "num_out": 1, "func": sq},
     "exp": {"num_in": 1, "num_out": 1, "func": exp},
     "grad": {"num_in": 1, "num_out": 1, "func": grad},
     "grad2": {"num_in": 2, "num_out": 1, "func": grad2},
-    "int": {"num_in": 2, "num_out": 1, "func": integrate},
+    "int": {"num_in": 2, "num_out": 1, "func": integrate, "stream": stream_integrate},
     "div": {"num_in": 1, "num_out": 1, "func": divergence},
     "curl": {"num_in": 1, "num_out": 1, "func": curl},
     "scale_comp": {"num_in": 3, "num_out": 1, "func": scale_comp},
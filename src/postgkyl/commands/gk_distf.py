@@ -14,12 +14,13 @@ pg.data.select(distf, z0=0.0, overwrite=True)
 pg.output.plot(distf)
 plt.show()
 """
-import glob
+import os.path
 
 import click
 import numpy as np
 
-from postgkyl.data import GData, GInterpModal
+from postgkyl.data import Catalog, GData, GInterpModal
+from postgkyl.data.grid_cache import grid_cache
 from postgkyl.utils import verb_print
 
 # mc2nu grid deformation helpers
@@ -46,21 +47,39 @@ def _extract_values_along_dimension(mapped_values: np.ndarray, axis: int, cdim:
 # end
 
 # Nearly 100% by LLMs, commented and verified by MR 3/16/26, removing extra code.
-def _apply_mc2nu_grid(uniform_grid: list, mc2nu_file: str, interp: int | None = None) -> list:
-  """Replace computational configuration-space grid with non-uniform spatial coordinates."""
+def _load_mc2nu_axes(mc2nu_file: str, interp: int | None = None) -> tuple:
+  """Interpolate the mapping and return the nodal non-uniform coordinates of each axis."""
   mc2nu_data = GData(mc2nu_file)
   cdim = mc2nu_data.get_num_dims()
 
   _, mc2nu_values = GInterpModal(mc2nu_data, 1, "ms", interp).interpolate(tuple(range(cdim)))
 
+  return tuple(_convert_cell_centered_to_nodal(
+      _extract_values_along_dimension(mc2nu_values, d, cdim)) for d in range(cdim))
+# end
+
+def _apply_mc2nu_grid(uniform_grid: list, mc2nu_file: str, interp: int | None = None) -> list:
+  """Replace computational configuration-space grid with non-uniform spatial coordinates."""
+  # The mapping is the same for all the frames and is read only once
+  mc2nu_axes = grid_cache.get(mc2nu_file, ("mc2nu", interp),
+      lambda: _load_mc2nu_axes(mc2nu_file, interp))
+
   nonuniform_grid = list(uniform_grid)
-  for d in range(cdim):
-    mc2nu_single_axis = _extract_values_along_dimension(mc2nu_values, d, cdim)
-    nonuniform_grid[d] = _convert_cell_centered_to_nodal(mc2nu_single_axis)
+  for d, axis in enumerate(mc2nu_axes):
+    nonuniform_grid[d] = axis
   # end
   return nonuniform_grid
 # end
 
+def _load_jacobvel(jacobvel_file: str) -> np.ndarray:
+  return GData(jacobvel_file).get_values()
+# end
+
+def _load_jacobtot_inv(jacobtot_inv_file: str, interp: int | None = None) -> np.ndarray:
+  _, values = GInterpModal(GData(jacobtot_inv_file), 1, "ms", interp).interpolate()
+  return np.squeeze(values)
+# end
+
 def _resolve_optional_file_option(option_value: str | None) -> tuple[bool, str | None]:
   """Interpret an optional-value CLI option as (enabled, override_file)."""
   if option_value is None:
@@ -107,20 +126,22 @@ def load_gk_distf(
     jacobtot_inv_file = f"{prefix}-jacobtot_inv.gkyl"
   # end
 
-  jf_data           = GData(jf_file, mapc2p_vel_name=mapc2p_vel_file if use_c2p_vel else None)
-  jacobvel_data     = GData(jacobvel_file)
-  jacobtot_inv_data = GData(jacobtot_inv_file)
+  # The geometry is the same for all the frames; it is read (and interpolated) only once
+  # and shared through the grid cache.
+  jf_data             = GData(jf_file, mapc2p_vel_name=mapc2p_vel_file if use_c2p_vel else None)
+  jacobvel_values     = grid_cache.get(jacobvel_file, ("values",),
+      lambda: _load_jacobvel(jacobvel_file))
+  jacobtot_inv_values = grid_cache.get(jacobtot_inv_file, ("interp", interp),
+      lambda: _load_jacobtot_inv(jacobtot_inv_file, interp))
 
   # Divide Jf by jacobvel to get f * J_x * B.
   fjxB_data = GData(ctx=jf_data.ctx) # Inside a GData object so we can interpolate
-  fjxB_values = jf_data.get_values() / jacobvel_data.get_values()
+  fjxB_values = jf_data.get_values() / jacobvel_values
   fjxB_data.push(jf_data.get_grid(), fjxB_values)
 
-  # Interpolate f * J_x * B and jacobtot_inv to the same grid.
+  # Interpolate f * J_x * B to the same grid as jacobtot_inv.
   out_grid, fjxB_values    = GInterpModal(fjxB_data, 1, "gkhyb", interp).interpolate()
-  _, jacobtot_inv_values   = GInterpModal(jacobtot_inv_data, 1, "ms", interp).interpolate()
   fjxB_values              = np.squeeze(fjxB_values)
-  jacobtot_inv_values      = np.squeeze(jacobtot_inv_values)
 
   # Reshape jacobtot_inv to have 1 component over velocity dimensions, then multiply.
   vdim = fjxB_values.ndim - jacobtot_inv_values.ndim
@@ -200,15 +221,14 @@ def gk_distf(ctx, **kwargs):
     frames = [int(frame_spec)] # Stick to the frame specified on input
   else:
     # Figure out how many frames are possible to read based on what files are available
-    # Generated by LLMs
     prefix = f"{kwargs['name']}_b{kwargs['block']}" if kwargs["block"] is not None else kwargs["name"]
-    frame_infix = f"{kwargs['suffix']}_" if kwargs["suffix"] else ""
-    stem = f"{prefix}-{kwargs['species']}_{frame_infix}"
-    available = sorted({
-      int(f.removeprefix(stem)[:-5])
-      for f in glob.glob(f"{glob.escape(stem)}*.gkyl")
-      if f.removeprefix(stem)[:-5].isdigit()
-    })
+    frame_infix = f"_{kwargs['suffix']}" if kwargs["suffix"] else ""
+    stem = f"{prefix}-{kwargs['species']}{frame_infix}"
+    available = Catalog(os.path.dirname(stem)).get_frames(os.path.basename(stem),
+        ext="gkyl")
+    if not available:
+      ctx.fail(click.style(f"ERROR in gk_distf: No frames of '{stem:s}' found", fg="red"))
+    # end
     # Slice the data accordingly
     parts = frame_spec.split(":")
     lower = int(parts[0]) if parts[0] else available[0]
@@ -1,12 +1,44 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+
 import click
+import numpy as np
 
+from postgkyl.data import stats as stats_index
 from postgkyl.utils import verb_print
 
 
+def _get_number(val) -> float | dict:
+  # JSON has no complex numbers
+  if np.iscomplexobj(val):
+    return {"real": float(np.real(val)), "imag": float(np.imag(val))}
+  # end
+  return float(val)
+
+
+def _get_json(dat, i: int, header_only: bool, max_bytes: int | None) -> str:
+  out = {"index": i, **dat.get_header()}
+  if not header_only:
+    st = dat.get_stats(build=True, save=False, max_bytes=max_bytes)
+    if st is not None:
+      maximum, max_idx, minimum, min_idx = stats_index.get_extremes(st)
+      out["maximum"], out["max_idx"] = _get_number(maximum), list(max_idx)
+      out["minimum"], out["min_idx"] = _get_number(minimum), list(min_idx)
+    # end
+  # end
+  return json.dumps(out)
+
+
 @click.command(help="Print info of active datasets.")
 @click.option("-u", "--use", help="Specify a 'tag' to apply to (default all tags).")
 @click.option("-c", "--compact", is_flag=True, help="Show in compact mode.")
 @click.option("-a", "--allsets", is_flag=True, help="All data sets.")
+@click.option("--header-only", "header_only", is_flag=True,
+    help="Print only the metadata without reading the values (the preceding loads are lazy).")
+@click.option("-j", "--jobs", type=click.INT,
+    help="Number of datasets processed concurrently; the output order is kept.")
+@click.option("--json", "as_json", is_flag=True,
+    help="Print one JSON object per dataset and line.")
 @click.pass_context
 def info(ctx, **kwargs):
   verb_print(ctx, "Starting info")
@@ -17,20 +49,43 @@ def info(ctx, **kwargs):
     only_active = True
   # end
 
-  for i, dat in data.iterator(kwargs["use"], enum=True, only_active=only_active):
-    if dat.get_status():
-      color = "green"
-      bold = True
-    else:
-      color = None
-      bold = False
+  jobs = kwargs["jobs"] or ctx.obj.get("global_jobs") or 1
+  header_only = kwargs["header_only"]
+
+  def process(item) -> str:
+    i, dat = item
+    max_bytes = data.get_slab_bytes(dat)
+    if kwargs["as_json"]:
+      return _get_json(dat, i, header_only, max_bytes)
+    elif kwargs["compact"]:
+      return ""
     # end
-    click.echo(
-        click.style(f"{dat.get_label():s}{' ' if dat.get_label() else '':s}({dat.get_tag():s}#{i:d})",
-            fg=color, bold=bold)
-    )
-    if not kwargs["compact"]:
-      click.echo(dat.info() + "\n")
+    return dat.info(max_bytes=max_bytes, header_only=header_only) + "\n"
+  # end
+
+  items = list(data.iterator(kwargs["use"], enum=True, only_active=only_active))
+  with ThreadPoolExecutor(max_workers=max(jobs, 1)) as executor:
+    # 'map' yields the results in the order of the datasets
+    results = executor.map(process, items) if jobs > 1 else map(process, items)
+    for (i, dat), out in zip(items, results):
+      if kwargs["as_json"]:
+        click.echo(out)
+        continue
+      # end
+      if dat.get_status():
+        color = "green"
+        bold = True
+      else:
+        color = None
+        bold = False
+      # end
+      click.echo(
+          click.style(f"{dat.get_label():s}{' ' if dat.get_label() else '':s}({dat.get_tag():s}#{i:d})",
+              fg=color, bold=bold)
+      )
+      if not kwargs["compact"]:
+        click.echo(out)
+      # end
     # end
   # end
 
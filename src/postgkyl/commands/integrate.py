@@ -18,14 +18,16 @@ def integrate(ctx, **kwargs):
   data = ctx.obj["data"]
 
   for dat in data.iterator(kwargs["use"]):
+    # Datasets which are not loaded under the memory budget are integrated slab by slab
+    max_bytes = data.get_slab_bytes(dat)
     if kwargs["tag"]:
-      grid, values = tools.integrate(dat, kwargs["axis"])
+      grid, values = tools.integrate(dat, kwargs["axis"], max_bytes=max_bytes)
       out = GData(tag=kwargs["tag"], label=kwargs["label"],
           comp_grid=ctx.obj["compgrid"], ctx=dat.ctx)
       out.push(grid, values)
       data.add(out)
     else:
-      tools.integrate(dat, kwargs["axis"], overwrite=True)
+      tools.integrate(dat, kwargs["axis"], overwrite=True, max_bytes=max_bytes)
     # end
   # end
 
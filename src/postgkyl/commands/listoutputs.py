@@ -1,7 +1,6 @@
-from glob import glob
 import click
-import re
 
+from postgkyl.data import Catalog
 from postgkyl.utils import verb_print
 
 
@@ -14,26 +13,13 @@ def listoutputs(ctx, **kwargs):
   verb_print(ctx, "Starting listoutputs")
 
   extensions = kwargs["extensions"].split(",")
+  catalog = Catalog(".", extensions=extensions)
   for ext in extensions:
-    files = glob(f"*.{ext:s}")
-    unique = []
-    for fn in files:
-      # remove extension
-      s = fn[: -(len(ext) + 1)]
-      # strip "restart"
-      if s.endswith("_restart"):
-        s = s[:-8]
-      # end
-      # strip digits
-      s = re.sub(r"_\d+$", "", s)
-      if s not in unique:
-        unique.append(s)
-      # end
-    # end
+    unique = catalog.get_stems([ext])
     if len(unique) > 0:
       click.echo(f"{ext:s}:")
     # end
-    for s in sorted(unique):
+    for s in unique:
       click.echo(f"- {s:s}")
     # end
   # end
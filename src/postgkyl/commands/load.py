@@ -1,8 +1,11 @@
 import click
 import glob
+import os.path
 
+from postgkyl.data import Catalog
 from postgkyl.data import GData
 from postgkyl.data import GInterpModal
+from postgkyl.data import stats as stats_index
 from postgkyl.utils import verb_print
 
 
@@ -54,7 +57,25 @@ def _crush(s : str) -> tuple:  # Temp function used as a sorting key
     help="Tag finite volume data when using c2p mapped coordinates")
 @click.option("--reader", "-r", type=click.STRING,
     help="Allows to specify the Adios variable name (default is 'CartGridField')")
-@click.option("--load/--no-load", default=True, help="Specify if data should be loaded.")
+@click.option("--load/--no-load", default=True,
+    help="Specify if data should be loaded; otherwise, they are loaded on the first access.")
+@click.option("--jobs", "-j", type=click.INT,
+    help="Number of files to load concurrently.")
+@click.option("--frames", type=click.STRING,
+    help="Select frames of a wildcard load: frame, comma separated frames, or 'lo:hi[:step]'.")
+@click.option("--time", type=click.STRING,
+    help="Select frames of a wildcard load by time range 'lo:hi'.")
+@click.option("--catalog", is_flag=True,
+    help="Store the catalog of the directory in a hidden index file; the following "
+    "'--frames' and '--time' selections then read only the new headers.")
+@click.option("--mmap", is_flag=True,
+    help="Memory-map the data instead of reading them to memory (read-only; 'gkyl' only).")
+@click.option("--steps", type=click.STRING,
+    help="Load steps of multi-step ADIOS BP streams: step or 'lo:hi[:step]'.")
+@click.option("--stack", is_flag=True,
+    help="Collect the steps into a single time-stacked dataset instead of frames.")
+@click.option("--stats", is_flag=True,
+    help="Store the missing per-frame statistics in the sidecar index ('gkyl' only).")
 @click.pass_context
 def load(ctx, **kwargs):
   verb_print(ctx, "Starting load")
@@ -64,7 +85,21 @@ def load(ctx, **kwargs):
   in_data_string = ctx.obj["in_data_strings"][idx]
 
   # Handling the wildcard characters
-  if "*" in in_data_string or "?" in in_data_string or "!" in in_data_string:
+  directory, pattern = os.path.split(str(in_data_string))
+  has_wildcard = "*" in in_data_string or "?" in in_data_string or "!" in in_data_string
+  if (kwargs["frames"] or kwargs["time"]) and glob.has_magic(directory):
+    ctx.fail(click.style("ERROR in load: '--frames' and '--time' do not support "
+        "wildcards in the directory name", fg="red"))
+  elif kwargs["frames"] or kwargs["time"]:
+    # Frames are looked up in the catalog of the simulation directory instead of
+    # reading the headers of all the matching files every time
+    files = Catalog(directory, save=kwargs["catalog"], pattern=pattern).get_files(
+        pattern=pattern, frames=kwargs["frames"], time=kwargs["time"])
+    if not files:
+      ctx.fail(click.style(f"ERROR in load: No files match '{in_data_string:s}' and the "
+          "frame selection", fg="red"))
+    # end
+  elif has_wildcard:
     files = glob.glob(str(in_data_string))
     files = [f for f in files if f.find("restart") < 0]
     try:
@@ -75,6 +110,9 @@ def load(ctx, **kwargs):
               fg="yellow")
       )
     # end
+    if kwargs["catalog"] and not glob.has_magic(directory):
+      Catalog(directory, save=True, pattern=pattern)
+    # end
   else:
     files = [in_data_string]
   # end
@@ -131,23 +169,58 @@ def load(ctx, **kwargs):
     var_names = var_names[0].split(",")
   # end
 
+  jobs = 1
+  if kwargs["jobs"] and ctx.obj.get("global_jobs"):
+    jobs = kwargs["jobs"]
+    click.echo(
+        click.style("WARNING: The local 'jobs' is overwriting the global 'jobs'", fg="yellow")
+    )
+  elif kwargs["jobs"]:
+    jobs = kwargs["jobs"]
+  elif ctx.obj.get("global_jobs"):
+    jobs = ctx.obj["global_jobs"]
+  # end
+
+  # With the memory budget or a header-only 'info' in the chain, the values are read
+  # only when they are needed; with steps, the default step is not read at all
+  use_steps = kwargs["steps"] is not None or kwargs["stack"]
+  load_values = (kwargs["load"] and data.max_memory is None and not use_steps
+      and not ctx.obj.get("header_only"))
+
   for var in var_names:
-    for fn in files:
-      try:
-        dat = GData(file_name=fn, tag=kwargs["tag"], comp_grid=ctx.obj["compgrid"],
-            z0=z0, z1=z1, z2=z2, z3=z3, z4=z4, z5=z5, comp=comp, var_name=var,
-            label=kwargs["label"], mapc2p_name=mapc2p_name, mapc2p_vel_name=mapc2p_vel_name,
-            reader_name=kwargs["reader"], load=kwargs["load"], click_mode=True)
+    try:
+      datasets = GData.load_many(files, workers=jobs, tag=kwargs["tag"],
+          comp_grid=ctx.obj["compgrid"],
+          z0=z0, z1=z1, z2=z2, z3=z3, z4=z4, z5=z5, comp=comp, var_name=var,
+          label=kwargs["label"], mapc2p_name=mapc2p_name, mapc2p_vel_name=mapc2p_vel_name,
+          reader_name=kwargs["reader"], load=load_values, click_mode=True,
+          mmap=kwargs["mmap"], dtype=ctx.obj.get("global_dtype"))
+    except NameError as e:
+      ctx.fail(click.style(rf"{repr(e):s}", fg="red"))
+    # end
+    for file_dat in datasets:
+      if kwargs["stack"]:
+        step_datasets = [file_dat.stack_steps(kwargs["steps"])]
+      elif use_steps:
+        step_datasets = file_dat.iter_steps(kwargs["steps"])
+      else:
+        step_datasets = [file_dat]
+      # end
+      for dat in step_datasets:
         if kwargs["fv"]:
           dg = GInterpModal(dat, 0, "ms")
           dg.interpolateGrid(overwrite=True)
         # end
+        if kwargs["stats"]:
+          dat.get_stats(build=True, save=False, max_bytes=data.get_slab_bytes(dat))
+        # end
         data.add(dat)
-      except NameError as e:
-        ctx.fail(click.style(rf"{repr(e):s}", fg="red"))
       # end
     # end
   # end
+  if kwargs["stats"]:
+    stats_index.save_indices()
+  # end
 
   data.set_unique_labels()
 
@@ -176,15 +176,15 @@ def plot(ctx, **kwargs):
     vmax = float("-inf")
     v_extrema = np.array([])
     for dat in ctx.obj["data"].iterator(kwargs["use"]):
-      val = dat.get_values() * kwargs["zscale"]
-      if vmin > np.nanmin(val):
-        vmin = np.nanmin(val)
+      val_min, val_max = sorted(np.multiply(dat.get_value_range(), kwargs["zscale"]))
+      if vmin > val_min:
+        vmin = val_min
       # end
-      if vmax < np.nanmax(val):
-        vmax = np.nanmax(val)
+      if vmax < val_max:
+        vmax = val_max
       # end
-      v_extrema = np.append(v_extrema, np.nanmin(val))
-      v_extrema = np.append(v_extrema, np.nanmax(val))
+      v_extrema = np.append(v_extrema, val_min)
+      v_extrema = np.append(v_extrema, val_max)
     # end
 
     v_extrema = np.sort(v_extrema)
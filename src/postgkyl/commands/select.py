@@ -44,7 +44,7 @@ def select(ctx, **kwargs):
     if kwargs["multiframe"]:
       data_list = []
       for frame in frame_list:
-        frame_data_list = [dat for dat in data.iterator(kwargs["use"]) if dat.ctx["frame"] == frame]
+        frame_data_list = data.get_frame(frame, kwargs["use"])
         data_list.append(frame_data_list)
       # end
     else:
@@ -0,0 +1,50 @@
+import click
+
+from postgkyl.data import stats as stats_index
+from postgkyl.utils import verb_print
+
+
+@click.command()
+@click.option("-u", "--use", help="Specify a 'tag' to apply to (default all tags).")
+@click.option("-b", "--build", is_flag=True,
+    help="Store the missing statistics in the sidecar index next to the files.")
+@click.option("-q", "--quiet", is_flag=True, help="Do not print the statistics.")
+@click.pass_context
+def stats(ctx, **kwargs):
+  """Print per-component statistics of active datasets.
+
+  The minimum, maximum, mean, RMS, L2 norm, and the number of NaNs are taken from the
+  sidecar index when available; otherwise, they are computed in a single pass. With
+  '--build', the computed statistics are stored so the following 'info', 'plot', and
+  'animate' calls do not need to read the values to find the ranges.
+  """
+  verb_print(ctx, "Starting stats")
+  data = ctx.obj["data"]
+
+  for i, dat in data.iterator(kwargs["use"], enum=True):
+    st = dat.get_stats(build=True, save=False, max_bytes=data.get_slab_bytes(dat))
+    if kwargs["quiet"]:
+      continue
+    # end
+    click.echo(click.style(
+        f"{dat.get_label():s}{' ' if dat.get_label() else '':s}({dat.get_tag():s}#{i:d})",
+        fg="green", bold=True))
+    if st is None:
+      click.echo("└─ No values\n")
+      continue
+    # end
+    num_comps = len(st["min"])
+    for c in range(num_comps):
+      pre = "└─" if c == num_comps - 1 else "├─"
+      click.echo(f"{pre:s} Component {c:d}: Min: {st['min'][c]:e}; Max: {st['max'][c]:e}; "
+          f"Mean: {st['mean'][c]:e}; RMS: {st['rms'][c]:e}; L2: {st['l2'][c]:e}; "
+          f"NaNs: {st['nan_count'][c]:d}")
+    # end
+    click.echo("")
+  # end
+
+  if kwargs["build"]:
+    stats_index.save_indices()
+  # end
+
+  verb_print(ctx, "Finishing stats")
@@ -6,15 +6,31 @@ from .dg import GInterpNodal
 from .dg import GInterpModal
 
 # Import interpolation matrices computation
-from . import computeInterpolationMatrices
-from . import computeDerivativeMatrices
+from . import dg_basis
 
 # Import select
 from .select import select
 
 from .idx_parser import idx_parser
 
+from .grid_cache import GridCache
+from .catalog import Catalog
+from . import matrix_cache
+from . import stats
+from . import reader_registry
+from .prefetch import FramePrefetcher, prefetch
+
 from .gkyl_reader import GkylReader
 from .gkyl_adios_reader import GkylAdiosReader
 from .gkyl_h5_reader import GkylH5Reader
 from .flash_h5_reader import FlashH5Reader
+
+
+def __getattr__(name):
+  # The symbolic matrix generators pull in sympy, which is slow to import; they are
+  # only loaded on the first access
+  if name in ("computeInterpolationMatrices", "computeDerivativeMatrices"):
+    import importlib
+    return importlib.import_module(f".{name:s}", __name__)
+  # end
+  raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,335 @@
+"""Module including the catalog of Gkeyll output files in a simulation directory."""
+
+import fnmatch
+import json
+import os
+import re
+import tempfile
+
+from postgkyl.data.gkyl_reader import GkylReader
+
+# Bump when the structure of the entries changes
+_INDEX_VERSION = 2
+
+_no_header = {"time": None, "shape": None, "dtype": None, "offset": None, "file_type": None}
+
+_frame_re = re.compile(r"^(.*)_(\d+)$")
+_block_re = re.compile(r"^(.*)_b(\d+)$")
+
+
+def parse_file_name(file_name: str) -> dict:
+  """Splits a Gkeyll output file name into its parts.
+
+  The default Gkeyll naming is '<name>[_b<block>]-<species>[_<suffix>]_<frame>.<ext>'.
+  Restart files end with '_restart' instead of the frame number.
+
+  Args:
+    file_name: str
+      File name; the directory part is ignored.
+
+  Returns:
+    Dictionary with 'stem' (file name without the frame number and extension), 'name',
+    'species', 'block', 'frame', 'ext', and 'restart'; the parts which are not present
+    are None.
+  """
+  base, ext = os.path.splitext(os.path.basename(file_name))
+  out = {"stem": base, "name": None, "species": None, "block": None, "frame": None,
+      "ext": ext[1:], "restart": False}
+  if base.endswith("_restart"):
+    base = base[:-8]
+    out["stem"] = base
+    out["restart"] = True
+  # end
+  m = _frame_re.match(base)
+  if m:
+    out["stem"] = m.group(1)
+    out["frame"] = int(m.group(2))
+  # end
+  if "-" in out["stem"]:
+    prefix, rest = out["stem"].split("-", 1)
+    out["species"] = rest.split("_")[0]
+  else:
+    prefix = out["stem"]
+  # end
+  m = _block_re.match(prefix)
+  if m:
+    out["name"] = m.group(1)
+    out["block"] = int(m.group(2))
+  else:
+    out["name"] = prefix
+  # end
+  return out
+
+
+def _read_header(path: str) -> dict:
+  # Header-only read; the payload is not touched
+  out = dict(_no_header)
+  reader = GkylReader(path)
+  if not reader.is_compatible():
+    return out
+  # end
+  try:
+    reader.preload()
+  except Exception:
+    return out
+  # end
+  time = reader.ctx.get("time")
+  out["time"] = float(time) if time is not None else None
+  out["dtype"] = reader.dtf.str
+  out["offset"] = int(reader.offset)
+  out["file_type"] = int(reader.file_type)
+  if reader.file_type != 2:
+    out["shape"] = [int(c) for c in reader.cells] + [int(reader.num_comps)]
+  # end
+  return out
+
+
+def _parse_range(spec: str, conv) -> tuple:
+  # 'lo:hi[:step]' (either bound can be omitted) or a single value
+  parts = str(spec).split(":")
+  if len(parts) == 1:
+    val = conv(parts[0])
+    return val, val, None
+  # end
+  lo = conv(parts[0]) if parts[0] else None
+  hi = conv(parts[1]) if parts[1] else None
+  step = int(parts[2]) if len(parts) == 3 and parts[2] else None
+  return lo, hi, step
+
+
+class Catalog(object):
+  """Index of the Gkeyll output files in a simulation directory.
+
+  The directory is scanned once with 'os.scandir'; the files with the 'extensions' are
+  indexed together with the files matching the 'pattern' (e.g., binary Gkeyll output
+  with other extensions). The selections by the name and the frame number use only
+  the file names. The headers (time, shape, data type, and the data offset) are read
+  when first needed, e.g., for the time selection. On request, the index is stored in
+  the directory (a hidden JSON file) and only the new or modified files are read again
+  when it is updated.
+
+  Example:
+    cat = Catalog("run")
+    files = cat.get_files("sim-elc", frames="100:200")
+  """
+
+  index_name = ".pgkyl_catalog.json"
+
+  def __init__(self, directory: str = ".", update: bool = True, save: bool = False,
+      pattern: str | None = None, extensions: tuple = ("gkyl", "bp")):
+    """Initialize the catalog.
+
+    Args:
+      directory: str = "."
+        Simulation directory.
+      update: bool = True
+        Scan the directory; otherwise, only the stored index is used.
+      save: bool = False
+        Store the updated index in the directory.
+      pattern: str | None = None
+        Shell-style wildcard of the additional files to index.
+      extensions: tuple = ("gkyl", "bp")
+        Extensions (without the dot) of the indexed files.
+    """
+    self.directory = directory or "."
+    self.save = save
+    self.extensions = {ext.lstrip(".").lower() for ext in extensions}
+    self.entries = {}
+    self._read_index()
+    if update:
+      self.update(pattern)
+    # end
+
+  def _get_index_path(self) -> str:
+    return os.path.join(self.directory, self.index_name)
+
+  def _read_index(self) -> None:
+    try:
+      with open(self._get_index_path(), "r") as fh:
+        index = json.load(fh)
+      # end
+    except (OSError, ValueError):
+      return
+    # end
+    if isinstance(index, dict) and index.get("version") == _INDEX_VERSION:
+      self.entries = index.get("entries", {})
+    # end
+
+  def _write_index(self) -> None:
+    # Write into a temporary file first and rename it; failing to write (e.g.,
+    # read-only directory) is not fatal
+    try:
+      fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+      with os.fdopen(fd, "w") as fh:
+        json.dump({"version": _INDEX_VERSION, "entries": self.entries}, fh)
+      # end
+      os.replace(tmp_name, self._get_index_path())
+    except OSError:
+      pass
+    # end
+
+  def update(self, pattern: str | None = None) -> bool:
+    """Scans the directory for the new, modified, or removed files.
+
+    Args:
+      pattern: str | None = None
+        Shell-style wildcard of the additional files to index; the files already in
+        the index are kept as well.
+
+    Returns:
+      True if the index changed.
+    """
+    entries = {}
+    changed = False
+    with os.scandir(self.directory) as it:
+      for de in it:
+        if not (os.path.splitext(de.name)[1][1:].lower() in self.extensions
+            or de.name in self.entries
+            or (pattern is not None and fnmatch.fnmatchcase(de.name, pattern))):
+          continue
+        elif de.name == self.index_name:
+          continue
+        # end
+        try:
+          if not de.is_file():
+            continue
+          # end
+          stat = de.stat()
+        except OSError:
+          continue
+        # end
+        old = self.entries.get(de.name)
+        if old and old["mtime_ns"] == stat.st_mtime_ns and old["size"] == stat.st_size:
+          entries[de.name] = old
+          continue
+        # end
+        entry = parse_file_name(de.name)
+        entry["mtime_ns"] = stat.st_mtime_ns
+        entry["size"] = stat.st_size
+        # The header is read when needed; '.bp' files have none to read
+        entry.update(_no_header)
+        entry["header"] = de.name.endswith(".bp")
+        entries[de.name] = entry
+        changed = True
+      # end
+    # end
+    changed = changed or len(entries) != len(self.entries)
+    self.entries = entries
+    if changed and self.save:
+      self._write_index()
+    # end
+    return changed
+
+  def _read_header(self, file_name: str) -> bool:
+    # Non-Gkeyll files are recognized by the header and get no metadata
+    entry = self.entries[file_name]
+    if entry["header"]:
+      return False
+    # end
+    entry.update(_read_header(os.path.join(self.directory, file_name)))
+    entry["header"] = True
+    return True
+
+  def get_entry(self, file_name: str) -> dict:
+    """Returns the entry of the file including the header information."""
+    if self._read_header(file_name) and self.save:
+      self._write_index()
+    # end
+    return self.entries[file_name]
+
+  def get_stems(self, extensions: list | None = None) -> list:
+    """Returns sorted unique file stems (file names without frames and extensions)."""
+    return sorted({e["stem"] for e in self.entries.values()
+        if extensions is None or e["ext"] in extensions})
+
+  def select(self, stem: str | None = None, pattern: str | None = None,
+      frames: str | None = None, time: str | None = None,
+      restart: bool = False, **kwargs) -> list:
+    """Selects entries.
+
+    Args:
+      stem: str | None = None
+        File stem, e.g., 'sim-elc_M0'.
+      pattern: str | None = None
+        Shell-style wildcard matched against the file names.
+      frames: str | None = None
+        Frame number, comma separated frame numbers, or a range 'lo:hi[:step]' (upper
+        bound excluded).
+      time: str | None = None
+        Time range 'lo:hi' (both bounds included); files without time are skipped.
+      restart: bool = False
+        Include restart files.
+      **kwargs
+        Other entry fields to match, e.g., 'species' or 'block'.
+
+    Returns:
+      List of (file name, entry) tuples sorted by the stem, frame, and extension.
+    """
+    out = []
+    frame_list = None
+    frame_range = None
+    if frames is not None:
+      if "," in str(frames):
+        frame_list = {int(f) for f in str(frames).split(",")}
+      else:
+        frame_range = _parse_range(frames, int)
+        if frame_range[2] is None and ":" not in str(frames):
+          frame_list = {frame_range[0]}
+          frame_range = None
+        # end
+      # end
+    # end
+    time_range = _parse_range(time, float) if time is not None else None
+
+    read = False
+    for fn, e in self.entries.items():
+      if e["restart"] and not restart:
+        continue
+      elif stem is not None and e["stem"] != stem:
+        continue
+      elif pattern is not None and not fnmatch.fnmatchcase(fn, pattern):
+        continue
+      elif any(e.get(key) != val for key, val in kwargs.items()):
+        continue
+      # end
+      if frame_list is not None or frame_range is not None:
+        if e["frame"] is None:
+          continue
+        elif frame_list is not None and e["frame"] not in frame_list:
+          continue
+        elif frame_range is not None:
+          lo, hi, step = frame_range
+          if (lo is not None and e["frame"] < lo) or (hi is not None and e["frame"] >= hi):
+            continue
+          elif step and (e["frame"] - (lo or 0)) % step != 0:
+            continue
+          # end
+        # end
+      # end
+      if time_range is not None:
+        lo, hi, _ = time_range
+        read = self._read_header(fn) or read
+        if e["time"] is None:
+          continue
+        elif (lo is not None and e["time"] < lo) or (hi is not None and e["time"] > hi):
+          continue
+        # end
+      # end
+      out.append((fn, e))
+    # end
+    if read and self.save:
+      self._write_index()
+    # end
+    out.sort(key=lambda x: (x[1]["stem"], x[1]["frame"] if x[1]["frame"] is not None else -1,
+        x[1]["ext"], x[0]))
+    return out
+
+  def get_files(self, stem: str | None = None, **kwargs) -> list:
+    """Same as 'select' but returns the list of file paths."""
+    return [os.path.join(self.directory, fn) if self.directory != "." else fn
+        for fn, _ in self.select(stem, **kwargs)]
+
+  def get_frames(self, stem: str | None = None, **kwargs) -> list:
+    """Same as 'select' but returns the sorted list of unique frame numbers."""
+    return sorted({e["frame"] for _, e in self.select(stem, **kwargs)
+        if e["frame"] is not None})
@@ -2,8 +2,8 @@ import numpy as np
 import os.path
 import tables
 
-from postgkyl.data.computeDerivativeMatrices import createDerivativeMatrix
-from postgkyl.data.computeInterpolationMatrices import createInterpMatrix
+from postgkyl.data.grid_cache import grid_cache
+from postgkyl.data.matrix_cache import get_derivative_matrix, get_interp_matrix
 
 # from postgkyl.data.recovData import recovC0Fn, recovC1Fn, recovEdFn
 
@@ -80,16 +80,16 @@ def _loadInterpMatrix(dim, poly_order, basis_type, interp, read, modal, c2p=Fals
     if interp is None:
       interp = poly_order + 1
     # end
-    mat = createInterpMatrix(dim, poly_order, basis_type, interp, modal, c2p)
+    mat = get_interp_matrix(dim, poly_order, basis_type, interp, modal, c2p)
     return mat
   elif basis_type == "tensor":
-    mat = createInterpMatrix(dim, poly_order, "tensor", poly_order + 1, True, c2p)
+    mat = get_interp_matrix(dim, poly_order, "tensor", poly_order + 1, True, c2p)
     return mat
   elif basis_type == "gkhybrid":
-    mat = createInterpMatrix(dim, poly_order, "gkhybrid", poly_order + 1, True, c2p)
+    mat = get_interp_matrix(dim, poly_order, "gkhybrid", poly_order + 1, True, c2p)
     return mat
   elif basis_type == "hybrid":
-    mat = createInterpMatrix(dim, poly_order, "hybrid", poly_order + 1, True, c2p)
+    mat = get_interp_matrix(dim, poly_order, "hybrid", poly_order + 1, True, c2p)
     return mat
   else:
     # Load interpolation matrix from the pre-computed HDF5 file.
@@ -117,11 +117,11 @@ def _loadInterpMatrix(dim, poly_order, basis_type, interp, read, modal, c2p=Fals
 
 def _loadDerivativeMatrix(dim, poly_order, basis_type, interp, read, modal=True):
   if interp is not None and read is None:
-    mat = createDerivativeMatrix(dim, poly_order, basis_type, interp, modal)
+    mat = get_derivative_matrix(dim, poly_order, basis_type, interp, modal)
     return mat
   else:
     interp = poly_order + 1
-    mat = createDerivativeMatrix(dim, poly_order, basis_type, interp, modal)
+    mat = get_derivative_matrix(dim, poly_order, basis_type, interp, modal)
     return mat
   # end
 
@@ -166,10 +166,29 @@ def _make1Dgrids(num_interp, Xc, num_dims, gridType=None):
   return gridOut
 
 
-def _interpOnMesh(cMat, qIn, nInterpIn, basis_type, c2p=False):
+def _interpOnMesh(cMat, qIn, nInterpIn, basis_type, c2p=False, chunk_size=None,
+    comp_axis=False):
+  """Interpolates DG expansion coefficients onto a fine mesh.
+
+  The interpolation is a single matrix product, (cells x coeffs) @ (coeffs x nodes),
+  followed by a reshuffle of the nodes into the fine mesh.
+
+  Args:
+    cMat: Interpolation matrix with shape (nodes, coeffs)
+    qIn: Expansion coefficients with shape (*cells, coeffs)
+    nInterpIn: Number of interpolation nodes in each direction
+    basis_type: Basis type; hybrid bases use an extra node in one direction
+    c2p: Nodes are shared by the neighboring cells
+    chunk_size: Number of cells along the first dimension processed at once; this
+      bounds the size of the temporary arrays (not used for 'c2p')
+    comp_axis: qIn has an extra axis before the coefficients, (*cells, comps, coeffs),
+      and all the components are interpolated at once; they are returned in the last
+      axis of the output
+  """
   numCells = np.array(qIn.shape)
   # last entry is indexing nodes, get rid of it
-  numCells = numCells[:-1]
+  numCells = numCells[:-2] if comp_axis else numCells[:-1]
+  num_comps = (qIn.shape[-2],) if comp_axis else ()
   num_dims = int(len(numCells))
   num_interp = np.array([max(nInterpIn, 2)] * num_dims)
   if basis_type == "gkhybrid":
@@ -181,31 +200,63 @@ def _interpOnMesh(cMat, qIn, nInterpIn, basis_type, c2p=False):
   if basis_type == "hybrid":
     num_interp[-1] = nInterpIn + 1
   # end
-  if c2p:
-    qOut = np.zeros(numCells*(num_interp - 1) + 1, np.float64)
-  else:
-    qOut = np.zeros(numCells*num_interp, np.float64)
+  cMat = cMat[:np.prod(num_interp)]
+  # The output keeps the floating point precision of the input, e.g., single precision
+  # data are not promoted by the double precision matrices
+  dtype = np.result_type(qIn.dtype, np.float32)
+  cMat = cMat.astype(dtype, copy=False)
+
+  # The node index is unraveled in the Fortran order, i.e., the fastest going index is
+  # the first one; (c0, ..., i_{d-1}, ..., i0) -> (c0, i0, c1, i1, ...)
+  offset = num_dims + len(num_comps)
+  axes = []
+  for d in range(num_dims):
+    axes.extend([d, offset + num_dims - 1 - d])
   # end
-  # move the node index from last to the first
-  qIn = np.moveaxis(qIn, -1, 0)
-  # Main loop
-  for n in range(np.prod(num_interp)):
-    # https://docs.scipy.org/doc/numpy/reference/generated/numpy.tensordot.html
-    temp = np.tensordot(cMat[n, :], qIn, axes=1)
-    # decompose n to i,j,k,... indices based on the number of dimensions
-    startIdx = np.unravel_index(n, num_interp, order="F")
-    # define multi-D qOut slices
-    if c2p:
-      idxs = [slice(int(startIdx[i]), int(numCells[i]*(num_interp[i] - 1) + startIdx[i]),
-                  num_interp[i] - 1)
-         for i in range(num_dims)]
-    else:
-      idxs = [slice(int(startIdx[i]), int(numCells[i]*num_interp[i]), num_interp[i])
-          for i in range(num_dims)]
+  if comp_axis:
+    axes.append(num_dims)
+  # end
+
+  def expand(q, out=None):
+    temp = np.matmul(q, cMat.T, out=out)
+    return temp.reshape(tuple(q.shape[:-1]) + tuple(num_interp[::-1])).transpose(axes)
+  # end
+
+  if c2p:
+    # The neighboring cells share the boundary nodes; the upper node of the lower
+    # cell is used.
+    temp = expand(qIn)
+    idxs = []
+    for d in range(num_dims):
+      p = np.arange(numCells[d]*(num_interp[d] - 1) + 1)
+      shape = [1] * num_dims
+      shape[d] = len(p)
+      cell_idx = np.maximum(p - 1, 0) // (num_interp[d] - 1)
+      node_idx = p - cell_idx * (num_interp[d] - 1)
+      idxs.extend([cell_idx.reshape(shape), node_idx.reshape(shape)])
     # end
-    qOut[tuple(idxs)] = temp
+    return np.array(temp[tuple(idxs) + (Ellipsis,)], dtype)
   # end
-  return np.array(qOut)
+
+  qOut = np.empty(tuple(numCells*num_interp) + num_comps, dtype)
+  if chunk_size is None:
+    chunk_size = numCells[0]
+  # end
+  # The products of all the chunks go into the same buffer and are reshuffled
+  # directly into the output through its (c0, i0, c1, i1, ...) view
+  buf = np.empty((min(chunk_size, numCells[0]),) + tuple(qIn.shape[1:-1]) + (len(cMat),),
+      dtype)
+  interleaved = []
+  for d in range(1, num_dims):
+    interleaved.extend([numCells[d], num_interp[d]])
+  # end
+  for lo in range(0, numCells[0], chunk_size):
+    up = min(lo + chunk_size, numCells[0])
+    out = qOut[lo*num_interp[0] : up*num_interp[0]].reshape(
+        (up - lo, num_interp[0]) + tuple(interleaved) + num_comps)
+    out[...] = expand(qIn[lo:up], out=buf[:up - lo])
+  # end
+  return qOut
 
 
 class GInterp(object):
@@ -230,25 +281,34 @@ class GInterp(object):
     self.gridType = data.get_grid_type()
 
   def _getRawNodal(self, component):
+    # Nodal values are stored node-major, i.e., (..., nodes, eqns); int component
+    # returns (..., nodes), tuple or slice returns (..., comps, nodes)
     q = self.data.get_values()
-    numEqns = self.numEqns
-    shp = [q.shape[i] for i in range(self.num_dims)]
-    shp.append(self.num_nodes)
-    rawData = np.zeros(shp, np.float64)
-    for n in range(self.num_nodes):
-      rawData[..., n] = q[..., int(component + n * numEqns)]
+    numEqns = int(self.numEqns)
+    q = q[..., :self.num_nodes*numEqns].reshape(
+        q.shape[:self.num_dims] + (self.num_nodes, numEqns))
+    if isinstance(component, int):
+      return q[..., component]
+    elif isinstance(component, tuple):
+      component = list(component)
     # end
-    return rawData
+    return np.swapaxes(q[..., component], -1, -2)
 
   def _getRawModal(self, component):
+    # Modal coefficients are stored component-major, i.e., (..., comps, coeffs); int
+    # component returns (..., coeffs), tuple or slice returns (..., comps, coeffs)
     q = self.data.get_values()
-    shp = [q.shape[i] for i in range(self.num_dims)]
-    shp.append(self.num_nodes)
-    rawData = np.zeros(shp, np.float64)
-    lo = int(component * self.num_nodes)
-    up = int(lo + self.num_nodes)
-    rawData = q[..., lo:up]
-    return rawData
+    if isinstance(component, int):
+      lo = int(component * self.num_nodes)
+      up = int(lo + self.num_nodes)
+      return q[..., lo:up]
+    elif isinstance(component, tuple):
+      component = list(component)
+    # end
+    numEqns = int(self.numEqns)
+    q = q[..., :self.num_nodes*numEqns].reshape(
+        q.shape[:self.num_dims] + (numEqns, self.num_nodes))
+    return q[..., component, :]
 
 
 class GInterpNodal(GInterp):
@@ -290,7 +350,7 @@ class GInterpNodal(GInterp):
     num_nodes = _getnum_nodes(self.num_dims, self.poly_order, self.basis_type)
     GInterp.__init__(self, data, num_nodes)
 
-  def interpolate(self, comp=0, overwrite=False, stack=False):
+  def interpolate(self, comp=0, overwrite=False, stack=False, chunk_size=None):
     if stack:
       overwrite = stack
       print("Deprecation warning: The 'stack' parameter is going to be replaced with 'overwrite'")
@@ -298,29 +358,12 @@ class GInterpNodal(GInterp):
     cMat = _loadInterpMatrix(self.num_dims, self.poly_order, self.basis_type,
         self.num_interp, self.read, False)
     if isinstance(comp, int):
-      q = self._getRawNodal(comp)
-      values = _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis]
-    elif isinstance(comp, tuple):
-      q = self._getRawNodal(comp[0])
-      values = _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis]
-      for c in comp[1:]:
-        q = self._getRawNodal(c)
-        values = np.append(values,
-            _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis],
-            axis=-1)
-      # end
-    elif isinstance(comp, slice):
-      q = self._getRawNodal(comp.start)
-      values = _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis]
-      for c in range(comp.start + 1, comp.stop):
-        q = self._getRawNodal(c)
-        values = np.append(
-            values,
-            _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis],
-            axis=-1,
-        )
-      # end
+      comp = slice(comp, comp + 1)
     # end
+    # All the components are interpolated at once
+    q = self._getRawNodal(comp)
+    values = _interpOnMesh(cMat, q, self.num_interp, self.basis_type,
+        chunk_size=chunk_size, comp_axis=True)
 
     num_interp = [int(round(cMat.shape[0] ** (1.0 / self.num_dims)))] * self.num_dims
     grid = _make1Dgrids(num_interp, self.Xc, self.num_dims)
@@ -339,10 +382,8 @@ class GInterpNodal(GInterp):
     cMat = _loadDerivativeMatrix(self.num_dims, self.poly_order, self.basis_type,
         self.num_interp, self.read, False)
     if direction is not None:
-      values = (
-          _interpOnMesh(cMat[:, :, direction], q, self.num_interp, self.basis_type)
-          * 2
-          / (self.Xc[direction][1] - self.Xc[direction][0]))
+      values = _interpOnMesh(cMat[:, :, direction], q, self.num_interp, self.basis_type)
+      values *= 2 / (self.Xc[direction][1] - self.Xc[direction][0])
       values = values[..., np.newaxis]
     else:
       values = np.zeros(q.shape, self.num_dims)
@@ -439,7 +480,28 @@ class GInterpModal(GInterp):
     num_nodes = _getnum_nodes(self.num_dims, self.poly_order, self.basis_type)
     GInterp.__init__(self, data, num_nodes)
 
-  def interpolate(self, comp=0, overwrite=False, stack=False):
+  def _getC2pGrid(self, num_interp, basis_type=None):
+    q = self.data.get_grid()
+    num_comp = q[0].shape[-1]
+    basis, poly_order = _get_basis_p(self.num_dims, num_comp)
+
+    def interpolateC2p():
+      cMat = _loadInterpMatrix(self.num_dims, poly_order, basis, self.num_interp,
+          self.read, True, True)
+      return tuple(_interpOnMesh(cMat, q[d], num_interp, basis_type or basis, True)
+          for d in range(self.num_dims))
+    # end
+
+    source = self.data.get_c2p_source()
+    if source is None:
+      return list(interpolateC2p())
+    # end
+    # Grid read from the mapping file is the same for all the frames with the same cuts
+    c2p_name, cuts = source
+    key = ("c2p_interp", cuts, self.num_interp, num_interp, basis_type, self.read)
+    return list(grid_cache.get(c2p_name, key, interpolateC2p))
+
+  def interpolate(self, comp=0, overwrite=False, stack=False, chunk_size=None):
     if stack:
       overwrite = stack
       print("Deprecation warning: The 'stack' parameter is going to be replaced with 'overwrite'")
@@ -447,37 +509,14 @@ class GInterpModal(GInterp):
     cMat = _loadInterpMatrix(self.num_dims, self.poly_order, self.basis_type,
         self.num_interp, self.read, True)
     if isinstance(comp, int):
-      q = self._getRawModal(comp)
-      values = _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis]
-    elif isinstance(comp, tuple):
-      q = self._getRawModal(comp[0])
-      values = _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis]
-      for c in comp[1:]:
-        q = self._getRawModal(c)
-        values = np.append(values,
-            _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis],
-            axis=-1)
-      # end
-    elif isinstance(comp, slice):
-      q = self._getRawModal(comp.start)
-      values = _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis]
-      for c in range(comp.start + 1, comp.stop):
-        q = self._getRawModal(c)
-        values = np.append(values,
-            _interpOnMesh(cMat, q, self.num_interp, self.basis_type)[..., np.newaxis],
-            axis=-1)
-      # end
+      comp = slice(comp, comp + 1)
     # end
+    # All the components are interpolated at once
+    q = self._getRawModal(comp)
+    values = _interpOnMesh(cMat, q, self.num_interp, self.basis_type,
+        chunk_size=chunk_size, comp_axis=True)
     if self.data.ctx["grid_type"] == "c2p":
-      q = self.data.get_grid()
-      num_comp = q[0].shape[-1]
-      basis, poly_order = _get_basis_p(self.num_dims, num_comp)
-      cMat = _loadInterpMatrix(self.num_dims, poly_order, basis, self.num_interp,
-          self.read, True, True)
-      grid = []
-      for d in range(self.num_dims):
-        grid.append(_interpOnMesh(cMat, q[d], self.num_interp + 1, basis, True))
-      # end
+      grid = self._getC2pGrid(self.num_interp + 1)
     else:
       if self.basis_type == "gkhybrid":
         # 1x1v, 1x2v, 2x2v, 3x2v cases, with p=2 in the first velocity dim.
@@ -516,15 +555,7 @@ class GInterpModal(GInterp):
 
   def interpolateGrid(self, overwrite=False):
     if self.data.ctx["grid_type"] == "c2p":
-      q = self.data.get_grid()
-      num_comp = q[0].shape[-1]
-      basis, poly_order = _get_basis_p(self.num_dims, num_comp)
-      cMat = _loadInterpMatrix(self.num_dims, poly_order, basis, self.num_interp,
-          self.read, True, True)
-      grid = []
-      for d in range(self.num_dims):
-        grid.append(_interpOnMesh(cMat, q[d], self.num_interp, self.basis_type, True))
-      # end
+      grid = self._getC2pGrid(self.num_interp, self.basis_type)
     elif self.data.ctx["grid_type"] == "c2p_vel":
       q = self.data.get_grid()
     else:
@@ -547,8 +578,8 @@ class GInterpModal(GInterp):
     cMat = _loadDerivativeMatrix(self.num_dims, self.poly_order, self.basis_type,
         self.num_interp, self.read, True)
     if direction is not None:
-      values = (_interpOnMesh(cMat[:, :, direction], q, self.num_interp, self.basis_type)*2
-          / (self.Xc[direction][1] - self.Xc[direction][0]))
+      values = _interpOnMesh(cMat[:, :, direction], q, self.num_interp, self.basis_type)
+      values *= 2 / (self.Xc[direction][1] - self.Xc[direction][0])
       values = values[..., np.newaxis]
     else:
       values = _interpOnMesh(cMat[..., 0], q, self.num_interp, self.basis_type)
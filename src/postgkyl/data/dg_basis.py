@@ -0,0 +1,245 @@
+"""Module including numerical evaluation of the DG basis functions.
+
+The modal bases are orthonormal products of 1D Legendre polynomials and are fully
+described by the exponents of the polynomials in each direction. The order of the basis
+functions matches the one used by Gkeyll: functions are sorted by their total degree,
+then by the sorted exponents, and finally by the exponents in the reversed order of the
+directions. The hybrid bases (used by gyrokinetics and PKPM) are the linear tensor basis
+followed by the same functions multiplied by the quadratic polynomial in one of the
+velocity directions.
+
+The functions here are drop-in replacements for the symbolic 'createInterpMatrix' and
+'createDerivativeMatrix'.
+"""
+
+import itertools
+import numpy as np
+
+
+def _get_hybrid_dir(dim: int, basis_type: str) -> int | None:
+  # Direction with the quadratic polynomial; the first velocity direction for the
+  # gyrokinetic hybrid and the last direction for the PKPM hybrid
+  if dim == 1:
+    return None
+  elif basis_type == "gkhybrid":
+    gk_dirs = {2: 1, 3: 1, 4: 2, 5: 3}
+    if dim not in gk_dirs:
+      raise NameError(f"dg_basis: Dimension {dim:d} is not supported for 'gkhybrid' basis!")
+    # end
+    return gk_dirs[dim]
+  elif basis_type == "hybrid":
+    return dim - 1
+  # end
+  return None
+
+
+def _sort_key(exps: tuple) -> tuple:
+  return (sum(exps), tuple(sorted(exps, reverse=True)), exps[::-1])
+
+
+def get_exponents(dim: int, poly_order: int, basis_type: str) -> np.ndarray:
+  """Returns the Legendre polynomial exponents of the modal basis functions.
+
+  Args:
+    dim: int
+      Number of dimensions.
+    poly_order: int
+      Polynomial order.
+    basis_type: str
+      One of 'serendipity', 'tensor', 'maximal-order', 'gkhybrid', or 'hybrid'.
+
+  Returns:
+    Integer array with the shape (num_basis, dim).
+  """
+  if dim < 1:
+    raise NameError(f"dg_basis: Dimension {dim:d} is not supported.")
+  # end
+  if poly_order < 0:
+    raise NameError(f"dg_basis: Order {poly_order:d} is not supported!")
+  # end
+  hybrid_dir = None
+  if dim == 1:
+    # All the bases are the same in 1D
+    basis_type = "tensor"
+  elif basis_type in ("gkhybrid", "hybrid"):
+    if poly_order != 1:
+      raise NameError(
+          f"dg_basis: Order {poly_order:d} is not supported!\n"
+          "Polynomial order must be =1")
+    # end
+    hybrid_dir = _get_hybrid_dir(dim, basis_type)
+  elif basis_type not in ("serendipity", "tensor", "maximal-order"):
+    raise NameError(f"dg_basis: Basis {basis_type} is not supported!")
+  # end
+
+  max_exps = [poly_order] * dim
+  if hybrid_dir is not None:
+    max_exps[hybrid_dir] = 2
+  # end
+  exps = []
+  for e in itertools.product(*[range(m + 1) for m in max_exps]):
+    if basis_type in ("tensor", "gkhybrid", "hybrid"):
+      exps.append(e)
+    elif basis_type == "maximal-order" and sum(e) <= poly_order:
+      exps.append(e)
+    elif basis_type == "serendipity" and sum(k for k in e if k > 1) <= poly_order:
+      # Superlinear degree (sum of the exponents larger than one) is limited
+      if poly_order > 0 or sum(e) == 0:
+        exps.append(e)
+      # end
+    # end
+  # end
+
+  if hybrid_dir is None:
+    exps.sort(key=_sort_key)
+  else:
+    def _hybrid_key(e):
+      lin = e[:hybrid_dir] + (e[hybrid_dir] % 2,) + e[hybrid_dir + 1 :]
+      return (e[hybrid_dir] // 2, _sort_key(lin))
+    exps.sort(key=_hybrid_key)
+  # end
+  return np.array(exps, dtype=int).reshape(-1, dim)
+
+
+def _legendre(max_exp: int, x: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+  # Orthonormal Legendre polynomials on [-1, 1] and their derivatives evaluated at 'x'
+  p = np.zeros((max_exp + 1, len(x)))
+  dp = np.zeros((max_exp + 1, len(x)))
+  p[0] = 1.0
+  if max_exp > 0:
+    p[1] = x
+    dp[1] = 1.0
+  # end
+  for k in range(2, max_exp + 1):
+    p[k] = ((2*k - 1)*x*p[k - 1] - (k - 1)*p[k - 2]) / k
+    dp[k] = dp[k - 2] + (2*k - 1)*p[k - 1]
+  # end
+  norm = np.sqrt((2*np.arange(max_exp + 1) + 1) / 2)[:, np.newaxis]
+  return p*norm, dp*norm
+
+
+def _get_interp_points(num_points: int, c2p: bool) -> np.ndarray:
+  # Cell centers of the sub-cells or the sub-cell edges for the mapped grids
+  if c2p:
+    return np.linspace(-1.0, 1.0, num_points)
+  # end
+  return -1.0*(num_points - 1) / num_points + np.arange(num_points)*2.0 / num_points
+
+
+def _eval_modal(exps: np.ndarray, points: list, deriv_dir: int | None = None) -> np.ndarray:
+  # Evaluate the modal basis on the tensor product of 1D points; the first direction is
+  # the fastest changing one
+  dim = exps.shape[1]
+  idxs = np.meshgrid(*[np.arange(len(pts)) for pts in points], indexing="ij")
+  mat = np.ones((np.prod([len(pts) for pts in points]), exps.shape[0]))
+  for d in range(dim):
+    p, dp = _legendre(int(exps[:, d].max()), points[d])
+    table = dp if d == deriv_dir else p
+    mat *= table[exps[:, d]][:, idxs[d].ravel(order="F")].T
+  # end
+  return mat
+
+
+def _get_nodes(dim: int, poly_order: int) -> np.ndarray:
+  # Nodes of the nodal serendipity basis; equidistant nodes with at most one interior
+  # coordinate, the first direction is the fastest changing one
+  if dim > 1 and poly_order > 2:
+    raise NameError(
+        f"dg_basis: Order {poly_order:d} is not supported for nodal basis!\n"
+        "Polynomial order must be <3")
+  elif poly_order < 1:
+    raise NameError(
+        f"dg_basis: Order {poly_order:d} is not supported for nodal basis!")
+  # end
+  nodes_1d = np.linspace(-1.0, 1.0, poly_order + 1)
+  nodes = []
+  for idx in itertools.product(range(poly_order + 1), repeat=dim):
+    idx = idx[::-1]
+    if dim == 1 or sum(0 < i < poly_order for i in idx) <= 1:
+      nodes.append([nodes_1d[i] for i in idx])
+    # end
+  # end
+  return np.array(nodes)
+
+
+def _to_nodal(mat: np.ndarray, exps: np.ndarray, dim: int, poly_order: int) -> np.ndarray:
+  # Transform the modal matrix into the nodal one; nodal functions are the combinations
+  # of the modal ones which are equal to one at a single node and zero at the others
+  nodes = _get_nodes(dim, poly_order)
+  vand = np.ones((nodes.shape[0], exps.shape[0]))
+  for d in range(dim):
+    p, _ = _legendre(int(exps[:, d].max()), nodes[:, d])
+    vand *= p[exps[:, d]].T
+  # end
+  return np.linalg.solve(vand.T, mat.T).T
+
+
+def create_interp_matrix(dim: int, poly_order: int, basis_type: str, interp: int,
+    modal: bool = True, c2p: bool = False) -> np.ndarray:
+  """Creates the interpolation matrix.
+
+  Args:
+    dim: int
+      Number of dimensions.
+    poly_order: int
+      Polynomial order.
+    basis_type: str
+      Basis name; nodal basis is always serendipity.
+    interp: int
+      Number of interpolation points per cell and direction; the quadratic direction of
+      the hybrid bases uses one more.
+    modal: bool = True
+      Modal or nodal basis.
+    c2p: bool = False
+      Interpolate onto the sub-cell edges (including the cell edges) instead of the
+      sub-cell centers.
+
+  Returns:
+    Array with the shape (num_points, num_basis); points are ordered with the first
+    direction changing the fastest.
+  """
+  if not modal:
+    basis_type = "serendipity"
+  # end
+  exps = get_exponents(dim, poly_order, basis_type)
+  hybrid_dir = _get_hybrid_dir(dim, basis_type)
+  num_points = interp + 1 if c2p else interp
+  points = []
+  for d in range(dim):
+    n = num_points + 1 if d == hybrid_dir else num_points
+    points.append(_get_interp_points(n, c2p))
+  # end
+  mat = _eval_modal(exps, points)
+  if not modal:
+    mat = _to_nodal(mat, exps, dim, poly_order)
+  # end
+  return mat
+
+
+def create_derivative_matrix(dim: int, poly_order: int, basis_type: str, interp: int,
+    modal: bool = True) -> np.ndarray:
+  """Creates the derivative matrix.
+
+  Same as 'create_interp_matrix' but evaluates the derivatives of the basis functions.
+
+  Returns:
+    Array with the shape (num_points, num_basis, dim); the last axis is the direction
+    of the derivative.
+  """
+  if not modal:
+    basis_type = "serendipity"
+  # end
+  exps = get_exponents(dim, poly_order, basis_type)
+  hybrid_dir = _get_hybrid_dir(dim, basis_type)
+  points = []
+  for d in range(dim):
+    n = interp + 1 if d == hybrid_dir else interp
+    points.append(_get_interp_points(n, False))
+  # end
+  mat = np.stack([_eval_modal(exps, points, d) for d in range(dim)], axis=-1)
+  if not modal:
+    for d in range(dim):
+      mat[..., d] = _to_nodal(mat[..., d], exps, dim, poly_order)
+    # end
+  # end
+  return mat
@@ -5,6 +5,8 @@ import numpy as np
 import tables
 from typing import Tuple
 
+from postgkyl.data.idx_parser import idx_to_slice
+
 # FLASH variable names
 # dens : the density in g/cc
 # tele : the electron temperature in K
@@ -30,9 +32,26 @@ from typing import Tuple
 class FlashH5Reader(object):
   """Provides a framework to read FLASH h5 output"""
 
-  def __init__(self, file_name: str, var_name: str, ctx: dict = None, **kwargs) -> None:
+  def __init__(self, file_name: str, var_name: str, ctx: dict = None,
+      axes: tuple | None = (None, None, None, None, None, None), **kwargs) -> None:
+    """Initialize the instance of FLASH reader.
+
+    Args:
+      file_name: str
+      var_name: str
+        FLASH variable name, e.g., 'dens'.
+      ctx: dict
+        Passes context variable with metadata.
+      axes: tuple
+        Partial load along the axes of the uniform (finest resolution) grid; only the
+        blocks overlapping the selection are read.
+      **kwargs
+        This is not directly used but allowes for unified interface to all the readers
+        we use.
+    """
     self._file_name = file_name
     self.var_name = var_name
+    self.axes = axes if axes is not None else (None,) * 6
 
     self.ctx = ctx
 
@@ -49,43 +68,108 @@ class FlashH5Reader(object):
     fh.close()
     return out
 
+  def _read_tree(self, fh: tables.File) -> None:
+    # Block bounding boxes; these are small compared to the variables
+    self.coord = fh.root["coordinates"].read().transpose()
+    self.bsize = fh.root["block size"].read().transpose()
+    self.ntype = fh.root["node type"].read().transpose()
+    _, _, self.nyb, self.nxb = fh.root[self.var_name].shape
+
+    self.res = self.bsize.min(axis=1)
+    self.lower = (self.coord - self.bsize / 2).min(axis=1)
+    self.upper = (self.coord + self.bsize / 2).max(axis=1)
+    nxax = math.floor((self.upper[0] - self.lower[0]) / (self.res[0] / self.nxb))
+    nyax = math.floor((self.upper[1] - self.lower[1]) / (self.res[1] / self.nyb))
+    self.cells = np.array([nxax, nyax])
+
   def _read_frame(self) -> tuple:
     fh = tables.open_file(self._file_name, "r")
-    coord = fh.root["coordinates"].read().transpose()
-    bsize = fh.root["block size"].read().transpose()
-    ntype = fh.root["node type"].read().transpose()
-    bdata = fh.root[self.var_name].read().transpose()
-
-    nxb, nyb, _, N = bdata.shape
-    res = bsize.min(axis=1)
-    lower = (coord - bsize / 2).min(axis=1)
-    upper = (coord + bsize / 2).max(axis=1)
-
-    nxax = math.floor((upper[0] - lower[0]) / (res[0] / nxb))
-    nyax = math.floor((upper[1] - lower[1]) / (res[1] / nyb))
-    data = np.zeros((nxax, nyax))
-    for b in range(N):
-      if ntype[b] == 1:
-        mult = np.ceil(bsize[:, b] / res)
-        idxx = math.floor((coord[0, b] - bsize[0, b] / 2 - lower[0]) / res[0] * nxb)
-        idxy = math.floor((coord[1, b] - bsize[1, b] / 2 - lower[1]) / res[1] * nyb)
-        for i in range(nxb):
-          for j in range(nyb):
-            data[
-                idxx + i * int(mult[0]) : idxx + (i + 1) * int(mult[0]) + 1,
-                idxy + j * int(mult[1]) : idxy + (j + 1) * int(mult[1]) + 1,
-            ] = bdata[i, j, 0, b]
-          # end
-        # end
+    self._read_tree(fh)
+    nxb, nyb = self.nxb, self.nyb
+    lower, upper, res = self.lower, self.upper, self.res
+    grid = [np.linspace(lower[d], upper[d], self.cells[d] + 1) for d in range(2)]
+    sel = [idx_to_slice(self.axes[d], grid[d], self.cells[d]) for d in range(2)]
+    win = [s for s, _ in sel]
+
+    # Fine-grid extents of the leaf blocks; each block covers its cells refined by
+    # 'mult' plus one more row and column (overwritten by the following cells)
+    blocks = []
+    for b in np.flatnonzero(self.ntype == 1):
+      mult = np.ceil(self.bsize[:2, b] / res[:2]).astype(int)
+      idxx = math.floor((self.coord[0, b] - self.bsize[0, b] / 2 - lower[0]) / res[0] * nxb)
+      idxy = math.floor((self.coord[1, b] - self.bsize[1, b] / 2 - lower[1]) / res[1] * nyb)
+      if (idxx + nxb*mult[0] + 1 <= win[0].start or idxx >= win[0].stop
+          or idxy + nyb*mult[1] + 1 <= win[1].start or idxy >= win[1].stop):
+        continue  # outside of the selection
       # end
+      blocks.append((b, mult, idxx, idxy))
+    # end
+
+    # Blocks are read in contiguous runs as hyperslabs
+    node = fh.root[self.var_name]
+    bdata = {}
+    i = 0
+    while i < len(blocks):
+      j = i + 1
+      while j < len(blocks) and blocks[j][0] == blocks[j - 1][0] + 1:
+        j += 1
+      # end
+      run = node[blocks[i][0] : blocks[j - 1][0] + 1, 0]
+      for k in range(i, j):
+        bdata[blocks[k][0]] = run[k - i].transpose()
+      # end
+      i = j
     # end
     fh.close()
-    return data.shape, lower[:2], upper[:2], data[..., np.newaxis]
+
+    data = np.zeros((win[0].stop - win[0].start, win[1].stop - win[1].start))
+    for b, mult, idxx, idxy in blocks:
+      # Each cell is repeated 'mult' times; the extra row and column repeat the edge
+      fine = np.repeat(np.repeat(bdata[b], mult[0], axis=0), mult[1], axis=1)
+      fine = np.pad(fine, ((0, 1), (0, 1)), mode="edge")
+      lo = [max(idxx, win[0].start), max(idxy, win[1].start)]
+      up = [min(idxx + fine.shape[0], win[0].stop, self.cells[0]),
+          min(idxy + fine.shape[1], win[1].stop, self.cells[1])]
+      if up[0] <= lo[0] or up[1] <= lo[1]:
+        continue
+      # end
+      data[lo[0] - win[0].start : up[0] - win[0].start,
+          lo[1] - win[1].start : up[1] - win[1].start] = \
+          fine[lo[0] - idxx : up[0] - idxx, lo[1] - idxy : up[1] - idxy]
+    # end
+    for d, (_, idx) in enumerate(sel):
+      if idx is not None:
+        data = np.take(data, idx, axis=d)
+      # end
+    # end
+
+    dz = (upper[:2] - lower[:2]) / self.cells
+    lower = lower[:2] + np.array([s.start for s in win]) * dz
+    upper = lower + np.array([s.stop - s.start for s in win]) * dz
+    return data.shape, lower, upper, data[..., np.newaxis]
 
   # ---- Exposed functions ----
-  def get_data(self) -> Tuple[np.ndarray, np.ndarray]:
+  def preload(self) -> None:
+    """Loads metadata."""
+    pass
+
+  def load(self) -> Tuple[list, np.ndarray]:
+    """Loads data.
+
+    Returns:
+      A tuple including a grid list and a data NumPy array
+    """
     cells, lower, upper, data = self._read_frame()
     num_dims = len(cells)
     grid = [np.linspace(lower[d], upper[d], cells[d] + 1) for d in range(num_dims)]
-
+    if self.ctx is not None:
+      self.ctx["cells"] = np.array(cells)
+      self.ctx["lower"] = lower
+      self.ctx["upper"] = upper
+      self.ctx["num_comps"] = 1
+      self.ctx["grid_type"] = "uniform"
+    # end
     return grid, data
+
+  def get_data(self) -> Tuple[np.ndarray, np.ndarray]:
+    return self.load()
@@ -1,8 +1,12 @@
 """Module including Gkeyll data class"""
 
-from typing import Literal, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, Literal, Tuple
 import numpy as np
+import os
 import shutil
+import tempfile
+import zlib
 
 try:
   import adios2
@@ -13,11 +17,76 @@ except ModuleNotFoundError:
 
 from postgkyl.data.gkyl_reader import GkylReader
 from postgkyl.data.gkyl_adios_reader import GkylAdiosReader
-from postgkyl.data.gkyl_h5_reader import GkylH5Reader
-from postgkyl.data.flash_h5_reader import FlashH5Reader
+import postgkyl.data.idx_parser as idx_parser
+import postgkyl.data.reader_registry as reader_registry
+import postgkyl.data.stats as stats_index
 import postgkyl.utils.gkeyll_enums as gkenums
 
 
+def _to_json(val):
+  # NumPy scalars and arrays in the metadata are converted to the Python types
+  if isinstance(val, np.ndarray):
+    return _to_json(val.tolist())
+  elif isinstance(val, np.generic):
+    return _to_json(val.item())
+  elif isinstance(val, complex):
+    return {"real": val.real, "imag": val.imag}
+  elif isinstance(val, bytes):
+    return val.decode(errors="replace")
+  elif isinstance(val, dict):
+    return {str(key): _to_json(v) for key, v in val.items()}
+  elif isinstance(val, (list, tuple)):
+    return [_to_json(v) for v in val]
+  elif val is None or isinstance(val, (bool, int, float, str)):
+    return val
+  # end
+  return str(val)
+
+
+def _parse_steps(steps: int | str | range | None, num_steps: int) -> range:
+  # Step, 'lo:hi[:step]' (either bound can be omitted), or all the steps
+  all_steps = range(num_steps)
+  if steps is None:
+    return all_steps
+  elif isinstance(steps, range):
+    return steps
+  elif isinstance(steps, int):
+    return all_steps[steps : steps + 1 or None]
+  # end
+  parts = str(steps).split(":")
+  if len(parts) == 1:
+    return _parse_steps(int(parts[0]), num_steps)
+  # end
+  return all_steps[slice(*[int(p) if p else None for p in parts])]
+
+
+def _get_checksum(values: np.ndarray | None) -> int | None:
+  # Cheap fingerprint of the values (about the cost of a copy); memory-mapped values are
+  # read-only and not read here
+  if values is None or isinstance(values, np.memmap):
+    return None
+  # end
+  return zlib.crc32(np.ascontiguousarray(values).data)
+
+
+def _slice_grid(grid: list, axis: int, lo: int, up: int, num_cells: int) -> list:
+  # Slice the grid like the values; nodal coordinates include one more point
+  out = list(grid)
+  for d, coord in enumerate(grid):
+    if len(coord.shape) == len(grid) + 1:  # Mapped (c2p) coordinate of every cell
+      ax = axis
+    elif d == axis:  # Coordinate of the dimension (nodal or mapped velocity)
+      ax = 0
+    else:
+      continue
+    # end
+    idx = [slice(None)] * len(coord.shape)
+    idx[ax] = slice(lo, up + 1 if coord.shape[ax] == num_cells + 1 else up)
+    out[d] = coord[tuple(idx)]
+  # end
+  return out
+
+
 class GData(object):
   """Provides interface to (not only) Gkeyll output data.
 
@@ -31,6 +100,12 @@ class GData(object):
 
   """
 
+  # Command-line chains can hold 10^4-10^5 datasets; slots keep the instances compact
+  __slots__ = ("_grid", "_values", "_reader", "_reloadable", "_spill_file", "_dtype",
+      "ctx", "_tag", "_comp_grid", "_label", "_custom_label", "_var_name", "_file_name",
+      "_mapc2p_name", "_mapc2p_vel_name", "color", "_neighbors", "_status", "_shared",
+      "_checksum", "_grid_read")
+
   def __init__(self, file_name: str = "",
       comp: int | str | None = None,
       z0: int | str | None = None, z1: int | str | None = None,
@@ -40,7 +115,8 @@ class GData(object):
       tag: str = "default", label: str = "",
       ctx: dict | None = None,
       comp_grid: bool = False, mapc2p_name: str = "", mapc2p_vel_name: str = "",
-      reader_name: str = "", load: bool = True, click_mode: bool = False):
+      reader_name: str = "", load: bool = True, click_mode: bool = False,
+      mmap: bool = False, dtype: str | None = None, step: int | None = None):
     """Initializes the Data class with a Gkeyll output file.
 
     Args:
@@ -71,14 +147,31 @@ class GData(object):
       reader_name: str
         Reader can be specified to bypass the automatic selection.
       load: bool = True
-        Automatically the data to memory; when set to False, data can be loaded later
-        using the load() method.
+        Automatically the data to memory; when set to False, only the metadata are
+        read and the values are loaded on the first access.
       click_mode: bool = False
         Enables command-line behavior like prompting when a
-        var_name is either missing or doesn't match any available.
+        var_name is either missing or doesn't match any available. The prompts are
+        made only from the main thread; other threads get a ValueError.
+      mmap: bool = False
+        Memory-map the values instead of reading them to memory. The values are
+        read-only in this case. Supported only for the binary 'gkyl' files.
+      dtype: str | None = None
+        Convert the floating point values to the specified type on load, e.g.,
+        'float32' for reduced-precision processing; by default, the type stored in
+        the file is kept.
+      step: int | None = None
+        Step of a multi-step ADIOS BP stream; see also 'iter_steps'.
     """
     self._grid = None
+    self._grid_read = False  # grid is the one read by the reader (not set by the user)
     self._values = None  # (N+1)D narray of values
+    self._reader = None
+    self._reloadable = False  # values can be (re)read using the reader
+    self._spill_file = ""  # temporary file with evicted values
+    self._shared = False  # values are a view into a stack (see 'stack')
+    self._checksum = None  # of the values as read; detects the in-place changes
+    self._dtype = np.dtype(dtype) if dtype else None
 
     # Context dictionary to store metadata, filled by the reader.
     self.ctx = {}
@@ -104,39 +197,131 @@ class GData(object):
 
     zs = (z0, z1, z2, z3, z4, z5)
 
-    readers = {
-      "gkyl": GkylReader,
-      "adios": GkylAdiosReader,
-      "h5": GkylH5Reader,
-      "flash": FlashH5Reader,
-    }
     if self._file_name:
-      reader_set = False
-      if reader_name in readers:
+      names = None
+      if reader_name in reader_registry.get_reader_names():
         # Keep only the user-specified reader
-        reader = readers[reader_name]
-        readers.clear()
-        readers[reader_name] = reader
-      # end
-      for key, rd in readers.items():
-        self._reader = rd(file_name=self._file_name, ctx=self.ctx, var_name=var_name,
-          c2p=mapc2p_name, c2p_vel=mapc2p_vel_name, axes=zs, comp=comp,
-          click_mode=click_mode)
-        if self._reader.is_compatible():
-          reader_set = True
-          break
-        # end
+        names = [reader_name]
       # end
-      if not reader_set:
-        raise NameError(f"'file_name' was specified ({self._file_name}) but cannot be read with {list(readers)}")
+      self._reader = reader_registry.find_reader(self._file_name, names=names,
+        ctx=self.ctx, var_name=var_name, c2p=mapc2p_name, c2p_vel=mapc2p_vel_name,
+        axes=zs, comp=comp, click_mode=click_mode, mmap=mmap, step=step)
+      if self._reader is None:
+        raise NameError(f"'file_name' was specified ({self._file_name}) but cannot be read with {names or reader_registry.get_reader_names()}")
       # end
 
       self._reader.preload()
+      self._reloadable = True
       if load:
-        self._grid, self._values = self._reader.load()
+        self._grid, values = self._reader.load()
+        self._grid_read = True
+        self._values = self._convert_dtype(values)
+        self._checksum = _get_checksum(self._values)
+      elif hasattr(self._reader, "close"):
+        # Lazily loaded datasets do not keep their files open
+        self._reader.close()
+      # end
+    # end
+
+  @staticmethod
+  def load_many(files: list, workers: int | None = None, **kwargs) -> list:
+    """Loads multiple files concurrently.
+
+    The files are read using a pool of threads; the reading is I/O bound and NumPy
+    releases the GIL while decoding the data. The readers do not prompt from these
+    threads (see 'click_mode'); the files which would need a prompt are loaded again on
+    the calling thread afterwards, one by one.
+
+    Args:
+      files: list
+        The names of the files to load.
+      workers: int | None = None
+        Maximum number of threads; 'None' uses the ThreadPoolExecutor default and 1
+        loads the files serially.
+      **kwargs
+        Passed to the GData constructor of each file.
+
+    Returns:
+      A list of GData objects in the same order as 'files'.
+    """
+    if (workers is not None and workers <= 1) or len(files) <= 1:
+      return [GData(file_name=fn, **kwargs) for fn in files]
+    # end
+    def load(fn: str) -> "GData | None":
+      try:
+        return GData(file_name=fn, **kwargs)
+      except ValueError:
+        if not kwargs.get("click_mode"):
+          raise
+        # end
+        return None
       # end
     # end
 
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+      datasets = list(executor.map(load, files))
+    # end
+    return [dat if dat is not None else GData(file_name=fn, **kwargs)
+        for fn, dat in zip(files, datasets)]
+
+  @staticmethod
+  def stack(datasets: list, time: list | np.ndarray | None = None, views: bool = True,
+      prefetch: int = 0, **kwargs) -> "GData":
+    """Stacks a series of frames with the same shape into a single dataset.
+
+    The layout is the same as the one of the 'collect' command, i.e., the time is the
+    first axis of the grid and the values, and the grid of the first frame is shared.
+    The contiguous (num_frames, *cells, num_comps) array is allocated once and each
+    frame is copied into it as it is read, so there is no intermediate list of arrays.
+    Operations along the time (e.g., 'integrate' or 'fft' over the axis 0) then work on
+    the whole series at once.
+
+    Args:
+      datasets: list
+        Frames in the order of the stack.
+      time: list | np.ndarray | None = None
+        Values of the time axis; the frame 'time' metadata (or the indices when not
+        available) are used by default.
+      views: bool = True
+        Replace the values of the frames with views into the stacked array, so the
+        memory is not held twice; the frames share the memory with the stack
+        afterwards.
+      prefetch: int = 0
+        Number of frames read ahead in the background (lazily loaded frames; see
+        'postgkyl.data.prefetch').
+      **kwargs
+        Passed to the GData constructor of the output, e.g., 'tag' and 'label'.
+
+    Returns:
+      The stacked GData object.
+    """
+    from postgkyl.data.prefetch import prefetch as data_prefetch
+
+    if time is None:
+      time = [dat.ctx.get("time", i) for i, dat in enumerate(datasets)]
+    # end
+    time = np.array([np.squeeze(t) for t in time], dtype=float)
+    out = GData(**kwargs)
+    values, grid = None, None
+    for i, dat in enumerate(data_prefetch(datasets, depth=prefetch, release=not views)):
+      frame_values = dat.get_values()
+      if values is None:
+        values = np.empty((len(datasets),) + frame_values.shape, dtype=frame_values.dtype)
+        grid = list(dat.get_grid())
+      elif frame_values.shape != values.shape[1:]:
+        raise ValueError(f"Frame {i:d} has shape {frame_values.shape} while the stack has {values.shape[1:]}")
+      # end
+      values[i] = frame_values
+      if views and frame_values.dtype == values.dtype:
+        dat._values = values[i]
+        dat._shared = True
+      # end
+    # end
+    if values is not None:
+      out.push([time] + grid, values)
+    # end
+    return out
+
   # ---- Tag ----
   def get_tag(self) -> str:
     return self._tag
@@ -165,12 +350,26 @@ class GData(object):
     return self._custom_label
 
   # ---- Status ----
+  # Incremented on every status change, so containers can cache the active counts
+  _status_version = 0
+
   def activate(self) -> None:
+    if not self._status:
+      GData._status_version += 1
+    # end
     self._status = True
 
   def deactivate(self) -> None:
+    if self._status:
+      GData._status_version += 1
+    # end
     self._status = False
 
+  @staticmethod
+  def get_status_version() -> int:
+    """Returns a counter which changes whenever a dataset is (de)activated."""
+    return GData._status_version
+
   def get_status(self) -> bool:
     return self._status
 
@@ -242,7 +441,7 @@ class GData(object):
     if "lower" in self.ctx.keys() and "upper" in self.ctx.keys():
       return self.ctx["lower"], self.ctx["upper"]
     elif self._grid is not None:
-      num_dims = len(self._values.shape) - 1
+      num_dims = len(self._grid)
       lo, up = np.zeros(num_dims), np.zeros(num_dims)
       for d in range(num_dims):
         lo[d] = self._grid[d].min()
@@ -255,12 +454,29 @@ class GData(object):
 
   bounds = property(get_bounds)
 
+  # ---- Data Type ----
+  def get_dtype(self) -> np.dtype | None:
+    """Returns the type of the values without reading them when possible."""
+    if self._dtype is not None:
+      return self._dtype
+    elif self._values is not None:
+      return self._values.dtype
+    elif isinstance(self._reader, GkylReader):
+      return self._reader.dtf
+    else:
+      return None
+    # end
+
   # ---- Grid and Values ----
   def get_grid(self) -> list:
+    if self._grid is None and self._values is None:
+      self._materialize()
+    # end
     return self._grid
 
   def set_grid(self, grid: list) -> None:
     self._grid = grid
+    self._grid_read = False
     num_dims = self.get_num_dims()
     lo, up = np.zeros(num_dims), np.zeros(num_dims)
     for d in range(num_dims):
@@ -271,14 +487,32 @@ class GData(object):
 
   grid = property(get_grid, set_grid)
 
+  def get_c2p_source(self) -> tuple | None:
+    """Returns the mapped grid file and the cuts if the grid was read from that file.
+
+    Used to key the quantities derived from the mapped grid, e.g., its interpolation.
+    """
+    if not (self._grid_read and self._mapc2p_name and self._reader is not None):
+      return None
+    # end
+    cuts = getattr(self._reader, "partial_idxs", None) or getattr(self._reader, "axes", None)
+    return self._mapc2p_name, tuple(cuts or ())
+
   def get_grid_type(self) -> str:
     return self.ctx["grid_type"]
 
   def get_values(self) -> np.ndarray:
+    if self._values is None:
+      self._materialize()
+    # end
     return self._values
 
   def set_values(self, values) -> None:
     self._values = values
+    self._shared = False
+    # The values no longer match the file
+    self._reloadable = False
+    self._remove_spill_file()
     if "cells" not in self.ctx or not np.array_equal(values.shape[:-1], self.ctx["cells"]):
       self.ctx["cells"] = values.shape[:-1]
     if "num_comps" not in self.ctx or values.shape[-1] != self.ctx["num_comps"]:
@@ -291,6 +525,359 @@ class GData(object):
     self.set_grid(grid)
     return self
 
+  # ---- Memory management ----
+  def _materialize(self) -> None:
+    # Read the values on the first access or after they were evicted
+    self._shared = False
+    if self._spill_file:
+      self._values = np.load(self._spill_file)
+      self._remove_spill_file()
+    elif self._reloadable:
+      grid, values = self._reader.load()
+      self._values = self._convert_dtype(values)
+      self._checksum = _get_checksum(self._values)
+      if self._grid is None:
+        self._grid = grid
+        self._grid_read = True
+      # end
+    # end
+
+  def _convert_dtype(self, values: np.ndarray) -> np.ndarray:
+    # Only the floating point values are converted; e.g., the integer data are kept
+    if (self._dtype is None or values is None or values.dtype == self._dtype
+        or values.dtype.kind != "f"):
+      return values
+    # end
+    return values.astype(self._dtype)
+
+  def _remove_spill_file(self) -> None:
+    if self._spill_file:
+      try:
+        os.remove(self._spill_file)
+      except OSError:
+        pass
+      # end
+      self._spill_file = ""
+    # end
+
+  def is_loaded(self) -> bool:
+    """Checks whether the values are currently held in memory."""
+    return self._values is not None
+
+  def get_nbytes(self) -> int:
+    """Returns the memory used by the values.
+
+    Memory-mapped values are backed by the file and are not counted; the frames of
+    'GData.stack' share the memory with the stacked dataset, which counts it.
+    """
+    if self._values is None or isinstance(self._values, np.memmap) or self._shared:
+      return 0
+    # end
+    return int(self._values.nbytes)
+
+  def evict(self, spill_dir: str = "") -> int:
+    """Releases the values from memory.
+
+    Values which were not modified since they were read (also in place) are dropped and
+    read again from the file on the next access. Other values are saved into a temporary
+    '.npy' file in the 'spill_dir' directory and loaded back on the next access; they
+    are kept in memory when the 'spill_dir' is not specified.
+
+    Args:
+      spill_dir: str = ""
+        Directory for the temporary files.
+
+    Returns:
+      Number of released bytes.
+    """
+    nbytes = self.get_nbytes()
+    if nbytes == 0:
+      return 0
+    # end
+    if self._reloadable and _get_checksum(self._values) != self._checksum:
+      # Changed in place, e.g., 'dat.values *= 2'; the file is outdated
+      self._reloadable = False
+    # end
+    if self._reloadable:
+      self._values = None
+    elif spill_dir:
+      fd, self._spill_file = tempfile.mkstemp(dir=spill_dir, suffix=".npy")
+      with os.fdopen(fd, "wb") as fh:
+        np.save(fh, self._values)
+      # end
+      self._values = None
+    else:
+      return 0
+    # end
+    return nbytes
+
+  # ---- Slabs ----
+  def _is_streamable(self, axis: int) -> bool:
+    # Slabs can be read from the file using the partial load of the Gkeyll reader
+    # unless the dataset is already cut along the axis
+    return (self._values is None and not self._spill_file and self._reloadable
+        and isinstance(self._reader, GkylReader) and not self._reader.mmap
+        and self._reader.file_type != 2 and not self._reader.partial_idxs[axis])
+
+  def _read_slab(self, axis: int, lo: int, up: int) -> Tuple[list, np.ndarray]:
+    rd = self._reader
+    axes = [ax or None for ax in rd.partial_idxs[:6]]
+    axes[axis] = f"{lo:d}:{up:d}"
+    slab = GkylReader(file_name=self._file_name, ctx={}, c2p=rd.c2p, c2p_vel=rd.c2p_vel,
+        axes=tuple(axes), comp=rd.partial_idxs[6] or None)
+    slab.range_table = rd.range_table
+    slab.preload()
+    grid, values = slab.load()
+    rd.range_table = slab.range_table  # index the ranges only once
+    if rd.c2p_vel:
+      # The mapped velocity grid is read for the whole file, so it is cut like the
+      # values; the uniform coordinates are already cut by the reader
+      cut = _slice_grid(grid, axis, lo, up, int(self.get_num_cells()[axis]))
+      grid = [cut[d] if len(coord.shape) > 1 else coord for d, coord in enumerate(grid)]
+    # end
+    return grid, self._convert_dtype(values)
+
+  def iter_chunks(self, axis: int = 0, chunk_size: int | None = None,
+      comp: int | str | None = None) -> Iterator[Tuple[list, np.ndarray]]:
+    """Iterates over the dataset in slabs along an axis.
+
+    Values held in memory (or memory-mapped) are sliced. When the values are not
+    loaded, each slab of a Gkeyll binary file is read separately using the partial
+    load, i.e., the whole array is never materialized; other files are loaded at once.
+
+    Args:
+      axis: int = 0
+        Axis along which the dataset is split; the first one is the fastest to read.
+      chunk_size: int | None = None
+        Number of cells along the 'axis' in each slab; the whole dataset by default.
+      comp: int | str | None = None
+        Select components of each slab; index, slice 'lo:up', or comma separated
+        indices.
+
+    Yields:
+      Tuples of the grid and values of the slabs; the values keep all the dimensions.
+    """
+    num_cells = int(self.get_num_cells()[axis]) if self.get_num_dims() else 0
+    if chunk_size is None or chunk_size >= num_cells:
+      chunk_size = max(num_cells, 1)
+    # end
+    comp_idx = None
+    if comp is not None:
+      comp_idx = idx_parser.idx_parser(comp)
+      comp_idx = list(comp_idx) if isinstance(comp_idx, tuple) else comp_idx
+    # end
+
+    def select_comp(values):
+      if comp_idx is None:
+        return values
+      # end
+      out = values[..., comp_idx]
+      return out[..., np.newaxis] if out.ndim < values.ndim else out
+    # end
+
+    if chunk_size < num_cells and self._is_streamable(axis):
+      for lo in range(0, num_cells, chunk_size):
+        grid, values = self._read_slab(axis, lo, min(lo + chunk_size, num_cells))
+        yield grid, select_comp(values)
+      # end
+      return
+    # end
+
+    if self._values is None and self._spill_file:
+      grid, values = self._grid, np.load(self._spill_file, mmap_mode="r")
+    else:
+      values = self.get_values()
+      grid = self.get_grid()
+    # end
+    if values is None:
+      return
+    # end
+    num_cells = values.shape[axis]
+    for lo in range(0, num_cells, chunk_size):
+      up = min(lo + chunk_size, num_cells)
+      idx = [slice(None)] * values.ndim
+      idx[axis] = slice(lo, up)
+      yield _slice_grid(grid, axis, lo, up, num_cells), select_comp(values[tuple(idx)])
+    # end
+
+  def iter_slabs(self, axis: int = 0, max_bytes: int = 2**28,
+      comp: int | str | None = None) -> Iterator[Tuple[list, np.ndarray]]:
+    """Iterates over the dataset in slabs of limited size.
+
+    Same as 'iter_chunks' but the number of cells in each slab is chosen so that the
+    values of a slab (before selecting the components) take at most 'max_bytes'.
+    """
+    num_dims = self.get_num_dims()
+    if num_dims == 0:
+      return iter(())
+    # end
+    dtype = self.get_dtype()
+    itemsize = dtype.itemsize if dtype is not None else 8
+    cells = self.get_num_cells()
+    slab_bytes = itemsize * self.get_num_comps() * int(np.prod(cells)) // max(int(cells[axis]), 1)
+    chunk_size = max(int(max_bytes // max(slab_bytes, 1)), 1)
+    return self.iter_chunks(axis=axis, chunk_size=chunk_size, comp=comp)
+
+  # ---- Steps ----
+  def _get_step_reader(self) -> GkylAdiosReader | None:
+    # Fresh reader with the same selection; None for the single-step datasets
+    rd = self._reader
+    if not isinstance(rd, GkylAdiosReader) or not rd.is_frame:
+      return None
+    # end
+    reader = GkylAdiosReader(file_name=self._file_name, ctx={}, var_name=rd.var_name,
+        c2p=rd.c2p, axes=rd.axes, comp=rd.comp)
+    reader.is_compatible()
+    reader.preload()
+    return reader
+
+  def get_num_steps(self) -> int:
+    """Returns the number of steps; only multi-step ADIOS BP streams have more than one."""
+    reader = self._get_step_reader()
+    if reader is None:
+      return 1
+    # end
+    num_steps = reader.get_num_steps()
+    reader.close()
+    return num_steps
+
+  def iter_steps(self, steps: int | str | range | None = None) -> Iterator["GData"]:
+    """Iterates over the steps of a multi-step ADIOS BP stream.
+
+    The file is opened once and the selection (partial load) is resolved only for the
+    first step. Datasets of other files have only one step and the dataset itself is
+    yielded.
+
+    Args:
+      steps: int | str | range | None = None
+        Step, 'lo:hi[:step]' (upper bound excluded), or all the steps by default.
+
+    Yields:
+      GData objects of the steps with the 'time', 'frame', and 'step' in the context.
+    """
+    reader = self._get_step_reader()
+    if reader is None:
+      yield self
+      return
+    # end
+    steps = _parse_steps(steps, reader.get_num_steps())
+    for step, ctx, grid, values in reader.iter_steps(steps):
+      ctx = {**reader.ctx, **ctx, "step": step}
+      ctx.pop("var_names", None)
+      out = GData(tag=self._tag, label=self._custom_label, ctx=ctx,
+          comp_grid=self._comp_grid, dtype=self._dtype)
+      out.push(grid, out._convert_dtype(values))
+      yield out
+    # end
+
+  def stack_steps(self, steps: int | str | range | None = None) -> "GData":
+    """Collects the steps into a single time-stacked dataset.
+
+    The layout is the same as the one of the 'collect' command, i.e., the time is the
+    first axis of the grid and the values (the step numbers are used when the time is
+    not available). The output is allocated for the first step and the following ones
+    are read into it in place.
+
+    Args:
+      steps: int | str | range | None = None
+        Step, 'lo:hi[:step]' (upper bound excluded), or all the steps by default.
+    """
+    reader = self._get_step_reader()
+    if reader is None:
+      steps = range(1)
+      step_iter = ((0, self.ctx, self.get_grid(), self.get_values()),)
+    else:
+      steps = _parse_steps(steps, reader.get_num_steps())
+      step_iter = reader.iter_steps(steps)
+    # end
+    values, time, grid = None, np.array(steps, dtype=float), None
+    for i, (step, ctx, step_grid, step_values) in enumerate(step_iter):
+      if values is None:
+        dtype = self._dtype if self._dtype is not None else step_values.dtype
+        values = np.empty((len(steps),) + step_values.shape, dtype=dtype)
+        grid = list(step_grid)
+      # end
+      values[i] = step_values
+      if ctx.get("time") is not None:
+        time[i] = np.squeeze(ctx["time"])
+      # end
+    # end
+    out = GData(tag=self._tag, label=self._custom_label, comp_grid=self._comp_grid)
+    if values is not None:
+      out.push([time] + grid, values)
+    # end
+    return out
+
+  # ---- Statistics ----
+  def _get_stats_file(self) -> str:
+    # The sidecar statistics describe the whole file, so they are used only for the
+    # unmodified values read without cuts and type conversion
+    if (self._reloadable and not self._spill_file and self._dtype is None
+        and isinstance(self._reader, GkylReader) and self._reader.file_type != 2
+        and not any(self._reader.partial_idxs)):
+      return self._file_name
+    # end
+    return ""
+
+  def get_stats(self, build: bool = False, save: bool = True,
+      max_bytes: int | None = None) -> dict | None:
+    """Returns the per-component statistics of the values.
+
+    The statistics are taken from the sidecar index next to the file (see
+    'postgkyl.data.stats') when available; the payload is not read in this case.
+
+    Args:
+      build: bool = False
+        Compute the missing statistics (and store them in the index when the values
+        match the file).
+      save: bool = True
+        Write the index after storing new statistics; multiple datasets can share one
+        write by calling 'stats.get_index(file_name).save()' afterwards.
+      max_bytes: int | None = None
+        When the values are not loaded, compute the statistics reading the file in
+        slabs of at most this size.
+
+    Returns:
+      Dictionary described in 'stats.compute_stats' or None if the statistics are not
+      available.
+    """
+    file_name = self._get_stats_file()
+    if file_name:
+      out = stats_index.get_index(file_name).get(file_name)
+      if out is not None:
+        return out
+      # end
+    # end
+    if not build:
+      return None
+    # end
+    if max_bytes:
+      slabs = self.iter_slabs(max_bytes=max_bytes)
+    else:
+      slabs = self.iter_chunks()
+    # end
+    out = stats_index.compute_stats(values for _, values in slabs)
+    if file_name and out is not None:
+      index = stats_index.get_index(file_name)
+      index.set(file_name, out)
+      if save:
+        index.save()
+      # end
+    # end
+    return out
+
+  def get_value_range(self) -> Tuple[float, float]:
+    """Returns the minimum and maximum of the values ignoring NaNs.
+
+    The sidecar statistics are used when available.
+    """
+    st = self.get_stats()
+    if st is not None:
+      return np.nanmin(st["min"]), np.nanmax(st["max"])
+    # end
+    values = self.get_values()
+    return np.nanmin(values), np.nanmax(values)
+
   # ---- Neighboring Blocks ----
   def set_neighbors(self, dataspace):
     data_list = list(dataspace)
@@ -334,24 +921,37 @@ class GData(object):
       
 
   # ---- Info -----
-  def info(self) -> str:
+  def info(self, max_bytes: int | None = None, header_only: bool = False) -> str:
     """Prints GData object information.
 
     Prints time (only when available), number of components, dimension
-    spans, extremes for a GData object.
+    spans, extremes for a GData object. The extremes are taken from the
+    sidecar statistics when available; otherwise, they are computed in a
+    single multithreaded pass (see 'stats.compute_stats').
 
     Args:
-      none
+      max_bytes: int | None = None
+        When the values are not loaded, the extremes are found reading the
+        file in slabs of at most this size instead of loading the whole values.
+      header_only: bool = False
+        Skip the extremes; only the metadata read by the reader's preload are
+        printed, so the values of a lazily loaded dataset are not read.
 
     Returns:
       output: str
         A list of strings with the informations
     """
-    values = self.values
+    # Single blocked pass over the values unless the statistics are already known
+    st = None
+    if not header_only:
+      st = self.get_stats(build=True, save=False, max_bytes=max_bytes)
+    # end
+    extremes = stats_index.get_extremes(st) if st is not None else None
     num_comps = self.num_comps
     num_dims = self.num_dims
     num_cells = self.num_cells
     lower, upper = self.bounds
+    dtype = self.get_dtype()
 
     # Groups of metadata.
     info_groups = {
@@ -378,7 +978,11 @@ class GData(object):
 
     output += f"├─ Number of components: {num_comps:d}\n"
     output += f"├─ Number of dimensions: {num_dims:d}\n"
-    if self.__dict_has_key_from_group__(self.ctx, info_groups["grid_info"]):
+    if dtype is not None:
+      output += f"├─ Data type: {dtype.name:s}\n"
+    # end
+    # The shape of the diagnostics is not known before the values are read
+    if self.__dict_has_key_from_group__(self.ctx, info_groups["grid_info"]) and num_dims > 0:
       output += f"├─ Grid: ({self.get_grid_type():s})\n"
       if "lower" in self.ctx.keys() and "upper" in self.ctx.keys() and "cells" in self.ctx.keys():
         for d in range(num_dims - 1):
@@ -391,11 +995,8 @@ class GData(object):
       output += f"Lower: {lower[-1]:e}; Upper: {upper[-1]:e}"
     # end
 
-    if values is not None:
-      maximum = np.nanmax(values)
-      max_idx = np.unravel_index(np.nanargmax(values), values.shape)
-      minimum = np.nanmin(values)
-      min_idx = np.unravel_index(np.nanargmin(values), values.shape)
+    if extremes is not None:
+      maximum, max_idx, minimum, min_idx = extremes
       output += f"\n├─ Maximum: {maximum:e} at {str(max_idx[:num_dims]):s}"
       if num_comps > 1:
         output += f" component {max_idx[-1]:d}\n"
@@ -457,6 +1058,38 @@ class GData(object):
 
     return output
 
+  def get_header(self) -> dict:
+    """Returns the metadata of the dataset as a JSON-serializable dictionary.
+
+    Only the metadata read by the reader's preload are used, so the values of a lazily
+    loaded dataset are not read.
+
+    Returns:
+      Dictionary with the 'file_name', 'tag', 'label', 'num_comps', 'num_dims',
+      'cells', 'lower', 'upper', and 'dtype' and the remaining context entries (e.g.,
+      'time', 'frame', and the msgpack metadata).
+    """
+    lower, upper = self.get_bounds()
+    cells = self.get_num_cells() if self.get_num_dims() else []
+    dtype = self.get_dtype()
+    header = {
+      "file_name": self._file_name,
+      "tag": self._tag,
+      "label": self.get_label(),
+      "num_comps": self.get_num_comps(),
+      "num_dims": self.get_num_dims(),
+      "cells": cells,
+      "lower": lower,
+      "upper": upper,
+      "dtype": dtype.name if dtype is not None else None,
+    }
+    for key, val in self.ctx.items():
+      if key not in header:
+        header[key] = val
+      # end
+    # end
+    return {key: _to_json(val) for key, val in header.items()}
+
   # ---- Write ----
   def write(self, out_name: str = "",
       extension: Literal["gkyl", "bp", "txt", "npy"] = "gkyl",
@@ -548,7 +1181,9 @@ class GData(object):
       # end
     elif extension == "gkyl":
       dti = np.dtype("i8")
-      dtf = np.dtype("f8")
+      # Single precision data are written as such; everything else as double
+      is_single = np.asarray(values).dtype == np.float32
+      dtf = np.dtype("f4") if is_single else np.dtype("f8")
 
       fh = open(out_name, "w", encoding="utf-8")
 
@@ -560,8 +1195,8 @@ class GData(object):
       np.array([1], dtype=dti).tofile(fh, sep="")
       # meta size
       np.array([0], dtype=dti).tofile(fh, sep="")
-      # real type (double)
-      np.array([2], dtype=dti).tofile(fh, sep="")
+      # real type (1 for float, 2 for double)
+      np.array([1 if is_single else 2], dtype=dti).tofile(fh, sep="")
       # num dims
       np.array([num_dims], dtype=dti).tofile(fh, sep="")
       # num cells
@@ -571,7 +1206,7 @@ class GData(object):
       # upper
       np.array(up, dtype=dtf).tofile(fh, sep="")
       # elem_sz
-      np.array([num_comps * 8], dtype=dti).tofile(fh, sep="")
+      np.array([num_comps * dtf.itemsize], dtype=dti).tofile(fh, sep="")
       # asize
       np.array([np.size(values)], dtype=dti).tofile(fh, sep="")
       # data
@@ -1,9 +1,10 @@
 """Module including Gkeyll ADIOS reader class."""
 
-from typing import Tuple
+from typing import Iterator, Tuple
 import click
 import numpy as np
 import re
+import threading
 
 try:
   import adios2
@@ -12,6 +13,7 @@ except ModuleNotFoundError:
   has_adios = False
 # end
 
+from postgkyl.data.grid_cache import grid_cache
 import postgkyl.data.idx_parser as idx_parser
 
 
@@ -22,7 +24,7 @@ class GkylAdiosReader(object):
       var_name: str = "CartGridField", c2p: str = "",
       axes: tuple | None = (None, None, None, None, None, None),
       comp: int | slice | None = None, click_mode: bool = False,
-      **kwargs):
+      step: int | None = None, **kwargs):
     """Initialize the instance of ADIOS reader.
 
     Args:
@@ -39,6 +41,8 @@ class GkylAdiosReader(object):
       click_mode: bool = False
         Enables command-line behavior like prompting when a
         var_name is either missing or doesn't match any available.
+      step: int | None = None
+        Step of a multi-step BP stream to read; the default step otherwise.
       **kwargs
         This is not directly used but allowes for unified interface to all the readers
         we use.
@@ -49,6 +53,7 @@ class GkylAdiosReader(object):
 
     self.axes = axes
     self.comp = comp
+    self.step = step
 
     self.lower = None
     self.upper = None
@@ -63,30 +68,57 @@ class GkylAdiosReader(object):
     if not ("grid_type" in self.ctx.keys()):
       self.ctx["grid_type"] = "uniform"
 
+    self._fh = None  # cached file handle
+    self._selection = ((), (), None)  # offset, count, and shape of the last frame load
+
+  def _open(self):
+    # The file is opened only once for the compatibility check, preload, and load
+    if self._fh is None:
+      self._fh = adios2.open(self._file_name, "rra")
+    # end
+    return self._fh
+
+  def close(self) -> None:
+    """Closes the cached file handle.
+
+    The handle is released after each load so that many (lazily loaded) datasets do not
+    keep their files open; it is opened again when needed.
+    """
+    if self._fh is not None:
+      self._fh.close()
+      self._fh = None
+    # end
+
+  def __del__(self):
+    try:
+      self.close()
+    except Exception:
+      pass
+    # end
+
   def is_compatible(self) -> bool:
     """Checks if file can be read with Gkeyll ADIOS reader."""
     if not has_adios:
       return False
     # end
     try:
-      fh = adios2.open(self._file_name, "rra")
-      for vn in fh.available_variables():
+      fh = self._open()
+      available_vars = fh.available_variables()
+      for vn in available_vars:
         if "TimeMesh" in vn:
           self.is_diagnostic = True
-          fh.close()
           return True
         # end
       # end
 
       available_var_names = ""
-      for vn in fh.available_variables():
+      for vn in available_vars:
         available_var_names += f"'{str(vn):s}', "
       # end
-      if self.var_name not in fh.available_variables():
+      if self.var_name not in available_vars:
         self.ctx["var_names"] = available_var_names[:-2]
       # end
       self.is_frame = True
-      fh.close()
       return True
     except ModuleNotFoundError:
       return False
@@ -136,8 +168,64 @@ class GkylAdiosReader(object):
       return (), ()
     # end
 
+  def _read(self, fh, var_name: str, start: tuple = (), count: tuple = (),
+      step: int | None = None):
+    # Reads the variable at the selected step
+    step = self.step if step is None else step
+    if step is None:
+      return fh.read(var_name, start=start, count=count)
+    # end
+    out = fh.read(var_name, start, count, step, 1)
+    shape = tuple(count) or self._get_shape(fh, var_name)
+    if isinstance(out, np.ndarray) and shape and out.ndim > len(shape):
+      out = out.reshape(shape)  # remove the step dimension
+    # end
+    return out
+
+  def get_num_steps(self) -> int:
+    """Returns the number of steps in the BP stream."""
+    return int(self._open().steps())
+
+  def iter_steps(self, steps: range) -> Iterator[Tuple[int, dict, list, np.ndarray]]:
+    """Iterates over the steps of a multi-step BP stream.
+
+    The file is opened once; the selection (partial load) and the grid are resolved
+    for the first step and reused for the following ones.
+
+    Args:
+      steps: range
+        Steps to read.
+
+    Yields:
+      Tuples of the step, the context with the step 'time' and 'frame', the grid, and
+      the values.
+    """
+    fh = self._open()
+    grid, offset, count, shape = None, (), (), None
+    try:
+      for step in steps:
+        self.step = step
+        ctx = {}
+        for key in ("time", "frame"):
+          if key in fh.available_variables():
+            ctx[key] = self._read(fh, key)
+          # end
+        # end
+        if grid is None:
+          grid, data = self._load_frame()
+          offset, count, _ = self._selection
+          shape = data.shape
+        else:
+          data = np.reshape(self._read(fh, self.var_name, offset, count), shape)
+        # end
+        yield step, ctx, grid, data
+      # end
+    finally:
+      self.close()
+    # end
+
   def _preload_frame(self) -> None:
-    fh = adios2.open(self._file_name, "rra")
+    fh = self._open()
 
     # Postgkyl conventions require the attributes to be
     # narrays even for 1D data
@@ -165,19 +253,18 @@ class GkylAdiosReader(object):
       self.ctx["mass"] = fh.read_attribute("mass")[0]
     # end
     if "time" in fh.available_variables():
-      self.ctx["time"] = fh.read("time")
+      self.ctx["time"] = self._read(fh, "time")
     # end
     if "frame" in fh.available_variables():
-      self.ctx["frame"] = fh.read("frame")
+      self.ctx["frame"] = self._read(fh, "frame")
     # end
 
-    fh.close()
-
   def _load_frame(self) -> Tuple[list, np.ndarray]:
-    fh = adios2.open(self._file_name, "rra")
+    fh = self._open()
 
     if self.var_name not in fh.available_variables():
-      if self.click_mode:
+      # Prompts only from the main thread; the loading threads leave them to it
+      if self.click_mode and threading.current_thread() is threading.main_thread():
         var_name = self.var_name
         while True:
           var_name = click.prompt(f"Variable name '{var_name:s}' is not available, please select from the available ones: {self.ctx['var_names']:s}")
@@ -189,7 +276,7 @@ class GkylAdiosReader(object):
         # end
       else:
         raise ValueError(
-            f"Could not find the variable '{var_name:s}'; available variables are: {self.ctx['var_names']:s}"
+            f"Could not find the variable '{self.var_name:s}'; available variables are: {self.ctx['var_names']:s}"
         )
       # end
     # end
@@ -199,7 +286,8 @@ class GkylAdiosReader(object):
     var_shape = fh.available_variables()[self.var_name]["Shape"]
     num_elems = np.array([v for v in var_shape.split(",")], dtype=np.int32)
     offset, count = self._create_offset_count(num_elems, self.axes, self.comp, grid)
-    data = fh.read(self.var_name, start=offset, count=count)
+    data = self._read(fh, self.var_name, offset, count)
+    self._selection = (offset, count, num_elems)
 
     # Adjust boundaries for 'offset' and 'count'
     dz = (self.upper - self.lower) / self.cells
@@ -233,17 +321,8 @@ class GkylAdiosReader(object):
 
     # Check for mapped grid ...
     if self.c2p:
-      grid_fh = adios2.open(self.c2p, "rra")
-      grid_dims = grid_fh.available_variables()["CartGridField"]["Shape"]
-      grid_dims = [int(v) for v in grid_dims.split(",")]
-      offset, count = self._create_offset_count(grid_dims, self.axes, None)
-      tmp = grid_fh.read("CartGridField", start=offset, count=count)
-      num_comps = tmp.shape[-1]
-      num_coeff = num_comps / num_dims
-      grid = [
-          tmp[..., int(d * num_coeff) : int((d + 1) * num_coeff)]
-          for d in range(num_dims)
-      ]
+      grid = list(grid_cache.get(self.c2p, ("c2p", num_dims, self.axes),
+          lambda: self._load_c2p_grid(num_dims)))
       if self.ctx:
         self.ctx["grid_type"] = "c2p"
       # end
@@ -269,12 +348,38 @@ class GkylAdiosReader(object):
       # end
     # end
 
-    fh.close()
     return grid, data
 
-  def _load_diagnostic(self) -> Tuple[list, np.ndarray]:
+  def _load_c2p_grid(self, num_dims: int) -> tuple:
+    grid_fh = adios2.open(self.c2p, "rra")
+    grid_dims = grid_fh.available_variables()["CartGridField"]["Shape"]
+    grid_dims = [int(v) for v in grid_dims.split(",")]
+    # Same cells as the data (already resolved from the cuts) but all the coefficients
+    offset, count = (), ()
+    data_offset, data_count, data_shape = self._selection
+    if data_offset:
+      offset, count = [0] * len(grid_dims), list(grid_dims)
+      for d in range(min(num_dims, len(grid_dims) - 1)):
+        if data_offset[d] != 0 or data_count[d] != data_shape[d]:
+          offset[d], count[d] = int(data_offset[d]), int(data_count[d])
+        # end
+      # end
+      offset, count = tuple(offset), tuple(count)
+    # end
+    tmp = grid_fh.read("CartGridField", start=offset, count=count)
+    grid_fh.close()
+    num_comps = tmp.shape[-1]
+    num_coeff = num_comps / num_dims
+    return tuple(tmp[..., int(d * num_coeff) : int((d + 1) * num_coeff)]
+        for d in range(num_dims))
+
+  @staticmethod
+  def _get_shape(fh, var_name: str) -> tuple:
+    shape = fh.available_variables()[var_name].get("Shape", "")
+    return tuple(int(v) for v in shape.split(",") if v.strip())
 
-    fh = adios2.open(self._file_name, "rra")
+  def _load_diagnostic(self) -> Tuple[list, np.ndarray]:
+    fh = self._open()
 
     def natural_sort(l):
       convert = lambda text: int(text) if text.isdigit() else text.lower()
@@ -286,26 +391,28 @@ class GkylAdiosReader(object):
     time_lst = natural_sort(time_lst)
     data_lst = natural_sort(data_lst)
 
+    # First pass sizes the output from the metadata; some blocks written after a
+    # restart do not have the second dimension
+    shapes = [self._get_shape(fh, vn) for vn in data_lst]
+    num_rows = [shape[0] if shape else 1 for shape in shapes]
+    num_comps = max([shape[1] if len(shape) > 1 else 1 for shape in shapes], default=1)
+    data, grid = None, None
+
+    # Second pass fills the output in place
+    row = 0
     for i in range(len(data_lst)):
-      if i == 0:
-        data = np.atleast_1d(fh.read(data_lst[i]))
-        grid = np.atleast_1d(fh.read(time_lst[i]))
-      else:
-        next_data = np.atleast_1d(fh.read(data_lst[i]))
-        next_grid = np.atleast_1d(fh.read(time_lst[i]))
-        # deal with weird behavior after restart where some data
-        # doesn't have second dimension
-        if len(next_data.shape) < 2:
-          next_data = np.expand_dims(next_data, axis=1)
-        # end
-        data = np.append(data, next_data, axis=0)
-        grid = np.append(grid, next_grid, axis=0)
+      block = np.atleast_1d(fh.read(data_lst[i]))
+      time = np.atleast_1d(fh.read(time_lst[i]))
+      if data is None:
+        data = np.empty((sum(num_rows), num_comps), dtype=block.dtype)
+        grid = np.empty(sum(num_rows), dtype=time.dtype)
       # end
-    # end
-    fh.close()
+      data[row : row + num_rows[i]] = block.reshape(num_rows[i], -1)
+      grid[row : row + num_rows[i]] = time.ravel()
+      row += num_rows[i]
     # end
 
-    return [np.squeeze(grid)], data
+    return [grid], data
 
   def preload(self) -> None:
     """Loads metadata."""
@@ -335,6 +442,7 @@ class GkylAdiosReader(object):
     if self.is_diagnostic:
       grid, data = self._load_diagnostic()
     # end
+    self.close()
 
     self.ctx["num_comps"] = data.shape[-1]
 
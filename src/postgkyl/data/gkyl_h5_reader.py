@@ -4,28 +4,43 @@ from typing import Tuple
 import numpy as np
 import tables
 
+from postgkyl.data.idx_parser import idx_to_slice
+
 
 class GkylH5Reader(object):
   """Provides a framework to read legacy Gkeyll HDF5 output"""
 
-  def __init__(self, file_name: str, ctx: dict | None = None, **kwargs):
+  def __init__(self, file_name: str, ctx: dict | None = None,
+      axes: tuple | None = (None, None, None, None, None, None),
+      comp: int | str | None = None, **kwargs):
     """Initialize the instance of Gkeyll reader.
 
     Args:
       file_name: str
       ctx: dict
         Passes context variable with metadata.
+      axes: tuple
+        Partial load along the axes (the time for the diagnostics); the selection is
+        read from the file as a hyperslab.
+      comp: int | str | None = None
+        Partial load of the components.
       **kwargs
         This is not directly used but allowes for unified interface to all the readers
         we use.
     """
     self._file_name = file_name
+    self.axes = axes if axes is not None else (None,) * 6
+    self.comp = comp
 
     self.is_frame = False
     self.is_diagnostic = False
 
     self.ctx = ctx
 
+    self.lower = None
+    self.upper = None
+    self.cells = None
+
   def is_compatible(self) -> bool:
     """Checks if file can be read with the legacy Gkeyll HDF5 reader."""
     try:
@@ -44,28 +59,66 @@ class GkylH5Reader(object):
     # end
     return self.is_frame or self.is_diagnostic
 
-  def _read_frame(self) -> tuple:
-    fh = tables.open_file(self._file_name, "r")
+  def _get_selection(self, shape: tuple, grid: list) -> Tuple[tuple, list]:
+    # Hyperslab covering the cuts and the indices of the non-contiguous selections
+    # applied afterwards in memory
+    slices, post = [], []
+    for d in range(len(shape)):
+      if d < len(grid):
+        sl, idx = idx_to_slice(self.axes[d] if d < len(self.axes) else None,
+            grid[d], shape[d])
+      else:  # Components
+        sl, idx = idx_to_slice(self.comp, None, shape[d])
+      # end
+      slices.append(sl)
+      post.append(idx)
+    # end
+    return tuple(slices), post
 
-    # Postgkyl conventions require the attributes to be
-    # narrays even for 1D data
-    lower = np.atleast_1d(fh.root.StructGrid._v_attrs.vsLowerBounds)
-    upper = np.atleast_1d(fh.root.StructGrid._v_attrs.vsUpperBounds)
-    cells = np.atleast_1d(fh.root.StructGrid._v_attrs.vsNumCells)
-    if "/timeData" in fh:
-      self.ctx["time"] = fh.root.timeData._v_attrs.vsTime
+  @staticmethod
+  def _apply_post(data: np.ndarray, post: list) -> np.ndarray:
+    for d, idx in enumerate(post):
+      if idx is not None:
+        data = np.take(data, idx, axis=d)
+      # end
     # end
+    return data
 
-    data = fh.root.StructGridField.read()
+  def _read_frame(self) -> tuple:
+    fh = tables.open_file(self._file_name, "r")
+    cells, lower, upper = self.cells, self.lower, self.upper
+    num_dims = len(cells)
+    grid = [np.linspace(lower[d], upper[d], cells[d] + 1) for d in range(num_dims)]
 
+    # Only the selected hyperslab is read from the file
+    node = fh.root.StructGridField
+    slices, post = self._get_selection(node.shape, grid)
+    data = self._apply_post(node[slices], post)
     fh.close()
+
+    # Adjust the domain to the selection
+    dz = (upper - lower) / cells
+    lower = lower + np.array([s.start for s in slices[:num_dims]]) * dz
+    cells = np.array(data.shape[:num_dims])
+    upper = lower + np.array([s.stop - s.start for s in slices[:num_dims]]) * dz
     return cells, lower, upper, data
 
   def _read_diagnostic(self):
     fh = tables.open_file(self._file_name, "r")
 
+    # The time mesh is small and used to find the time window, which is then read
+    # from the data as a hyperslab
     grid = fh.root.DataStruct.timeMesh.read()
-    data = fh.root.DataStruct.data.read()
+    sl, idx = idx_to_slice(self.axes[0], np.squeeze(grid), grid.shape[0])
+    grid = grid[sl]
+    node = fh.root.DataStruct.data
+    slices = [sl] + [slice(None)] * (len(node.shape) - 1)
+    post = [idx] + [None] * (len(node.shape) - 1)
+    if len(node.shape) > 1:
+      slices[-1], post[-1] = idx_to_slice(self.comp, None, node.shape[-1])
+    # end
+    grid = self._apply_post(grid, post[:1])
+    data = self._apply_post(node[tuple(slices)], post)
 
     fh.close()
     # end
@@ -74,7 +127,18 @@ class GkylH5Reader(object):
 
   def preload(self) -> None:
     """Loads metadata."""
-    pass
+    if self.is_frame:
+      fh = tables.open_file(self._file_name, "r")
+      # Postgkyl conventions require the attributes to be
+      # narrays even for 1D data
+      self.lower = np.atleast_1d(fh.root.StructGrid._v_attrs.vsLowerBounds)
+      self.upper = np.atleast_1d(fh.root.StructGrid._v_attrs.vsUpperBounds)
+      self.cells = np.atleast_1d(fh.root.StructGrid._v_attrs.vsNumCells)
+      if "/timeData" in fh and self.ctx is not None:
+        self.ctx["time"] = fh.root.timeData._v_attrs.vsTime
+      # end
+      fh.close()
+    # end
 
   def load(self) -> Tuple[list, np.ndarray]:
     """Loads data.
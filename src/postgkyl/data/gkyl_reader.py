@@ -1,10 +1,15 @@
 """Module including Gkeyll binary reader class."""
 
 from collections.abc import Iterable
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Tuple
 import msgpack as mp
 import numpy as np
 import os.path
+import struct
+
+from postgkyl.data.grid_cache import grid_cache
+import postgkyl.data.idx_parser as idx_parser
 
 # Format description for raw Gkeyll output file from
 # gkyl_array_rio_format_desc.h
@@ -77,6 +82,10 @@ import os.path
 # Note: the global range in Gkeyll, of which each range is a part,
 # is 1-indexed.
 
+_magic = b"gkyl0"
+# magic, version, file_type, meta_size
+_preamble = struct.Struct("=5sqqq")
+
 
 class GkylReader(object):
   """Provides a framework to read Gkeyll binary output."""
@@ -84,7 +93,7 @@ class GkylReader(object):
   def __init__(self, file_name: str, ctx: dict | None = None,
       c2p: str = "", c2p_vel: str = "",
       axes: tuple | None = (None, None, None, None, None, None),
-      comp: str | int | None = None,
+      comp: str | int | None = None, mmap: bool = False,
       **kwargs):
     """Initialize the instance of Gkeyll reader.
 
@@ -102,6 +111,9 @@ class GkylReader(object):
         Allows to specify the axes to be loaded.
       comp: int or slice
         Allows to specify the components to be loaded.
+      mmap: bool = False
+        Return a read-only memory-mapped array instead of reading the data to memory.
+        Only the pages that are actually accessed are read from the disk.
       **kwargs
         This is not directly used but allowes for unified interface to all the readers
         we use.
@@ -109,15 +121,18 @@ class GkylReader(object):
     self.file_name = file_name
     self.c2p = c2p
     self.c2p_vel = c2p_vel
+    self.mmap = mmap
 
     self.dtf = np.dtype("f8")
     self.dti = np.dtype("i8")
 
     self.offset = 0
+    self.data_offset = 0  # start of the payload; allows to load the data repeatedly
     self.doffset = 8
 
     self.file_type = 1
     self.version = 0
+    self.range_table = None  # stored ranges of file type 3
 
     self.lower : np.ndarray
     self.upper : np.ndarray
@@ -152,9 +167,11 @@ class GkylReader(object):
   def is_compatible(self) -> bool:
     """Checks if file can be read with Gkeyll reader."""
     try:
-      magic = np.fromfile(self.file_name, dtype=np.dtype("b"), count=5, offset=0)
-      if np.array_equal(magic, [103, 107, 121, 108, 48]):
-        self.version = np.fromfile(self.file_name, dtype=self.dti, count=1, offset=5)[0]
+      with open(self.file_name, "rb") as fh:
+        buf = fh.read(_preamble.size)
+      #end
+      if len(buf) == _preamble.size and buf[:5] == _magic:
+        self.version = _preamble.unpack(buf)[1]
         return True
       else:
         return False
@@ -166,24 +183,16 @@ class GkylReader(object):
 
   # Starting with version 1, .gkyl files contain a header;
   # Version 0 files only include the real-type info
-  def _read_header(self) -> None:
+  def _read_header(self, fh: BinaryIO) -> None:
     """Reads header information for version 1 files and above."""
-    if self.is_compatible():
-      self.offset += 5  # Header contatins the gkyl magic sequence
-
-      self.version = np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0]
-      self.offset += 8
-
-      self.file_type = np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0]
-      self.offset += 8
-
-      meta_size = np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0]
-      self.offset += 8
+    fh.seek(self.offset)
+    buf = fh.read(_preamble.size)
+    if len(buf) == _preamble.size and buf[:5] == _magic:
+      _, self.version, self.file_type, meta_size = _preamble.unpack(buf)
+      self.offset += _preamble.size
 
       # read meta
       if meta_size > 0:
-        fh = open(self.file_name, "rb")
-        fh.seek(self.offset)
         unp = mp.unpackb(fh.read(meta_size))
         if isinstance(unp, dict) and self.ctx is not None:
           for key in unp:
@@ -198,12 +207,12 @@ class GkylReader(object):
           #end
         #end
         self.offset += meta_size
-        fh.close()
       #end
     #end
 
     # read real-type
-    real_type = np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0]
+    fh.seek(self.offset)
+    real_type = struct.unpack("=q", fh.read(8))[0]
     if real_type == 1:
       self.dtf = np.dtype("f4")
       self.doffset = 4
@@ -211,32 +220,26 @@ class GkylReader(object):
     self.offset += 8
   #end
 
-  def _read_t1t3_v1_domain(self) -> None:
+  def _read_t1t3_v1_domain(self, fh: BinaryIO) -> None:
     """Read domain information for file type 1 and 3."""
     # read grid dimensions
-    self.num_dims = np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0]
+    fh.seek(self.offset)
+    self.num_dims = struct.unpack("=q", fh.read(8))[0]
     self.offset += 8
 
-    # read grid shape
-    self.cells = np.fromfile(self.file_name, dtype=self.dti, count=self.num_dims, offset=self.offset)
-    self.offset += self.num_dims * 8
-
-    # read lower/upper
-    self.lower = np.fromfile(self.file_name, dtype=self.dtf, count=self.num_dims, offset=self.offset)
-    self.offset += self.num_dims * self.doffset
-    self.upper = np.fromfile(self.file_name, dtype=self.dtf, count=self.num_dims, offset=self.offset)
-    self.offset += self.num_dims * self.doffset
-
-    # read array elem_ez (the div by doffset is as elem_sz includes
-    # sizeof(real_type) = doffset)
-    elem_sz_raw = int(np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0])
-    elem_sz = elem_sz_raw / self.doffset
-    self.num_comps = int(elem_sz)
-    self.offset += 8
-
-    # read array size
-    self.asize = np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0]
-    self.offset += 8
+    # read the rest of the domain in one go: cells, lower, upper, esznc, and size
+    num_dims = self.num_dims
+    buf = fh.read(num_dims*8 + 2*num_dims*self.doffset + 16)
+    self.cells = np.frombuffer(buf, dtype=self.dti, count=num_dims, offset=0).copy()
+    self.lower = np.frombuffer(buf, dtype=self.dtf, count=num_dims,
+        offset=num_dims*8).copy()
+    self.upper = np.frombuffer(buf, dtype=self.dtf, count=num_dims,
+        offset=num_dims*(8 + self.doffset)).copy()
+    # the div by doffset is as elem_sz includes sizeof(real_type) = doffset
+    elem_sz_raw, self.asize = np.frombuffer(buf, dtype=self.dti, count=2,
+        offset=num_dims*(8 + 2*self.doffset))
+    self.num_comps = int(elem_sz_raw // self.doffset)
+    self.offset += len(buf)
 
     # prep for partial loading
     self.orig_size_array = np.zeros(self.num_dims+1, dtype=self.dti)
@@ -289,28 +292,24 @@ class GkylReader(object):
     #end
   #end
 
-  def _get_block(self, dim : int, out : np.ndarray, idx : int,
-      dim_offsets : np.ndarray, num_elems : np.ndarray, cells : np.ndarray) -> int:
+  def _get_block(self, dim_offsets : np.ndarray, num_elems : np.ndarray) -> np.ndarray:
     """Reads a block of data.
 
-    A recursion is used to read the data from the fastest going index (the last one;
-    i.e., the field components) to the slowest.
+    The block starting at the current offset is mapped into memory and reshaped to
+    'num_elems'. The partial load is then a single strided slice of
+    this map, i.e., only the pages containing the requested data are read from the disk.
     """
-    if dim == self.num_dims:
-      self.offset += dim_offsets[-1, 0] * self.doffset
-      out[idx : idx+self.num_comps] = np.fromfile(file=self.file_name,
-          dtype=self.dtf, count=self.num_comps, offset=self.offset)
-      self.offset += (self.num_comps + dim_offsets[-1, 1]) * self.doffset
-      idx += self.num_comps
+    count = int(np.prod(num_elems))
+    block = np.memmap(self.file_name, dtype=self.dtf, mode="r", offset=self.offset,
+        shape=(count,)).reshape(num_elems)
+    slices = tuple(slice(dim_offsets[d, 0], num_elems[d] - dim_offsets[d, 1])
+        for d in range(self.num_dims + 1))
+    self.offset += count * self.doffset
+    if self.mmap:
+      return block[slices]
     else:
-      self.offset += dim_offsets[dim, 0] * np.prod(num_elems[dim+1:]) * self.doffset
-      for _ in range(cells[dim]):
-        idx = self._get_block(dim=dim+1, out=out, idx=idx, dim_offsets=dim_offsets,
-                  num_elems=num_elems, cells=cells)
-      #end
-      self.offset += dim_offsets[dim, 1] * np.prod(num_elems[dim+1:]) * self.doffset
+      return np.array(block[slices])
     #end
-    return idx
   #end
 
   def _get_data(self, count : int,
@@ -321,7 +320,12 @@ class GkylReader(object):
     gshape[-1] = self.num_comps
 
     if not self.partial_load:
-      out = np.fromfile(self.file_name, dtype=self.dtf, count=count, offset=self.offset)
+      if self.mmap:
+        out = np.memmap(self.file_name, dtype=self.dtf, mode="r", offset=self.offset,
+            shape=(count,))
+      else:
+        out = np.fromfile(self.file_name, dtype=self.dtf, count=count, offset=self.offset)
+      #end
       self.offset += count * self.doffset
 
       if lo_idx is not None:
@@ -358,10 +362,7 @@ class GkylReader(object):
         self.offset += count * self.doffset
         return np.array([]), tuple(slices)
       #end
-      size = np.prod(cells) * self.num_comps
-      out = np.zeros(size, dtype=self.dtf) # Allocate space for the data
-      self._get_block(dim=0, out=out, idx=0, dim_offsets=dim_offsets,
-          num_elems=num_elems, cells=cells)
+      out = self._get_block(dim_offsets=dim_offsets, num_elems=num_elems)
 
       lo_idx = (lo_idx - self.global_offsets[:-1, 0]).clip(min=1)
       up_idx = (up_idx - self.global_offsets[:-1, 0] - dim_offsets[:-1, 1]).clip(min=1)
@@ -380,96 +381,253 @@ class GkylReader(object):
     data, _ = self._get_data(self.asize*self.num_comps)
     return data
 
+  def _index_t3_v1(self, fh: BinaryIO) -> np.ndarray:
+    """Build the table of the stored ranges for file type 3.
+
+    Only the range headers are read and the data are skipped. Each row of the table
+    includes the lower and upper cell indices of the range (1-indexed, inclusive), the
+    number of cells, and the byte offset of the range data.
+    """
+    fh.seek(self.offset)
+    num_range = struct.unpack("=q", fh.read(8))[0]
+    offset = self.offset + 8
+    header_size = (2*self.num_dims + 1) * 8
+    elem_size = int(self.orig_size_array[-1]) * self.doffset
+    table = np.zeros((num_range, 2*self.num_dims + 2), dtype=self.dti)
+    for i in range(num_range):
+      fh.seek(offset)
+      table[i, :-1] = np.frombuffer(fh.read(header_size), dtype=self.dti)
+      offset += header_size
+      table[i, -1] = offset
+      offset += int(table[i, -2]) * elem_size
+    #end
+    return table
+  #end
+
   def _read_t3_v1_data(self) -> np.ndarray:
-    """Read field data for file type 3."""
-    # get the number of stored ranges
-    num_range = np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0]
-    self.offset += 8
+    """Read field data for file type 3.
 
-    gshape = np.ones(self.num_dims + 1, dtype=self.dti)
-    for d in range(self.num_dims):
-      gshape[d] = self.cells[d]
+    The ranges which do not intersect the requested part of the domain are skipped
+    and the others are copied concurrently into the preallocated array.
+    """
+    if self.range_table is None:
+      with open(self.file_name, "rb") as fh:
+        self.range_table = self._index_t3_v1(fh)
+      #end
     #end
-    gshape[-1] = self.num_comps
-    data = np.zeros(gshape, dtype=self.dtf) # Allocate space for the data
-
-    for _ in range(num_range):
-      lo_idx = np.fromfile(self.file_name, dtype=self.dti, count=self.num_dims, offset=self.offset)
-      self.offset += self.num_dims * 8
-      up_idx = np.fromfile(self.file_name, dtype=self.dti, count=self.num_dims, offset=self.offset)
-      self.offset += self.num_dims * 8
-
-      asize = np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0]
-      self.offset += 8
-      #data_raw = np.fromfile(self.file_name, dtype=self.dtf, count=asize*self.num_comps,
-      #    offset=self.offset)
-      #self.offset += asize * self.num_comps * self.doffset
-      data_block, slices = self._get_data(count=asize*self.orig_size_array[-1],
-          lo_idx=lo_idx, up_idx=up_idx)
-
-      if len(data_block) == 0:
-        continue
+    table = self.range_table
+    num_dims = self.num_dims
+    num_comps = int(self.orig_size_array[-1])
+
+    # Requested window in the global 0-indexed cells
+    win_lo = np.zeros(num_dims, dtype=self.dti)
+    win_up = self.orig_size_array[:-1].copy()
+    comp_slice = slice(None)
+    if self.partial_load:
+      win_lo = self.global_offsets[:-1, 0]
+      win_up = win_up - self.global_offsets[:-1, 1]
+      comp_slice = slice(int(self.global_offsets[-1, 0]),
+          num_comps - int(self.global_offsets[-1, 1]))
+    #end
+    gshape = tuple(int(c) for c in win_up - win_lo) + (int(self.num_comps),)
+
+    # Intersections of the ranges with the window
+    range_lo = table[:, :num_dims] - 1  # Gkeyll is 1-indexed
+    lo = np.maximum(range_lo, win_lo)
+    up = np.minimum(table[:, num_dims : 2*num_dims], win_up)
+    hits = np.flatnonzero(np.all(up > lo, axis=1))
+
+    def get_slices(i):
+      src = tuple(slice(int(lo[i, d] - range_lo[i, d]), int(up[i, d] - range_lo[i, d]))
+          for d in range(num_dims)) + (comp_slice,)
+      dst = tuple(slice(int(lo[i, d] - win_lo[d]), int(up[i, d] - win_lo[d]))
+          for d in range(num_dims))
+      return src, dst
+    #end
+
+    def get_shape(i):
+      return tuple(int(c) for c in table[i, num_dims : 2*num_dims] - range_lo[i]) + (num_comps,)
+    #end
+
+    # A single range spanning the whole window can be returned as it is, which keeps
+    # memory-mapped data zero-copy
+    if len(hits) == 1 and np.array_equal(up[hits[0]] - lo[hits[0]], gshape[:-1]):
+      i = hits[0]
+      block = np.memmap(self.file_name, dtype=self.dtf, mode="r", offset=int(table[i, -1]),
+          shape=get_shape(i))
+      src, _ = get_slices(i)
+      return block[src] if self.mmap else np.array(block[src])
+    #end
+
+    # The array does not need to be zeroed when the ranges cover the whole window
+    covered = np.prod(up[hits] - lo[hits], axis=1).sum() == np.prod(gshape[:-1])
+    data = np.empty(gshape, dtype=self.dtf) if covered else np.zeros(gshape, dtype=self.dtf)
+    if len(hits) == 0:
+      return data
+    #end
+    # The whole file is mapped only once; ranges are views into it
+    file_map = np.memmap(self.file_name, dtype=np.uint8, mode="r")
+
+    def copy_ranges(idxs):
+      for i in idxs:
+        block = np.ndarray(get_shape(i), dtype=self.dtf, buffer=file_map,
+            offset=int(table[i, -1]))
+        src, dst = get_slices(i)
+        data[dst] = block[src]
       #end
-      data[slices] = data_block
+    #end
+
+    num_workers = min(len(hits), os.cpu_count() or 1, 8)
+    if num_workers > 1:
+      with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        list(executor.map(copy_ranges, np.array_split(hits, num_workers)))
+      #end
+    else:
+      copy_ranges(hits)
     #end
     return data
   #end
 
-  def _read_t2_v1(self) -> Tuple[list, np.ndarray]:
-    """Read dynvector data for file type 2."""
-    cells = 0
-    time = np.array([])
-    data = np.array([[]])
-    while True:  # Python does not have DO .. WHILE loop
-      elem_sz_raw = int(np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0])
-      num_comps = int(elem_sz_raw / self.doffset)
-      self.offset += 8
+  def _index_t2_v1(self, fh: BinaryIO) -> list:
+    """Scan the record headers of dynvector data for file type 2.
 
-      loop_cells = int(np.fromfile(self.file_name, dtype=self.dti, count=1, offset=self.offset)[0])
-      self.offset += 8
+    Returns:
+      A list of (offset, num_cells, num_comps) tuples, one for each record appended
+      to the file, where the offset points to the start of the TIME_DATA.
+    """
+    records = []
+    file_size = os.fstat(fh.fileno()).st_size
+    while True:  # Python does not have DO .. WHILE loop
+      fh.seek(self.offset)
+      elem_sz_raw, loop_cells = struct.unpack("=qq", fh.read(16))
+      self.offset += 16
+      records.append((self.offset, loop_cells, elem_sz_raw // self.doffset))
+      self.offset += loop_cells * (8 + elem_sz_raw)
+      if self.offset >= file_size:
+        break
+      #end
+      self._read_header(fh)
+      if self.file_type != 2:
+        raise TypeError("Inconsitent data in g0 dynVector file.")
+      #end
+    #end
+    return records
+  #end
 
-      loop_time = np.fromfile(self.file_name, dtype=self.dtf, count=loop_cells, offset=self.offset)
-      self.offset += loop_cells * 8
+  def _read_t2_v1(self) -> Tuple[list, np.ndarray]:
+    """Read dynvector data for file type 2.
 
-      data_raw = np.fromfile(self.file_name, dtype=self.dtf, count=num_comps * loop_cells,
-          offset=self.offset)
-      self.offset += loop_cells * elem_sz_raw
-      gshape = np.array((loop_cells, num_comps), dtype=self.dti)
+    The record headers are scanned first so that the output can be allocated at once
+    and filled in place. The time stamps are read before the data, which allows to
+    read only the records overlapping the time window selected with 'z0'.
+    """
+    with open(self.file_name, "rb") as fh:
+      self.records = self._index_t2_v1(fh)
+      num_comps = self.records[0][2]
+      if any(rec[2] != num_comps for rec in self.records):
+        raise TypeError("Inconsitent data in g0 dynVector file.")
+      #end
+      cells = sum(rec[1] for rec in self.records)
+
+      time = np.empty(cells, dtype=np.dtype("f8"))
+      idx = 0
+      for offset, loop_cells, _ in self.records:
+        fh.seek(offset)
+        fh.readinto(time[idx : idx+loop_cells])
+        idx += loop_cells
+      #end
 
-      time = np.append(time, loop_time)
-      if cells == 0:
-        data = data_raw.reshape(gshape, order="C")
-      else:
-        data = np.append(data, data_raw.reshape(gshape, order="C"), axis=0)
+      # Select the time window
+      lo, up = 0, cells
+      if self.partial_idxs[0]:
+        sel = idx_parser.idx_parser(self.partial_idxs[0], time, nodal=True)
+        if isinstance(sel, slice):
+          lo, up, _ = sel.indices(cells)
+        else:
+          # A single time past the end selects the last record
+          lo = min(sel + cells if sel < 0 else sel, cells - 1)
+          up = lo + 1
+        #end
+        if up <= lo:
+          raise ValueError(f"The time window '{self.partial_idxs[0]}' does not include any "
+              f"records; the file spans t = {time[0]:e} to {time[-1]:e}")
+        #end
       #end
-      cells += loop_cells
-      if self.offset >= os.path.getsize(self.file_name):
-        break
+
+      data = np.empty((max(up - lo, 0), num_comps), dtype=self.dtf)
+      idx = 0
+      for offset, loop_cells, _ in self.records:
+        rec_lo, rec_up = max(lo - idx, 0), min(up - idx, loop_cells)
+        if rec_lo < rec_up:
+          fh.seek(offset + loop_cells*8 + rec_lo*num_comps*self.doffset)
+          fh.readinto(data[idx + rec_lo - lo : idx + rec_up - lo])
+        #end
+        idx += loop_cells
       #end
-      self._read_header()
-      if self.file_type != 2:
-        raise TypeError("Inconsitent data in g0 dynVector file.")
+    #end
+
+    time = time[lo:up]
+    if self.partial_idxs[6]:
+      comp = idx_parser.idx_parser(self.partial_idxs[6])
+      if isinstance(comp, int):
+        comp = slice(comp, comp + 1)
       #end
+      data = data[:, comp]
     #end
-    self.cells = [cells]
+    self.cells = [len(time)]
     self.lower = np.atleast_1d(time.min())
     self.upper = np.atleast_1d(time.max())
     return time, data
   #end
 
+  def _load_c2p_grid(self, num_dims: int) -> tuple:
+    """Read the c2p mapped grid with the same cuts as the values."""
+    grid_reader = GkylReader(self.c2p, axes=tuple(ax or None for ax in self.partial_idxs[:6]))
+    grid_reader.preload()
+    _, tmp = grid_reader.load()
+    num_comps = tmp.shape[-1]
+    num_coeff = num_comps / num_dims
+    return tuple(tmp[..., int(d * num_coeff) : int((d + 1)*num_coeff)] for d in range(num_dims))
+  #end
+
+  def _load_c2p_vel_grid(self) -> tuple:
+    """Read the c2p mapped velocity grid."""
+    grid_reader = GkylReader(self.c2p_vel)
+    grid_reader.preload()
+    _, tmp = grid_reader.load()
+
+    num_vdim = len(tmp.shape) - 1
+    num_comps = tmp.shape[-1]
+    num_coeff = num_comps / num_vdim
+    vel_grid = []
+    for d in range(num_vdim):
+      idx = [0] * (num_vdim + 1)
+      idx[d] = slice(None)
+      idx[-1] = slice(int(d * num_coeff), int((d + 1) * num_coeff))
+      vel_grid.append(tmp[tuple(idx)])
+    #end
+    return tuple(vel_grid)
+  #end
+
   # ---- Exposed functions -----
   def preload(self) -> None:
-    """Loads metadata."""
-    self._read_header()
-    if self.file_type == 1 or self.file_type == 3 or self.version == 0:
-      self._read_t1t3_v1_domain()
-      if self.ctx:
-        self.ctx["cells"] = self.cells
-        self.ctx["lower"] = self.lower
-        self.ctx["upper"] = self.upper
-        self.ctx["num_comps"] = self.num_comps
+    """Loads metadata.
+
+    Only the header is read (using a single file handle); the payload is not touched.
+    """
+    with open(self.file_name, "rb") as fh:
+      self._read_header(fh)
+      if self.file_type == 1 or self.file_type == 3 or self.version == 0:
+        self._read_t1t3_v1_domain(fh)
+        if self.ctx:
+          self.ctx["cells"] = self.cells
+          self.ctx["lower"] = self.lower
+          self.ctx["upper"] = self.upper
+          self.ctx["num_comps"] = self.num_comps
+        #end
       #end
     #end
+    self.data_offset = self.offset
   #end
 
   def load(self) -> Tuple[list, np.ndarray]:
@@ -482,6 +640,7 @@ class GkylReader(object):
       Needs to be called after the preload.
     """
     time = None
+    self.offset = self.data_offset
     if self.file_type == 1 or self.version == 0:
       data = self._read_t1_v1_data()
     elif self.file_type == 2:
@@ -500,39 +659,24 @@ class GkylReader(object):
         self.ctx["grid_type"] = "nodal"
       #end
     elif self.c2p:
-      grid_reader = GkylReader(self.c2p)
-      grid_reader.preload()
-      _, tmp = grid_reader.load()
-      num_comps = tmp.shape[-1]
-      num_coeff = num_comps / num_dims
-      grid = [tmp[..., int(d * num_coeff) : int((d + 1)*num_coeff)] for d in range(num_dims)]
+      # The grid is cut like the values, so the selection is a part of the key
+      grid = list(grid_cache.get(self.c2p, ("c2p", num_dims, tuple(self.partial_idxs[:6])),
+          lambda: self._load_c2p_grid(num_dims)))
       if self.ctx:
         self.ctx["grid_type"] = "c2p"
       #end
     elif self.c2p_vel:
-      grid_reader = GkylReader(self.c2p_vel)
-      grid_reader.preload()
-      _, tmp = grid_reader.load()
-
-      num_vdim = len(tmp.shape) - 1
+      vel_grid = grid_cache.get(self.c2p_vel, ("c2p_vel",), self._load_c2p_vel_grid)
+      num_vdim = len(vel_grid)
       num_cdim = num_dims - num_vdim
       if self.ctx:
         self.ctx["num_vdim"] = num_vdim
         self.ctx["num_cdim"] = num_cdim
       #end
 
-      # Create uniform configuration space grid
+      # Create uniform configuration space grid and add the non-uniform velocity grid
       grid = [np.linspace(self.lower[d], self.upper[d], self.cells[d] + 1) for d in range(num_cdim)]
-
-      # Create non-uniform velocity grid
-      num_comps = tmp.shape[-1]
-      num_coeff = num_comps / num_vdim
-      for d in range(num_vdim):
-        idx = [0] * (num_vdim + 1)
-        idx[d] = slice(None)
-        idx[-1] = slice(int(d * num_coeff), int((d + 1) * num_coeff))
-        grid.append(tmp[tuple(idx)])
-      #end
+      grid.extend(vel_grid)
 
       if self.ctx:
         self.ctx["grid_type"] = "c2p_vel"
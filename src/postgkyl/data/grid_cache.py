@@ -0,0 +1,114 @@
+"""Module including process-wide cache for grids and geometry data."""
+
+from collections import OrderedDict
+from typing import Any, Callable
+import numpy as np
+import os.path
+import threading
+
+
+def _get_nbytes(value: Any) -> int:
+  if isinstance(value, np.ndarray):
+    return value.nbytes
+  elif isinstance(value, (list, tuple)):
+    return sum(_get_nbytes(v) for v in value)
+  else:
+    return 0
+  # end
+
+
+def _set_read_only(value: Any) -> None:
+  if isinstance(value, np.ndarray):
+    value.flags.writeable = False
+  elif isinstance(value, (list, tuple)):
+    for v in value:
+      _set_read_only(v)
+    # end
+  # end
+
+
+class GridCache(object):
+  """Least-recently-used cache for data which are static for a whole run.
+
+  Grids (c2p mappings) and geometry (Jacobians, etc.) are stored in separate files
+  which are the same for all the frames of a simulation. The cache allows to read
+  (and post-process) them only once. The entries are keyed by the file path, its
+  modification time and size, and a user-specified key, e.g., the partial load
+  selection. The cached arrays are read-only.
+  """
+
+  def __init__(self, max_bytes: int = 2**30):
+    """Initialize the cache.
+
+    Args:
+      max_bytes: int = 2**30
+        Memory bound of the cache; the least-recently-used entries are evicted when it
+        is exceeded.
+    """
+    self.max_bytes = max_bytes
+    self._entries = OrderedDict()
+    self._nbytes = 0
+    self._lock = threading.Lock()
+
+  def get(self, file_name: str | None, key: tuple, loader: Callable[[], Any]) -> Any:
+    """Returns the cached value or loads it.
+
+    Args:
+      file_name: str | None
+        The file the value is derived from; when None, only the 'key' is used.
+      key: tuple
+        Additional hashable key, e.g., the partial load selection.
+      loader: callable
+        Function without arguments which creates the value when it is not cached.
+    """
+    if file_name is None:
+      full_key = tuple(key)
+    else:
+      try:
+        stat = os.stat(file_name)
+      except (OSError, TypeError, ValueError):
+        return loader()
+      # end
+      full_key = (os.path.realpath(file_name), stat.st_mtime_ns, stat.st_size) + tuple(key)
+    # end
+
+    with self._lock:
+      if full_key in self._entries:
+        self._entries.move_to_end(full_key)
+        return self._entries[full_key][0]
+      # end
+    # end
+
+    value = loader()
+    nbytes = _get_nbytes(value)
+    if nbytes > self.max_bytes:
+      return value
+    # end
+    _set_read_only(value)
+    with self._lock:
+      if full_key not in self._entries:
+        self._entries[full_key] = (value, nbytes)
+        self._nbytes += nbytes
+      # end
+      while self._nbytes > self.max_bytes:
+        _, (_, evicted) = self._entries.popitem(last=False)
+        self._nbytes -= evicted
+      # end
+    # end
+    return value
+
+  def clear(self) -> None:
+    """Removes all entries."""
+    with self._lock:
+      self._entries.clear()
+      self._nbytes = 0
+    # end
+
+  def get_nbytes(self) -> int:
+    return self._nbytes
+
+  nbytes = property(get_nbytes)
+
+
+# Process-wide instance
+grid_cache = GridCache()
@@ -76,3 +76,58 @@ def idx_parser(value: int | float | str, array: np.ndarray | None = None,
   # end
 
   return idx
+
+
+def _wrap_negative(value: int | float | str, length: int) -> int | float | str:
+  # Negative integers count from the end like Python indices; negative floats are
+  # coordinates
+  if isinstance(value, (int, np.integer)):
+    return int(length + value if value < 0 else value)
+  elif not isinstance(value, str):
+    return value
+  # end
+  sep = "," if "," in value else ":"
+  parts = value.split(sep)
+  for i, part in enumerate(parts):
+    part = part.strip()
+    if part.startswith("-") and part[1:].isdigit():
+      parts[i] = str(max(length + int(part), 0))
+    # end
+  # end
+  return sep.join(parts)
+
+
+def idx_to_slice(value: int | float | str | None, array: np.ndarray | None,
+    length: int) -> tuple[slice, tuple | None]:
+  """Converts an index into a contiguous slice for hyperslab reads.
+
+  Single indices keep the dimension, i.e., they are converted into slices of the length
+  one. Comma separated indices are converted into the slice covering all of them.
+
+  Args:
+    value: int | float | str | None
+      Index, slice 'lo:up', or comma separated indices; None selects everything.
+      Negative integers count from the end.
+    array: np.ndarray | None
+      Node coordinates used to find the indices specified by floats.
+    length: int
+      Number of elements along the dimension.
+
+  Returns:
+    Tuple of the slice and the indices relative to the slice start for the comma
+    separated indices (None otherwise).
+  """
+  if value is None or value == "":
+    return slice(0, length), None
+  # end
+  if array is None:
+    array = np.arange(length + 1)
+  # end
+  idx = idx_parser(_wrap_negative(value, length), array)
+  if isinstance(idx, tuple):
+    start = min(idx)
+    return slice(start, max(idx) + 1), tuple(i - start for i in idx)
+  elif isinstance(idx, slice):
+    return slice(max(idx.start, 0), min(idx.stop, length)), None
+  # end
+  return slice(idx, idx + 1), None
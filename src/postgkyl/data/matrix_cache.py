@@ -0,0 +1,217 @@
+"""Module including persistent cache for DG interpolation and derivative matrices."""
+
+import functools
+import numpy as np
+import os
+import tempfile
+
+from postgkyl import __version__
+from postgkyl.data.dg_basis import create_derivative_matrix, create_interp_matrix
+from postgkyl.data.dg_basis import get_exponents
+
+# Bump when the format or the content of the stored matrices changes
+_CACHE_VERSION = 2
+
+# Combinations used for pre-warming
+_basis_types = ("serendipity", "maximal-order", "tensor", "gkhybrid", "hybrid")
+_max_dims = 6
+_max_poly_order = 3
+# Largest matrix (number of elements) generated when pre-warming
+_max_warm_size = 2**22
+
+
+def get_cache_root() -> str:
+  """Returns the root directory of the Postgkyl on-disk caches.
+
+  The location can be set with the PGKYL_CACHE_DIR environment variable; the default is
+  '$XDG_CACHE_HOME/postgkyl' (or '~/.cache/postgkyl').
+  """
+  root = os.environ.get("PGKYL_CACHE_DIR")
+  if not root:
+    xdg = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    root = os.path.join(xdg, "postgkyl")
+  # end
+  return root
+
+
+def get_cache_dir() -> str:
+  """Returns the directory of the on-disk matrix store.
+
+  The store is located in the cache root (see 'get_cache_root') and is versioned, i.e.,
+  each Postgkyl version has its own subdirectory.
+  """
+  return os.path.join(get_cache_root(), f"matrices-{__version__:s}-v{_CACHE_VERSION:d}")
+
+
+def _get_file_name(kind: str, dim: int, poly_order: int, basis_type: str, interp: int,
+    modal: bool, c2p: bool) -> str:
+  name = f"{kind:s}_{dim:d}d_p{poly_order:d}_{basis_type:s}_i{interp:d}"
+  name += "_modal" if modal else "_nodal"
+  name += "_c2p" if c2p else ""
+  return os.path.join(get_cache_dir(), f"{name:s}.npz")
+
+
+def _read_disk(file_name: str) -> np.ndarray | None:
+  try:
+    with np.load(file_name) as fh:
+      return fh["mat"]
+    # end
+  except (OSError, KeyError, ValueError):
+    return None
+  # end
+
+
+def _write_disk(file_name: str, mat: np.ndarray) -> None:
+  # Write into a temporary file first and rename it so concurrent processes never see
+  # a partially written matrix; failing to write (e.g., read-only home) is not fatal
+  try:
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=os.path.dirname(file_name), suffix=".tmp")
+    with os.fdopen(fd, "wb") as fh:
+      np.savez(fh, mat=mat)
+    # end
+    os.replace(tmp_name, file_name)
+  except OSError:
+    pass
+  # end
+
+
+@functools.lru_cache(maxsize=None)
+def _get_matrix(kind: str, dim: int, poly_order: int, basis_type: str, interp: int,
+    modal: bool, c2p: bool) -> np.ndarray:
+  file_name = _get_file_name(kind, dim, poly_order, basis_type, interp, modal, c2p)
+  mat = _read_disk(file_name)
+  if mat is None:
+    if kind == "interp":
+      mat = create_interp_matrix(dim, poly_order, basis_type, interp, modal, c2p)
+    else:
+      mat = create_derivative_matrix(dim, poly_order, basis_type, interp, modal)
+    # end
+    mat = np.asarray(mat, dtype=np.float64)
+    _write_disk(file_name, mat)
+  # end
+  # The same array is shared by all the callers
+  mat.flags.writeable = False
+  return mat
+
+
+def get_interp_matrix(dim: int, poly_order: int, basis_type: str, interp: int,
+    modal: bool = True, c2p: bool = False) -> np.ndarray:
+  """Returns the DG interpolation matrix.
+
+  The matrix is generated only once; afterwards, it is served from the in-process cache
+  or from the on-disk store. The returned array is read-only.
+
+  Args:
+    dim: int
+      Number of dimensions.
+    poly_order: int
+      Polynomial order.
+    basis_type: str
+      Basis name, e.g., 'serendipity' or 'tensor'.
+    interp: int
+      Number of interpolation points per cell.
+    modal: bool = True
+      Modal or nodal basis.
+    c2p: bool = False
+      Interpolate onto cell edges (used for the mapped grids).
+  """
+  return _get_matrix("interp", int(dim), int(poly_order), str(basis_type), int(interp),
+      bool(modal), bool(c2p))
+
+
+def get_derivative_matrix(dim: int, poly_order: int, basis_type: str, interp: int,
+    modal: bool = True) -> np.ndarray:
+  """Returns the DG derivative matrix.
+
+  Same as 'get_interp_matrix' but for the derivative matrices; the last axis of the
+  returned array indexes the direction of the derivative.
+  """
+  return _get_matrix("deriv", int(dim), int(poly_order), str(basis_type), int(interp),
+      bool(modal), False)
+
+
+def warm(dims: list | None = None, poly_orders: list | None = None,
+    basis_types: list | None = None, c2p: bool = True, derivatives: bool = True,
+    callback=None) -> int:
+  """Pre-computes the matrices for all the supported combinations.
+
+  Only the default number of interpolation points (poly_order + 1) is considered.
+  Combinations which are not supported by the basis generator and very large matrices
+  (high-dimensional tensor bases) are skipped; these are still generated on demand.
+
+  Args:
+    dims: list | None = None
+      Dimensions to generate; all by default.
+    poly_orders: list | None = None
+      Polynomial orders to generate; all by default.
+    basis_types: list | None = None
+      Basis names to generate; all by default.
+    c2p: bool = True
+      Generate also the matrices for mapped grids.
+    derivatives: bool = True
+      Generate also the derivative matrices.
+    callback: callable | None = None
+      Called with the name of each generated matrix file.
+
+  Returns:
+    Number of matrices available in the cache.
+  """
+  dims = dims or range(1, _max_dims + 1)
+  poly_orders = poly_orders or range(1, _max_poly_order + 1)
+  basis_types = basis_types or _basis_types
+  cnt = 0
+  for basis_type in basis_types:
+    for dim in dims:
+      for poly_order in poly_orders:
+        interp = poly_order + 1
+        try:
+          num_basis = get_exponents(dim, poly_order, basis_type).shape[0]
+        except NameError:
+          continue
+        # end
+        if num_basis*(interp + 1)**dim*dim > _max_warm_size:
+          continue
+        # end
+        kinds = [("interp", False)]
+        if c2p:
+          kinds.append(("interp", True))
+        # end
+        if derivatives:
+          kinds.append(("deriv", False))
+        # end
+        for kind, is_c2p in kinds:
+          try:
+            _get_matrix(kind, dim, poly_order, basis_type, interp, True, is_c2p)
+          except (NameError, IndexError, ValueError):
+            continue
+          # end
+          cnt += 1
+          if callback:
+            callback(_get_file_name(kind, dim, poly_order, basis_type, interp, True, is_c2p))
+          # end
+        # end
+      # end
+    # end
+  # end
+  return cnt
+
+
+def clear(disk: bool = True) -> None:
+  """Removes all the cached matrices.
+
+  Args:
+    disk: bool = True
+      Remove also the on-disk store of the current version.
+  """
+  _get_matrix.cache_clear()
+  if disk:
+    cache_dir = get_cache_dir()
+    if os.path.isdir(cache_dir):
+      for fn in os.listdir(cache_dir):
+        if fn.endswith(".npz"):
+          os.remove(os.path.join(cache_dir, fn))
+        # end
+      # end
+    # end
+  # end
@@ -0,0 +1,189 @@
+"""Module including prefetching of lazily loaded datasets.
+
+The values of the following datasets are read in a background thread while the current
+one is processed (e.g., rendered by 'animate'), so the I/O and the processing overlap.
+Reading the files is I/O bound and NumPy releases the GIL while decoding the data.
+"""
+
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator
+
+from postgkyl.data.gdata import GData
+
+_end = object()
+
+
+def _get_datasets(item) -> list:
+  # Items are datasets, lists of datasets (e.g., blocks of a frame), or tuples from the
+  # enumerating iterators
+  if isinstance(item, GData):
+    return [item]
+  elif isinstance(item, (list, tuple)):
+    return [dat for sub in item for dat in _get_datasets(sub)]
+  # end
+  return []
+
+
+def _load(item, needed: Callable | None = None) -> list:
+  # Returns the datasets loaded here, i.e., the ones which can be released afterwards
+  out = []
+  for dat in _get_datasets(item):
+    if dat.is_loaded() or (needed is not None and not needed(dat)):
+      continue
+    # end
+    try:
+      dat.get_values()
+    except ValueError:
+      # E.g., a prompt for the variable name; the values are read on the main thread
+      continue
+    # end
+    if dat.is_loaded():
+      out.append(dat)
+    # end
+  # end
+  return out
+
+
+def _release(datasets: list) -> None:
+  for dat in datasets:
+    dat.evict()
+  # end
+
+
+def prefetch(items: Iterable, depth: int = 2, release: bool = False,
+    needed: Callable | None = None, pinned: set | None = None) -> Iterator:
+  """Yields the items while the values of the following ones are read in the background.
+
+  Args:
+    items: Iterable
+      Datasets, lists of datasets, or tuples including datasets, e.g., from
+      'DataSpace.iterator(enum=True)'.
+    depth: int = 2
+      Number of items read ahead.
+    release: bool = False
+      Evict the values read by the prefetching once the item was processed (see
+      'GData.evict'), so only about 'depth' items are held in memory.
+    needed: Callable | None = None
+      Predicate selecting the datasets which need the values; all by default.
+    pinned: set | None = None
+      Set (e.g., of a 'DataSpace') updated with the ids of the datasets which are read
+      in the background or not yet processed; they must not be evicted meanwhile.
+
+  Yields:
+    The items in the same order.
+  """
+  if depth < 1:
+    yield from items
+    return
+  # end
+  it = iter(items)
+  pending = deque()
+  pinned = set() if pinned is None else pinned
+  try:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+      def submit() -> None:
+        item = next(it, _end)
+        if item is not _end:
+          keys = {id(dat) for dat in _get_datasets(item)}
+          pinned.update(keys)
+          pending.append((item, keys, executor.submit(_load, item, needed)))
+        # end
+      # end
+
+      for _ in range(depth + 1):
+        submit()
+      # end
+      while pending:
+        item, keys, future = pending[0]
+        loaded = future.result()
+        submit()
+        yield item
+        pending.popleft()
+        pinned.difference_update(keys)
+        if release:
+          _release(loaded)
+        # end
+      # end
+    # end
+  finally:
+    # Items left when the iteration stopped early; the executor waited for their reads
+    for _, keys, _ in pending:
+      pinned.difference_update(keys)
+    # end
+  # end
+
+
+class FramePrefetcher(object):
+  """Random-access list of frames with the following frames read in the background.
+
+  Accessing a frame schedules the reading of the next 'depth' frames (wrapping around
+  for the looping animations). Frames read by the prefetcher are evicted when they
+  leave this window, so the memory holds only O(depth) frames of lazily loaded data.
+
+  Example:
+    frames = FramePrefetcher([[dat] for dat in data.iterator()], depth=4)
+    FuncAnimation(fig, update, len(frames), fargs=(frames,))
+  """
+
+  def __init__(self, frames: list, depth: int = 2, release: bool = True):
+    """Initialize the prefetcher.
+
+    Args:
+      frames: list
+        Frames; each frame is a dataset or a list of datasets.
+      depth: int = 2
+        Number of frames read ahead.
+      release: bool = True
+        Evict the frames read by the prefetcher when they leave the window.
+    """
+    self.frames = list(frames)
+    self.depth = max(int(depth), 0)
+    self.release = release
+    self._futures = {}
+    self._executor = None
+
+  def __len__(self) -> int:
+    return len(self.frames)
+
+  def __iter__(self) -> Iterator:
+    for i in range(len(self.frames)):
+      yield self[i]
+    # end
+
+  def _submit(self, i: int) -> Future:
+    if self._executor is None:
+      self._executor = ThreadPoolExecutor(max_workers=1)
+    # end
+    if i not in self._futures:
+      self._futures[i] = self._executor.submit(_load, self.frames[i])
+    # end
+    return self._futures[i]
+
+  def __getitem__(self, i: int):
+    num = len(self.frames)
+    i = i % num if num else i
+    if self.depth == 0:
+      return self.frames[i]
+    # end
+    self._submit(i).result()
+    window = {(i + k) % num for k in range(self.depth + 1)}
+    for k in range(1, self.depth + 1):
+      self._submit((i + k) % num)
+    # end
+    # Release the frames outside of the window; they are read again when needed
+    for j in [j for j in self._futures if j not in window]:
+      loaded = self._futures.pop(j).result()
+      if self.release:
+        _release(loaded)
+      # end
+    # end
+    return self.frames[i]
+
+  def close(self) -> None:
+    """Waits for the pending reads and stops the background thread."""
+    if self._executor is not None:
+      self._executor.shutdown(wait=True)
+      self._executor = None
+    # end
+    self._futures.clear()
@@ -0,0 +1,189 @@
+"""Module including the registry of the file readers.
+
+Instead of trying the readers one by one (each failed attempt opens the file), the
+first bytes of the file are read once and compared with the signatures of the
+registered readers; the extension is used as a hint. The reader selected for a file is
+remembered for its directory and stem (e.g., 'name-field_' of 'name-field_10.gkyl'), so
+the following frames go straight to it.
+
+Third-party readers can be registered using the 'postgkyl.readers' entry point group.
+The entry point needs to point to a reader class with the same interface as the
+built-in readers; the optional class attributes 'magic', 'extensions', and 'directory'
+are used as the arguments of 'register_reader'.
+
+Example (pyproject.toml of a plugin):
+  [project.entry-points."postgkyl.readers"]
+  mycode = "mycode_pgkyl:MyCodeReader"
+"""
+
+from importlib.metadata import entry_points
+import os
+import re
+
+from postgkyl.data.gkyl_reader import GkylReader
+from postgkyl.data.gkyl_adios_reader import GkylAdiosReader
+from postgkyl.data.gkyl_h5_reader import GkylH5Reader
+from postgkyl.data.flash_h5_reader import FlashH5Reader
+
+_hdf5_signature = b"\x89HDF\r\n\x1a\n"
+
+_readers = {}
+_plugins_loaded = False
+
+# Reader names keyed by the directory and the stem of the files
+_decisions = {}
+
+
+def register_reader(name: str, reader, magic: tuple = (), extensions: tuple = (),
+    directory: bool = False) -> None:
+  """Registers a reader class.
+
+  Args:
+    name: str
+      Name used for the 'reader_name' argument of 'GData'.
+    reader: type
+      Reader class; instances are created with the 'GData' arguments and need to
+      implement 'is_compatible', 'preload', and 'load'.
+    magic: tuple = ()
+      Signatures of the files; either bytes expected at the start of the file or
+      (offset, bytes) pairs. Readers with signatures are only tried for the files
+      starting with one of them.
+    extensions: tuple = ()
+      File extensions (including the dot) tried first when the signatures are not
+      conclusive.
+    directory: bool = False
+      The reader accepts directories (e.g., ADIOS BP4 and BP5 output).
+  """
+  sigs = []
+  for sig in magic:
+    sigs.append(sig if isinstance(sig, tuple) else (0, sig))
+  # end
+  _readers[name] = {"reader": reader, "magic": tuple(sigs),
+      "extensions": tuple(ext.lower() for ext in extensions), "directory": directory}
+  _decisions.clear()
+
+
+def _load_plugins() -> None:
+  global _plugins_loaded
+  if _plugins_loaded:
+    return
+  # end
+  _plugins_loaded = True
+  for ep in entry_points(group="postgkyl.readers"):
+    if ep.name in _readers:
+      continue
+    # end
+    try:
+      reader = ep.load()
+    except Exception:
+      # A broken plugin should not prevent reading the other files
+      continue
+    # end
+    register_reader(ep.name, reader, magic=getattr(reader, "magic", ()),
+        extensions=getattr(reader, "extensions", ()),
+        directory=getattr(reader, "directory", False))
+  # end
+
+
+def get_reader_names() -> list:
+  """Returns the names of the registered readers."""
+  _load_plugins()
+  return list(_readers)
+
+
+def _get_family(file_name: str) -> tuple:
+  # Frames of one output differ only in the trailing number of the stem
+  directory, base = os.path.split(file_name)
+  stem, ext = os.path.splitext(base)
+  return os.path.realpath(directory or "."), re.sub(r"[0-9]+$", "", stem), ext.lower()
+
+
+def _read_head(file_name: str, size: int) -> bytes | None:
+  try:
+    with open(file_name, "rb") as fh:
+      return fh.read(size)
+    # end
+  except OSError:
+    return None
+  # end
+
+
+def sniff(file_name: str, names: list | None = None) -> list:
+  """Returns the names of the readers which can possibly read the file.
+
+  Args:
+    file_name: str
+    names: list | None = None
+      Registered readers to choose from; all by default.
+
+  Returns:
+    Reader names ordered from the most likely one; readers whose signatures do not
+    match are excluded.
+  """
+  _load_plugins()
+  specs = {name: _readers[name] for name in (names or _readers) if name in _readers}
+  ext = os.path.splitext(file_name)[1].lower()
+
+  if os.path.isdir(file_name):
+    candidates = [name for name, spec in specs.items() if spec["directory"]]
+  else:
+    size = max((off + len(sig) for spec in specs.values() for off, sig in spec["magic"]),
+        default=0)
+    head = _read_head(file_name, size) if size else b""
+    matched = [name for name, spec in specs.items()
+        if head and any(head[off : off + len(sig)] == sig for off, sig in spec["magic"])]
+    # Readers without signatures cannot be ruled out
+    candidates = matched + [name for name, spec in specs.items() if not spec["magic"]]
+  # end
+  # The extension only reorders the candidates
+  candidates.sort(key=lambda name: ext not in specs[name]["extensions"])
+  return candidates
+
+
+def find_reader(file_name: str, names: list | None = None, **kwargs):
+  """Returns an instance of the reader compatible with the file.
+
+  The reader selected for the previous file with the same directory and stem is tried
+  first; otherwise, the candidates from 'sniff' are tried in turn.
+
+  Args:
+    file_name: str
+    names: list | None = None
+      Registered readers to choose from; all by default.
+    **kwargs
+      Passed to the reader.
+
+  Returns:
+    The reader instance after a successful 'is_compatible' call or None.
+  """
+  _load_plugins()
+  family = _get_family(file_name)
+  cached = _decisions.get(family)
+  tried = set()
+  if cached is not None and (names is None or cached in names) and cached in _readers:
+    reader = _readers[cached]["reader"](file_name=file_name, **kwargs)
+    if reader.is_compatible():
+      return reader
+    # end
+    tried.add(cached)
+  # end
+  for name in sniff(file_name, names):
+    if name in tried:
+      continue
+    # end
+    reader = _readers[name]["reader"](file_name=file_name, **kwargs)
+    if reader.is_compatible():
+      _decisions[family] = name
+      return reader
+    # end
+  # end
+  return None
+
+
+register_reader("gkyl", GkylReader, magic=(b"gkyl0",), extensions=(".gkyl",))
+register_reader("adios", GkylAdiosReader, extensions=(".bp",), directory=True)
+register_reader("h5", GkylH5Reader,
+    magic=tuple((off, _hdf5_signature) for off in (0, 512, 1024, 2048)),
+    extensions=(".h5", ".hdf5"))
+register_reader("flash", FlashH5Reader,
+    magic=tuple((off, _hdf5_signature) for off in (0, 512, 1024, 2048)))
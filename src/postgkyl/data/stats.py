@@ -0,0 +1,341 @@
+"""Module including the sidecar index of per-frame statistics.
+
+The statistics (per-component minimum, maximum, mean, RMS, L2 norm, number of NaNs,
+and the positions of the extremes) are computed once and stored in a hidden JSON file
+next to the frames. Global ranges and the extremes reported by 'info' are then available
+without reading the payloads. The entries are keyed by the file name and invalidated
+when the modification time or the size of the file changes.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
+
+import numpy as np
+
+from postgkyl.data.matrix_cache import get_cache_root
+
+# Bump when the structure of the entries changes
+_INDEX_VERSION = 2
+
+# Size of the blocks reduced at once; small enough to stay in the cache
+_block_bytes = 2**20
+
+_indices = {}
+_indices_lock = threading.Lock()  # the indices are shared by the loading threads
+
+
+def _block_stats(v: np.ndarray) -> tuple:
+  # Statistics of one (num_cells, num_comps) block; the block fits into the cache, so the
+  # reductions below read the values from the main memory only once
+  comps = np.arange(v.shape[1])
+  # Sums are accumulated in double precision; casting the block once is cheaper than
+  # casting inside each reduction. Complex values keep the imaginary part and are
+  # ordered like in NumPy (by the real part first).
+  acc_type = np.complex128 if v.dtype.kind == "c" else np.float64
+  w = v if v.dtype == acc_type else v.astype(acc_type)
+  acc_sum = np.einsum("ij->j", w)
+  nan_count = np.zeros(v.shape[1], dtype=np.int64)
+  v_min, v_max = v, v
+  # NaNs propagate into the sum, so the mask is only needed when the sum is not finite
+  if not np.isfinite(acc_sum).all():
+    nan = np.isnan(v)
+    nan_count = nan.sum(axis=0)
+    if nan_count.any():
+      v_min = np.where(nan, np.inf, v)
+      v_max = np.where(nan, -np.inf, v)
+      w = np.where(nan, 0.0, w)
+      acc_sum = np.einsum("ij->j", w)
+    # end
+  # end
+  if acc_type is np.complex128:
+    acc_sq = np.einsum("ij,ij->j", w.real, w.real) + np.einsum("ij,ij->j", w.imag, w.imag)
+  else:
+    acc_sq = np.einsum("ij,ij->j", w, w)
+  # end
+  i_min = v_min.argmin(axis=0)
+  i_max = v_max.argmax(axis=0)
+  return (v_min[i_min, comps], i_min, v_max[i_max, comps], i_max, acc_sum, acc_sq,
+      nan_count, v.shape[0])
+
+
+def _split_blocks(values: np.ndarray, block_bytes: int) -> list:
+  v = values.reshape(-1, values.shape[-1])
+  step = max(block_bytes // max(v.shape[1]*v.itemsize, 1), 1)
+  return [v[i : i + step] for i in range(0, v.shape[0], step)]
+
+
+def compute_stats(slabs: Iterable[np.ndarray], workers: int | None = None,
+    block_bytes: int = _block_bytes) -> dict | None:
+  """Computes the per-component statistics in a single pass over the slabs.
+
+  Each slab is split into cache-sized blocks which are reduced concurrently; all the
+  statistics of a block are computed while it is in the cache.
+
+  Args:
+    slabs: Iterable[np.ndarray]
+      Values split along the first axis (e.g., from 'GData.iter_slabs'); the last axis
+      indexes the components.
+    workers: int | None = None
+      Number of threads; by default, the number of CPUs (at most 8).
+    block_bytes: int
+      Size of the blocks.
+
+  Returns:
+    Dictionary with the lists 'min', 'max', 'mean', 'rms', 'l2', 'nan_count', 'argmin',
+    and 'argmax' (one entry per component) and the 'shape' of the values. The
+    positions of the extremes are flat (C-order) cell indices; the first occurrence is
+    kept and components with only NaNs have NaN extremes and the index -1. None is
+    returned when there are no slabs. For complex values, the extremes and the mean are
+    complex (ordered by the real part first like in NumPy) and the RMS and L2 norm use
+    the magnitudes.
+  """
+  if workers is None:
+    workers = min(os.cpu_count() or 1, 8)
+  # end
+  shape = None
+  offset = 0
+  with ThreadPoolExecutor(max_workers=max(workers, 1)) as executor:
+    for values in slabs:
+      num_comps = values.shape[-1]
+      if shape is None:
+        shape = list(values.shape)
+        acc_type = np.complex128 if values.dtype.kind == "c" else np.float64
+        acc_min = np.full(num_comps, np.inf, dtype=acc_type)
+        acc_max = np.full(num_comps, -np.inf, dtype=acc_type)
+        arg_min = np.full(num_comps, -1, dtype=np.int64)
+        arg_max = np.full(num_comps, -1, dtype=np.int64)
+        acc_sum = np.zeros(num_comps, dtype=acc_type)
+        acc_sq = np.zeros(num_comps)
+        nan_count = np.zeros(num_comps, dtype=np.int64)
+      else:
+        shape[0] += values.shape[0]
+      # end
+      blocks = _split_blocks(values, block_bytes)
+      if workers > 1 and len(blocks) > 1:
+        results = executor.map(_block_stats, blocks)
+      else:
+        results = map(_block_stats, blocks)
+      # end
+      # Blocks are merged in the C-order, so only a strictly better value replaces the
+      # previous one and the first occurrence is kept like in NumPy
+      for s_min, i_min, s_max, i_max, s_sum, s_sq, s_nan, num in results:
+        found = s_nan < num
+        upd = found & ((arg_min < 0) | (s_min < acc_min))
+        acc_min[upd] = s_min[upd]
+        arg_min[upd] = i_min[upd] + offset
+        upd = found & ((arg_max < 0) | (s_max > acc_max))
+        acc_max[upd] = s_max[upd]
+        arg_max[upd] = i_max[upd] + offset
+        acc_sum += s_sum
+        acc_sq += s_sq
+        nan_count += s_nan
+        offset += num
+      # end
+    # end
+  # end
+  if shape is None:
+    return None
+  # end
+  count = offset - nan_count
+  found = count > 0
+  with np.errstate(invalid="ignore", divide="ignore"):
+    mean = np.where(found, acc_sum / count, np.nan)
+    rms = np.where(found, np.sqrt(acc_sq / count), np.nan)
+  # end
+  return {
+    "shape": [int(s) for s in shape],
+    "min": np.where(found, acc_min, np.nan).tolist(),
+    "max": np.where(found, acc_max, np.nan).tolist(),
+    "mean": mean.tolist(),
+    "rms": rms.tolist(),
+    "l2": np.sqrt(acc_sq).tolist(),
+    "nan_count": nan_count.tolist(),
+    "argmin": arg_min.tolist(),
+    "argmax": arg_max.tolist(),
+  }
+
+
+def get_extremes(stats: dict) -> tuple:
+  """Returns the global extremes from the per-component statistics.
+
+  Returns:
+    Tuple (maximum, max_idx, minimum, min_idx) where the indices are the cell indices
+    followed by the component; same as the position returned by 'np.nanargmax' on the
+    values.
+  """
+  cells = stats["shape"][:-1]
+  num_comps = stats["shape"][-1]
+  out = []
+  for key, arg_key, better in (("max", "argmax", np.greater), ("min", "argmin", np.less)):
+    best, best_flat = None, None
+    for c in range(num_comps):
+      idx = stats[arg_key][c]
+      if idx < 0:
+        continue
+      # end
+      val = stats[key][c]
+      # The first occurrence in the C-order of the values (cells, components) is kept
+      flat = idx*num_comps + c
+      if best is None or better(val, best) or (val == best and flat < best_flat):
+        best, best_flat = val, flat
+      # end
+    # end
+    if best is None:
+      raise ValueError("All-NaN slice encountered")
+    # end
+    cell_idx = np.unravel_index(best_flat // num_comps, cells) if cells else ()
+    out.append(np.complex128(best) if isinstance(best, complex) else np.float64(best))
+    out.append(tuple(int(i) for i in cell_idx) + (int(best_flat % num_comps),))
+  # end
+  return tuple(out)
+
+
+class StatsIndex(object):
+  """Sidecar index with the statistics of the frames in a directory.
+
+  The index is stored in the directory as a hidden JSON file; when the directory is
+  not writable, it is stored in the Postgkyl cache directory (see
+  'matrix_cache.get_cache_root') instead.
+  """
+
+  index_name = ".pgkyl_stats.json"
+
+  def __init__(self, directory: str = "."):
+    """Initialize the index.
+
+    Args:
+      directory: str = "."
+        Directory with the frames.
+    """
+    self.directory = directory or "."
+    self.entries = {}
+    self._index_mtime = None
+    self._modified = False
+    self.read()
+
+  def _get_index_paths(self) -> list:
+    # The directory first, the cache as the fallback
+    key = hashlib.sha1(os.path.realpath(self.directory).encode()).hexdigest()[:16]
+    return [os.path.join(self.directory, self.index_name),
+        os.path.join(get_cache_root(), "stats", f"{key:s}.json")]
+
+  def _get_index_mtime(self) -> tuple:
+    out = []
+    for path in self._get_index_paths():
+      try:
+        out.append(os.stat(path).st_mtime_ns)
+      except OSError:
+        out.append(None)
+      # end
+    # end
+    return tuple(out)
+
+  def read(self) -> None:
+    """(Re)reads the stored index."""
+    self.entries = {}
+    self._index_mtime = self._get_index_mtime()
+    for path in self._get_index_paths()[::-1]:
+      try:
+        with open(path, "r") as fh:
+          index = json.load(fh)
+        # end
+      except (OSError, ValueError):
+        continue
+      # end
+      if isinstance(index, dict) and index.get("version") == _INDEX_VERSION:
+        self.entries.update(index.get("entries", {}))
+      # end
+    # end
+    self._modified = False
+
+  def refresh(self) -> None:
+    """Rereads the index if it was modified by another process."""
+    if not self._modified and self._get_index_mtime() != self._index_mtime:
+      self.read()
+    # end
+
+  def get(self, file_name: str) -> dict | None:
+    """Returns the statistics of the file or None if they are missing or outdated."""
+    entry = self.entries.get(os.path.basename(file_name))
+    if entry is None:
+      return None
+    # end
+    try:
+      stat = os.stat(file_name)
+    except OSError:
+      return None
+    # end
+    if entry["mtime_ns"] != stat.st_mtime_ns or entry["size"] != stat.st_size:
+      return None
+    # end
+    return entry["stats"]
+
+  def set(self, file_name: str, stats: dict) -> None:
+    """Stores the statistics of the file; 'save' writes the index."""
+    stat = os.stat(file_name)
+    self.entries[os.path.basename(file_name)] = {"mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size, "stats": stats}
+    self._modified = True
+
+  def save(self) -> bool:
+    """Writes the index.
+
+    The index is written into a temporary file first and renamed; failing to write is
+    not fatal.
+
+    Returns:
+      True if the index was written.
+    """
+    for path in self._get_index_paths():
+      try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+      except OSError:
+        continue
+      # end
+      try:
+        with os.fdopen(fd, "w") as fh:
+          json.dump({"version": _INDEX_VERSION, "entries": self.entries}, fh)
+        # end
+        os.replace(tmp_name, path)
+      except (OSError, TypeError, ValueError):
+        # No partial files are left behind
+        os.unlink(tmp_name)
+        continue
+      # end
+      self._index_mtime = self._get_index_mtime()
+      self._modified = False
+      return True
+    # end
+    return False
+
+
+def get_index(file_name: str) -> StatsIndex:
+  """Returns the (shared) statistics index of the directory of the file."""
+  directory = os.path.dirname(file_name) or "."
+  key = os.path.realpath(directory)
+  with _indices_lock:
+    if key not in _indices:
+      _indices[key] = StatsIndex(directory)
+    else:
+      _indices[key].refresh()
+    # end
+    return _indices[key]
+  # end
+
+
+def save_indices() -> None:
+  """Writes all the shared indices with new statistics."""
+  with _indices_lock:
+    indices = list(_indices.values())
+  # end
+  for index in indices:
+    if index._modified:
+      index.save()
+    # end
+  # end
@@ -12,10 +12,19 @@ import time
 
 from postgkyl import __version__
 from postgkyl.commands import DataSpace
+from postgkyl.commands.data_space import parse_memory_size
 from postgkyl.utils import load_style, verb_print
 import postgkyl.commands as cmd
 
 
+def _parse_max_memory(ctx, param, value):
+  try:
+    return parse_memory_size(value)
+  except ValueError as e:
+    raise click.BadParameter(str(e))
+  # end
+
+
 def _print_version(ctx, param, value):
   if not value or ctx.resilient_parsing:
     return
@@ -61,6 +70,21 @@ class PgkylCommandGroup(click.Group):
 
     ctx.fail(f"'{cmd_name}' does not match either command name nor a data file")
 
+  def resolve_command(self, ctx, args):
+    cmd_name, cmd, args = click.Group.resolve_command(self, ctx, args)
+    # The whole chain is resolved before the commands are invoked; a header-only 'info'
+    # does not need the values, so the files are loaded lazily. The arguments are
+    # parsed the same way as the chain does, so the options of the following commands
+    # are not considered.
+    if cmd is not None and cmd.name == "info":
+      sub_ctx = cmd.make_context(cmd_name, list(args), parent=ctx, resilient_parsing=True,
+          allow_extra_args=True, allow_interspersed_args=False)
+      if sub_ctx.params.get("header_only"):
+        ctx.obj["header_only"] = True
+      # end
+    # end
+    return cmd_name, cmd, args
+
 
 # The command line mode entry command
 @click.command(name="pgkyl", cls=PgkylCommandGroup, chain=True,
@@ -84,6 +108,11 @@ class PgkylCommandGroup(click.Group):
 @click.option("--c2p", help="Specify the file name containing c2p mapped coordinates")
 @click.option("--c2p-vel", "c2p_vel",
     help="Specify the file name containing c2p mapped velocity coordinates")
+@click.option("--jobs", "-j", type=click.INT, help="Number of files to load concurrently.")
+@click.option("--max-memory", "max_memory", callback=_parse_max_memory,
+    help="Memory budget for the loaded values, e.g., '4G'; the least recently used are evicted.")
+@click.option("--dtype", type=click.Choice(["float32", "float64"]),
+    help="Convert the loaded values, e.g., 'float32' for a quick look at half the memory.")
 @click.option("--style", help="Sets Maplotlib rcParams style file.")
 @click.pass_context
 def cli(ctx, **kwargs):
@@ -116,7 +145,7 @@ def cli(ctx, **kwargs):
   ctx.obj["in_data_strings"] = []
   ctx.obj["in_data_strings_loaded"] = 0
 
-  ctx.obj["data"] = DataSpace()
+  ctx.obj["data"] = DataSpace(max_memory=kwargs["max_memory"])
 
   ctx.obj["fig"] = ""
   ctx.obj["ax"] = ""
@@ -127,6 +156,8 @@ def cli(ctx, **kwargs):
       kwargs["z3"], kwargs["z4"], kwargs["z5"], kwargs["component"])
   ctx.obj["global_c2p"] = kwargs["c2p"]
   ctx.obj["global_c2p_vel"] = kwargs["c2p_vel"]
+  ctx.obj["global_jobs"] = kwargs["jobs"]
+  ctx.obj["global_dtype"] = kwargs["dtype"]
 
   ctx.obj["rcParams"] = {}
   fn = kwargs["style"] if kwargs["style"] else f"{os.path.dirname(os.path.realpath(__file__))}/output/postgkyl.mplstyle"
@@ -138,6 +169,7 @@ cli.add_command(cmd.activate)
 cli.add_command(cmd.agyro)
 cli.add_command(cmd.mom_agyro)
 cli.add_command(cmd.animate)
+cli.add_command(cmd.cache)
 cli.add_command(cmd.collect)
 cli.add_command(cmd.current)
 cli.add_command(cmd.deactivate)
@@ -166,6 +198,7 @@ cli.add_command(cmd.plot)
 cli.add_command(cmd.pr)
 cli.add_command(cmd.relchange)
 cli.add_command(cmd.select)
+cli.add_command(cmd.stats)
 cli.add_command(cmd.style)
 cli.add_command(cmd.tenmoment)
 cli.add_command(cmd.trajectory)
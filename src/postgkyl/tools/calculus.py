@@ -10,8 +10,74 @@ if TYPE_CHECKING:
 # end
 
 
+def _integrate_block(grid: list, values: np.ndarray, axis: tuple) -> Tuple[list, np.ndarray]:
+  # Get dz elements
+  dz = []
+  for d, coord in enumerate(grid):
+    dz.append(coord[1:] - coord[:-1])
+    if len(coord) > 1 and len(coord) == values.shape[d]:
+      dz[-1] = np.append(dz[-1], dz[-1][-1])
+    # end
+  # end
+
+  # Integration assuming values are cell centered averages
+  # Should work for nonuniform meshes
+  for ax in sorted(axis, reverse=True):
+    if len(grid[ax]) > 1:
+      values = np.moveaxis(values, ax, -1)
+      values = np.dot(values, dz[ax])
+    else:
+      values = values.mean(axis=ax)
+    # end
+  # end
+
+  for ax in sorted(axis):
+    grid[ax] = np.array([grid[ax].mean()])
+    values = np.expand_dims(values, ax)
+  # end
+  return grid, values
+
+
+def reduce_slabs(slabs, func, axis: tuple) -> Tuple[list, np.ndarray]:
+  """Applies a reduction to the slabs of a dataset and combines the results.
+
+  Args:
+    slabs: iterable
+      Pairs of grid and values split along the first axis, e.g., from
+      'GData.iter_slabs'.
+    func: callable
+      Takes the grid and values of a slab and returns the reduced grid and values;
+      the reduced axes are kept with the length of one.
+    axis: tuple
+      Reduced axes; the slab results are summed when the first axis is reduced and
+      concatenated otherwise.
+
+  Returns:
+    The grid and values; the first coordinate of the grid is the coordinate joined
+    from the slabs.
+  """
+  coords, parts = [], []
+  out_grid = None
+  for grid, values in slabs:
+    nodal = len(grid[0]) == values.shape[0] + 1
+    coords.append(grid[0][:-1] if nodal else grid[0])
+    last = grid[0][-1:] if nodal else grid[0][:0]
+    out_grid, out_values = func(list(grid), values)
+    if 0 in axis and parts:
+      parts[0] = parts[0] + out_values
+    else:
+      parts.append(out_values)
+    # end
+  # end
+  if out_grid is None:
+    raise ValueError("The dataset does not contain any values")
+  # end
+  out_grid[0] = np.concatenate(coords + [last])
+  return out_grid, np.concatenate(parts, axis=0)
+
+
 def integrate(data: GData, axis: int | tuple | str,
-    overwrite=False, stack=False) -> Tuple[list, np.ndarray]:
+    overwrite=False, stack=False, max_bytes: int | None = None) -> Tuple[list, np.ndarray]:
   """Integrates Gkeyll data.
 
   Currently simply uses the NumPy dot function. True, DG integration should be
@@ -21,6 +87,9 @@ def integrate(data: GData, axis: int | tuple | str,
     data: GData
     axis: int, tuple or str
       Specify axis to integrate over
+    max_bytes: int | None = None
+      Integrate slab by slab (see 'GData.iter_slabs'); when the values are not
+      loaded, the whole dataset is never held in memory.
 
     XXX overwrite and stack need refactoring; see laguerre_compose.py
   """
@@ -28,8 +97,6 @@ def integrate(data: GData, axis: int | tuple | str,
     overwrite = stack
     print("Deprecation warning: The 'stack' parameter is going to be replaced with 'overwrite'")
   # end
-  grid = list(data.grid)
-  values = np.copy(data.values)
 
   # Convert Python input to an input Numpy understands
   if axis is not None:
@@ -59,29 +126,14 @@ def integrate(data: GData, axis: int | tuple | str,
     axis = tuple(range(num_dims))
   # end
 
-  # Get dz elements
-  dz = []
-  for d, coord in enumerate(grid):
-    dz.append(coord[1:] - coord[:-1])
-    if len(coord) > 1 and len(coord) == values.shape[d]:
-      dz[-1] = np.append(dz[-1], dz[-1][-1])
+  if max_bytes:
+    grid, values = reduce_slabs(data.iter_slabs(max_bytes=max_bytes),
+        lambda g, v: _integrate_block(g, v, axis), axis)
+    if 0 in axis:
+      grid[0] = np.array([grid[0].mean()])
     # end
-  # end
-
-  # Integration assuming values are cell centered averages
-  # Should work for nonuniform meshes
-  for ax in sorted(axis, reverse=True):
-    if len(grid[ax]) > 1:
-      values = np.moveaxis(values, ax, -1)
-      values = np.dot(values, dz[ax])
-    else:
-      values = values.mean(axis=ax)
-    # end
-  # end
-
-  for ax in sorted(axis):
-    grid[ax] = np.array([grid[ax].mean()])
-    values = np.expand_dims(values, ax)
+  else:
+    grid, values = _integrate_block(list(data.grid), data.values, axis)
   # end
 
   if overwrite:
@@ -1,6 +1,8 @@
 import numpy as np
 import click
 
+from postgkyl.data.catalog import parse_file_name
+
 #sets frame in block ctx attribute using block file name
 def set_frame(ctx: click.core.Context) -> list:
   """Utility function which sets data ctx frames in multiblock data situations
@@ -25,6 +27,17 @@ def set_frame(ctx: click.core.Context) -> list:
   #load in file names
   files = [dat._file_name for dat in data.iterator()]
 
+  #the frame numbers are parsed from the default gkyl file names
+  frame_list = [parse_file_name(f)["frame"] for f in files]
+  if None not in frame_list:
+    for i, dat in data.iterator(enum=True):
+      dat.ctx["frame"] = frame_list[i]
+    #end
+    data.reindex()
+    return np.unique(np.sort(frame_list))
+  #end
+
+  #fall back to comparing the file names when the names are not the default ones
   #iterate through file names and find smallest index where file names differ, this is where the file name is
   #this is assuming that the file names are default from gkyl
   #short file is used to iterate in order to prevent indexing error
@@ -51,6 +64,7 @@ def set_frame(ctx: click.core.Context) -> list:
   for i, dat in data.iterator(enum=True):
     dat.ctx["frame"] = frame_list[i]
   #end
+  data.reindex()
 
   #return sorted frame list for use in animate function
   sorted_frame_list = np.unique(np.sort(frame_list))
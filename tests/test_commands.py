@@ -1,13 +1,18 @@
 """Postgkyl module for testing click commands."""
 import click
+from click.testing import CliRunner
 import importlib.util
+import json
 import matplotlib.pyplot as plt
 import numpy as np
 import os
 import pytest
+import shutil
 import subprocess
 
 import postgkyl.commands as cmd
+from postgkyl.data import GData
+from postgkyl.data import Catalog as pg_catalog
 from postgkyl.pgkyl import cli
 
 class TestCommands:
@@ -59,6 +64,67 @@ class TestCommands:
     np.testing.assert_array_equal(num_cells, (64, 32))
 
 
+  def test_info_header_only(self):
+    files = [f"{self.dir_path:s}/twostream-f-p2.gkyl", f"{self.dir_path:s}/hll-euler.gkyl"]
+    result = CliRunner().invoke(cli, files + ["info", "--header-only", "--json", "-j", "2"])
+    assert result.exit_code == 0
+    headers = [json.loads(line) for line in result.output.splitlines()]
+    assert [h["index"] for h in headers] == [0, 1]
+    assert headers[1]["cells"] == [50, 50] and headers[1]["dtype"] == "float64"
+    assert "maximum" not in headers[0]
+    data = GData(files[0], load=False)
+    assert "Maximum" not in data.info(header_only=True)
+    assert not data.is_loaded()
+
+
+  def test_info_header_only_args(self):  # Only the options of 'info' itself count
+    for args, header_only in ((["info", "--header-only", "plot"], True),
+        (["info", "--json", "plot", "--header-only"], False),
+        (["info", "-u", "--header-only"], False)):
+      ctx = click.core.Context(cli, obj={})
+      cli.resolve_command(ctx, args)
+      assert ctx.obj.get("header_only", False) == header_only
+    # end
+
+
+  def test_load_wildcard(self, tmp_path):  # Any readable files in the natural order
+    for i in (1, 2, 10):
+      shutil.copy(f"{self.dir_path:s}/hll-euler.gkyl", tmp_path / f"euler_{i:d}.dat")
+    # end
+    result = CliRunner().invoke(cli, [str(tmp_path / "euler_*.dat"), "info", "--json"])
+    assert result.exit_code == 0
+    names = [json.loads(line)["file_name"] for line in result.output.splitlines()]
+    assert [os.path.basename(fn) for fn in names] == ["euler_1.dat", "euler_2.dat", "euler_10.dat"]
+    result = CliRunner().invoke(cli, [str(tmp_path / "euler_*.dat"), "--frames", "2:",
+        "info", "--json", "--header-only"])
+    assert result.exit_code == 0 and len(result.output.splitlines()) == 2
+    # The catalog is stored only on request
+    assert not os.path.exists(tmp_path / pg_catalog.index_name)
+
+
+  def test_listoutputs(self, tmp_path, monkeypatch):  # Any requested extensions
+    for fn in ("a_0.h5", "a_1.h5", "b_0.gkyl", "c_0.dat"):
+      (tmp_path / fn).write_bytes(b"")
+    # end
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(cli, ["listoutputs", "-e", "h5,gkyl"])
+    assert result.exit_code == 0
+    assert result.output.splitlines() == ["h5:", "- a", "gkyl:", "- b"]
+
+
+  def test_set_frame_fallback(self, tmp_path):  # Frames of non-default file names
+    from postgkyl.utils import set_frame
+    ctx = click.core.Context(cli)
+    ctx.obj = {"data": cmd.DataSpace()}
+    for i in (2, 0, 1):
+      shutil.copy(f"{self.dir_path:s}/hll-euler.gkyl", tmp_path / f"runA{i:d}.gkyl")
+      ctx.obj["data"].add(GData(str(tmp_path / f"runA{i:d}.gkyl"), load=False))
+    # end
+    assert list(ctx.obj["data"].get_frame(1)) == list(ctx.obj["data"].iterator())
+    assert list(set_frame(ctx)) == [0, 1, 2]
+    assert [dat.ctx["frame"] for dat in ctx.obj["data"].get_frame(1)] == [1]
+
+
   def test_ev_gkyl(self):
     # Check baseline addition
     self.ctx.invoke(cmd.load)
@@ -102,6 +168,25 @@ class TestCommands:
     np.testing.assert_approx_equal(np.max(values1), 3.3520293)
 
 
+  def test_ev_stream(self):
+    # Reductions of datasets which are not loaded under the memory budget
+    space = self.ctx.obj["data"]
+    self.ctx.obj["data"] = cmd.DataSpace(max_memory=2**16)
+    self.ctx.invoke(cmd.load)
+    dat = self.ctx.obj["data"].get_dataset(0)
+    ref = cmd.ev_cmd.average([None, dat.get_grid()], [np.array(1.0), dat.get_values()])[1][0]
+    ref_max = np.max(dat.get_values())
+    dat.evict()
+    self.ctx.invoke(cmd.ev, chain="f[0] 1 avg")
+    values = dat.get_values()
+    self.ctx.invoke(cmd.load)
+    self.ctx.invoke(cmd.ev, chain="f[1] max")
+    max_values = self.ctx.obj["data"].get_dataset(1).get_values()
+    self.ctx.obj["data"] = space
+    self.ctx.obj["in_data_strings_loaded"] = 0
+    np.testing.assert_allclose(values, ref)
+    np.testing.assert_approx_equal(max_values[0], ref_max)
+
   @pytest.mark.skipif(adios_missing, reason="ADIOS2 is not installed")
   def test_ev_adios(self):
     # Check metadata
@@ -27,6 +27,15 @@ class TestGkylInterpolate:
     np.testing.assert_array_equal(values.shape, (192, 96, 1))
     np.testing.assert_approx_equal(values.mean(), 0.08337313364405809)
 
+  def test_ser_p2_float32(self):  # Single precision is preserved
+    ref = pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl")
+    data = pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl", dtype="float32")
+    assert data.values.dtype == np.float32
+    _, values = pg.GInterpModal(data).interpolate()
+    _, ref_values = pg.GInterpModal(ref).interpolate()
+    assert values.dtype == np.float32
+    np.testing.assert_allclose(values, ref_values, rtol=1e-4, atol=1e-6)
+
   def test_ser_p1_i(self):
     data = pg.GData(f"{self.dir_path:s}/shock-f-ser-p1.gkyl")
     dg = pg.GInterpModal(data, poly_order=1, basis_type='ms', num_interp=3)
@@ -60,6 +69,20 @@ class TestGkylInterpolate:
     np.testing.assert_array_equal(values.shape, (16, 16, 1))
     np.testing.assert_approx_equal(values.mean(), 0.5)
 
+  def test_ser_p1_c2p_cut(self):  # Cut and full mapped grids are cached separately
+    file_name = f"{self.dir_path:s}/shock-f-ser-p1.gkyl"
+    c2p_name = f"{self.dir_path:s}/shock-rtheta-ser.gkyl"
+    full = pg.GData(file_name, mapc2p_name=c2p_name)
+    data = pg.GData(file_name, mapc2p_name=c2p_name, z0="2:5")
+    np.testing.assert_array_equal(data.grid[0], full.grid[0][2:5])
+    full_grid, _ = pg.GInterpModal(full, poly_order=1, basis_type="ms").interpolate()
+    grid, values = pg.GInterpModal(data, poly_order=1, basis_type="ms").interpolate()
+    np.testing.assert_array_equal(values.shape, (6, 16, 1))
+    np.testing.assert_allclose(grid[0], full_grid[0][4:11], atol=1e-12)
+    again, _ = pg.GInterpModal(pg.GData(file_name, mapc2p_name=c2p_name, z0="2:5"),
+        poly_order=1, basis_type="ms").interpolate()
+    assert again[0] is grid[0]
+
   def test_ten_p1_c2p(self):
     data = pg.GData(f"{self.dir_path:s}/shock-f-ten-p1.gkyl",
         mapc2p_name=f"{self.dir_path:s}/shock-rtheta-ten.gkyl")
@@ -69,3 +92,51 @@ class TestGkylInterpolate:
     np.testing.assert_equal(len(grid[1]), 17)
     np.testing.assert_array_equal(values.shape, (16, 16, 1))
     np.testing.assert_approx_equal(values.mean(), 0.5)
+
+  def test_ser_p1_comps(self):
+    data = pg.GData(f"{self.dir_path:s}/shock-f-ser-p1.gkyl")
+    values = data.get_values()
+    data.push(data.get_grid(), np.concatenate((values, 2*values), axis=-1))
+    dg = pg.GInterpModal(data, poly_order=1, basis_type="ms")
+    _, single = dg.interpolate(1)
+    _, values = dg.interpolate((0, 1))
+    np.testing.assert_array_equal(values.shape, (16, 16, 2))
+    np.testing.assert_allclose(values[..., 1], 2*values[..., 0])
+    np.testing.assert_allclose(values[..., 1:], single)
+    _, values = dg.interpolate(slice(1, 2))
+    np.testing.assert_allclose(values, single)
+
+  def test_ser_p1_chunks(self):  # Chunks are written into the same output
+    values = pg.GData(f"{self.dir_path:s}/shock-f-ser-p1.gkyl").get_values()
+    values = np.stack((values, 2*values), axis=-2)
+    c_mat = pg.data.matrix_cache.get_interp_matrix(2, 1, "serendipity", 2)
+    full = pg.data.dg._interpOnMesh(c_mat, values, 2, "ms", comp_axis=True)
+    chunks = pg.data.dg._interpOnMesh(c_mat, values, 2, "ms", chunk_size=3, comp_axis=True)
+    np.testing.assert_array_equal(chunks.shape, (16, 16, 2))
+    np.testing.assert_allclose(chunks, full, atol=1e-12)
+
+  def test_matrix_cache(self, tmp_path, monkeypatch):
+    monkeypatch.setenv("PGKYL_CACHE_DIR", str(tmp_path))
+    pg.data.matrix_cache.clear(disk=False)
+    mat = pg.data.matrix_cache.get_interp_matrix(2, 1, "tensor", 2)
+    cache_dir = pg.data.matrix_cache.get_cache_dir()
+    assert os.listdir(cache_dir) == ["interp_2d_p1_tensor_i2_modal.npz"]
+    assert pg.data.matrix_cache.get_interp_matrix(2, 1, "tensor", 2) is mat
+    pg.data.matrix_cache.clear(disk=False)
+    np.testing.assert_array_equal(pg.data.matrix_cache.get_interp_matrix(2, 1, "tensor", 2), mat)
+    pg.data.matrix_cache.clear()
+    assert os.listdir(cache_dir) == []
+
+  def test_dg_basis(self):
+    symbolic = pg.data.computeInterpolationMatrices.createInterpMatrix
+    for args in [(2, 2, "serendipity", 3, True, False), (3, 1, "gkhybrid", 2, True, True),
+        (2, 3, "tensor", 4, True, False), (3, 2, "maximal-order", 3, True, False),
+        (2, 2, "serendipity", 3, False, False)]:
+      np.testing.assert_allclose(pg.data.dg_basis.create_interp_matrix(*args),
+          symbolic(*args), atol=1e-13)
+    # end
+    symbolic = pg.data.computeDerivativeMatrices.createDerivativeMatrix
+    for args in [(2, 2, "serendipity", 3, True), (2, 1, "serendipity", 2, False)]:
+      np.testing.assert_allclose(pg.data.dg_basis.create_derivative_matrix(*args),
+          symbolic(*args), atol=1e-13)
+    # end
@@ -3,8 +3,11 @@ import importlib.util
 import numpy as np
 import os
 import pytest
+import shutil
+import warnings
 
 import postgkyl as pg
+from postgkyl.commands.data_space import parse_memory_size as parse_size
 
 
 class TestGkyl:
@@ -20,15 +23,59 @@ class TestGkyl:
         z0='16', z1='8:-8', comp='0')
     np.testing.assert_array_equal(data.values.shape, (1, 16, 1))
 
+  def test_gkyl_type1_partial_values(self):  # Partial load matches the full load
+    full = pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl")
+    data = pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl",
+        z0='10:20', z1='24', comp='2:5')
+    np.testing.assert_array_equal(data.values, full.values[10:20, 24:25, 2:5])
+
   def test_gkyl_type1_c2p(self):  # Frame with coordinate mapping
     data = pg.GData(f"{self.dir_path:s}/shock-f-ser-p1.gkyl",
         mapc2p_name=f"{self.dir_path:s}/shock-rtheta-ser.gkyl")
     np.testing.assert_array_equal(data.num_cells, (8, 8))
 
+  def test_gkyl_type1_mmap(self):  # Memory-mapped frame
+    data = pg.GData(f"{self.dir_path:s}/shock-f-ser-p1.gkyl", mmap=True)
+    ref = pg.GData(f"{self.dir_path:s}/shock-f-ser-p1.gkyl")
+    assert isinstance(data.values, np.memmap)
+    assert not data.values.flags.writeable
+    np.testing.assert_array_equal(data.values, ref.values)
+
+  def test_gkyl_type1_c2p_cached(self):  # Coordinate mapping is read only once
+    data0 = pg.GData(f"{self.dir_path:s}/shock-f-ser-p1.gkyl",
+        mapc2p_name=f"{self.dir_path:s}/shock-rtheta-ser.gkyl")
+    data1 = pg.GData(f"{self.dir_path:s}/shock-f-ser-p1.gkyl",
+        mapc2p_name=f"{self.dir_path:s}/shock-rtheta-ser.gkyl")
+    assert data0.grid[0] is data1.grid[0]
+    assert not data0.grid[0].flags.writeable
+
   def test_gkyl_type2(self):  # Dynvector
     data = pg.GData(f"{self.dir_path:s}/twostream-field-energy.gkyl")
     np.testing.assert_array_equal(data.num_cells, (6113,))
 
+  def test_gkyl_type2_partial(self):  # Dynvector time window
+    full = pg.GData(f"{self.dir_path:s}/twostream-field-energy.gkyl")
+    data = pg.GData(f"{self.dir_path:s}/twostream-field-energy.gkyl",
+        z0='3000:4000', comp=1)
+    np.testing.assert_array_equal(data.values, full.values[3000:4000, 1:2])
+    np.testing.assert_array_equal(data.grid[0], full.grid[0][3000:4000])
+
+  def test_gkyl_type2_partial_edges(self):  # Dynvector time window at the edges
+    file_name = f"{self.dir_path:s}/twostream-field-energy.gkyl"
+    full = pg.GData(file_name)
+    for z0 in ("1e9", 1e9):  # Times past the end select the last record
+      data = pg.GData(file_name, z0=z0)
+      np.testing.assert_array_equal(data.values, full.values[-1:])
+      np.testing.assert_array_equal(data.grid[0], full.grid[0][-1:])
+    # end
+    data = pg.GData(file_name, z0="6112:")
+    np.testing.assert_array_equal(data.values, full.values[-1:])
+    for z0 in ("5:5", "100.0:200.0"):
+      with pytest.raises(ValueError, match="does not include any records"):
+        pg.GData(file_name, z0=z0)
+      # end
+    # end
+
   def test_gkyl_type3(self):  # Frame with distributed memory
     data = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl")
     np.testing.assert_array_equal(data.num_cells, (50, 50))
@@ -38,6 +85,27 @@ class TestGkyl:
         z0=30, z1='30:-5', comp=0)
     np.testing.assert_array_equal(data.values.shape, (1, 15, 1))
 
+  def test_gkyl_type3_partial_values(self):  # Partial load matches the full load
+    full = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl")
+    data = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl", z0='5:45', z1=':-5', comp='1:3')
+    np.testing.assert_array_equal(data.values, full.values[5:45, :-5, 1:3])
+
+  def test_gkyl_type3_range_table(self):  # Ranges are indexed once and reused
+    full = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl")
+    data = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl", z0='10', z1='20:30', load=False)
+    np.testing.assert_array_equal(data.values, full.values[10:11, 20:30])
+    table = data._reader.range_table
+    np.testing.assert_array_equal(table[:, :4], [[1, 1, 25, 25], [1, 26, 25, 50],
+        [26, 1, 50, 25], [26, 26, 50, 50]])
+    data.evict()
+    np.testing.assert_array_equal(data.values, full.values[10:11, 20:30])
+    assert data._reader.range_table is table
+
+  def test_gkyl_type3_mmap(self):  # Memory-mapped frame with distributed memory
+    data = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl", mmap=True)
+    ref = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl")
+    np.testing.assert_array_equal(data.values, ref.values)
+
   def test_gkyl_meta(self):  # Frame with msgpack meta data included
     data = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl")
     np.testing.assert_equal(data.ctx["frame"], 1)
@@ -49,6 +117,404 @@ class TestGkyl:
     dg.interpolate(overwrite=True)
     np.testing.assert_approx_equal(data.bounds[0][1], -1.060964e07)
     np.testing.assert_approx_equal(data.bounds[1][2], 1.206345e-16)
+
+  def test_gkyl_load_many(self):  # Concurrent loading keeps the order
+    files = [f"{self.dir_path:s}/shock-f-ser-p1.gkyl", f"{self.dir_path:s}/hll-euler.gkyl"]
+    data = pg.GData.load_many(files, workers=2, comp=0)
+    np.testing.assert_array_equal(data[0].num_cells, (8, 8))
+    np.testing.assert_array_equal(data[1].values.shape, (50, 50, 1))
+
+  def test_gkyl_load_many_prompt(self, tmp_path):  # Prompts are left to the main thread
+    import threading
+    prompts = []
+
+    class PromptReader(object):
+      def __init__(self, file_name, ctx=None, click_mode=False, **kwargs):
+        self.file_name, self.ctx, self.click_mode = file_name, ctx, click_mode
+      def is_compatible(self):
+        return True
+      def preload(self):
+        pass
+      def load(self):
+        if threading.current_thread() is not threading.main_thread():
+          raise ValueError("Could not find the variable")
+        # end
+        prompts.append(self.file_name)
+        return [np.arange(3.0)], np.ones((2, 1))
+    # end
+
+    files = [str(tmp_path / f"frame_{i:d}.txt") for i in range(3)]
+    for fn in files:
+      with open(fn, "wb") as fh:
+        fh.write(b"#prompt\n")
+      # end
+    # end
+    registry = pg.data.reader_registry
+    registry.register_reader("prompt", PromptReader, magic=(b"#prompt",))
+    try:
+      data = pg.GData.load_many(files, workers=3, click_mode=True, reader_name="prompt")
+      assert [dat._file_name for dat in data] == files and prompts == files
+      with pytest.raises(ValueError):
+        pg.GData.load_many(files, workers=3, reader_name="prompt")
+      # end
+    finally:
+      del registry._readers["prompt"]
+    # end
+
+  def test_gkyl_lazy(self):  # Values are read on the first access and after eviction
+    ref = pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl")
+    data = pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl", load=False)
+    assert not data.is_loaded()
+    np.testing.assert_array_equal(data.values, ref.values)
+    assert data.evict() == ref.values.nbytes and not data.is_loaded()
+    np.testing.assert_array_equal(data.values, ref.values)
+
+  def test_gkyl_evict_modified(self, tmp_path):  # In-place changes are spilled
+    ref = pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl")
+    data = pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl", load=False)
+    data.get_values()[...] *= 2.0
+    assert data.evict() == 0 and data.is_loaded()  # nowhere to spill
+    assert data.evict(str(tmp_path)) == ref.values.nbytes and not data.is_loaded()
+    np.testing.assert_array_equal(data.values, 2.0 * ref.values)
+
+  def test_gkyl_memory_budget(self):  # Least recently used values are evicted
+    from postgkyl.commands import DataSpace
+    files = [f"{self.dir_path:s}/hll-euler.gkyl"] * 3
+    space = DataSpace(max_memory=parse_size("250K"))
+    for dat in pg.GData.load_many(files, load=False):
+      space.add(dat)
+    # end
+    datasets = list(space.iterator())
+    # Computed values are spilled instead of dropped
+    datasets[0].push(datasets[0].get_grid(), 2.0 * datasets[0].values)
+    for dat in space.iterator():
+      assert dat.values.shape == (50, 50, 5)
+    # end
+    assert space.get_nbytes() <= parse_size("250K")
+    assert datasets[0]._spill_file and not datasets[0].is_loaded()
+    np.testing.assert_array_equal(datasets[0].values, 2.0 * datasets[1].values)
+
+  def test_gkyl_memory_budget_many(self, monkeypatch):  # Each frame is evicted once
+    from postgkyl.commands import DataSpace
+    files = [f"{self.dir_path:s}/hll-euler.gkyl"] * 200
+    space = DataSpace(max_memory=parse_size("500K"))
+    for dat in pg.GData.load_many(files, load=False):
+      space.add(dat)
+    # end
+    evicted = []
+    evict = pg.GData.evict
+    monkeypatch.setattr(pg.GData, "evict",
+        lambda dat, *args: evicted.append(dat) or evict(dat, *args))
+    for dat in space.iterator():
+      dat.get_values()
+      assert space.get_nbytes() <= parse_size("500K") + dat.get_nbytes()
+    # end
+    assert space.get_nbytes() <= parse_size("500K")
+    # The budget is exceeded by every frame after the fifth one
+    assert len(evicted) == len(files) - 5
+
+  def test_gkyl_data_space_index(self):  # Datasets are looked up by frame and time
+    from postgkyl.commands import DataSpace
+    space = DataSpace()
+    for i in range(6):
+      dat = pg.GData(tag="elc" if i % 2 else "ion")
+      dat.ctx["frame"], dat.ctx["time"] = i // 2, 0.5 * (i // 2)
+      space.add(dat)
+    # end
+    with pytest.raises(AttributeError):
+      dat.spam = "eggs"  # GData uses slots
+    # end
+    assert len(space.get_frame(1)) == 2 and len(space.get_frame(1, "elc")) == 1
+    assert space.get_time(0.6, "ion")[0].ctx["frame"] == 1
+    assert space.get_time(10.0)[0].ctx["frame"] == 2
+    space.get_frame(2, "ion")[0].deactivate()
+    assert space.get_frame(2, "ion") == [] and space.get_num_datasets() == 5
+    assert space.get_num_datasets(only_active=False) == 6
+    space.deactivate_all("ion")
+    assert list(space.tag_iterator()) == ["elc"]
+    space.activate_all("ion")
+    assert [dat.ctx["frame"] for dat in space.iterator("ion", select="1:")] == [1, 2]
+    # The active counts follow the status changes and the added datasets
+    assert space.get_num_datasets() == 6
+    dat.deactivate()
+    space.add(pg.GData(tag="neut"))
+    assert space.get_num_datasets() == 6 and space.get_num_datasets("elc") == 2
+    assert list(space.tag_iterator()) == ["ion", "elc", "neut"]
+
+  def test_gkyl_stack(self):  # Frames are read into a single time-stacked array
+    files = [f"{self.dir_path:s}/hll-euler.gkyl"] * 3
+    frames = pg.GData.load_many(files, load=False)
+    full = pg.GData(files[0])
+    out = pg.GData.stack(frames, time=[0.0, 1.0, 2.0], prefetch=2, tag="stack")
+    assert out.get_values().shape == (3, 50, 50, 5) and out.get_tag() == "stack"
+    np.testing.assert_array_equal(out.get_grid()[0], [0.0, 1.0, 2.0])
+    np.testing.assert_array_equal(out.get_values()[2], full.get_values())
+    # The frames are views into the stack and their memory is counted only once
+    assert np.shares_memory(frames[1].get_values(), out.get_values())
+    assert frames[1].get_nbytes() == 0 and out.get_nbytes() == 3 * full.get_nbytes()
+    with pytest.raises(ValueError):
+      pg.GData.stack([full, pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl")])
+    # end
+
+  def test_gkyl_write_float32(self, tmp_path):  # Single precision round trip
+    data = pg.GData(f"{self.dir_path:s}/twostream-f-p2.gkyl", dtype="float32")
+    data.write(out_name=str(tmp_path / "out.gkyl"))
+    out = pg.GData(str(tmp_path / "out.gkyl"))
+    assert out.values.dtype == np.float32
+    np.testing.assert_array_equal(out.values, data.values)
+    np.testing.assert_allclose(out.bounds, data.bounds)
+
+  def test_gkyl_iter_slabs(self):  # Slabs are read without loading the whole values
+    full = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl")
+    data = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl", load=False)
+    slabs = list(data.iter_slabs(max_bytes=7 * 50 * 5 * 8, comp="1:3"))
+    assert len(slabs) == 8 and not data.is_loaded()
+    np.testing.assert_array_equal(np.concatenate([v for _, v in slabs]), full.values[..., 1:3])
+    np.testing.assert_allclose(slabs[1][0][0], full.grid[0][7:15])
+    assert data.info(max_bytes=10000) == full.info()
+    grid, values = pg.tools.integrate(data, "1", max_bytes=10000)
+    ref_grid, ref_values = pg.tools.integrate(full, "1")
+    np.testing.assert_allclose(values, ref_values)
+    np.testing.assert_allclose(grid[0], ref_grid[0])
+    assert not data.is_loaded()
+
+  def test_gkyl_iter_slabs_c2p(self):  # Streamed slabs cut the mapped grid
+    file_name = f"{self.dir_path:s}/shock-f-ser-p1.gkyl"
+    c2p_name = f"{self.dir_path:s}/shock-rtheta-ser.gkyl"
+    full = pg.GData(file_name, mapc2p_name=c2p_name)
+    data = pg.GData(file_name, mapc2p_name=c2p_name, load=False)
+    for axis in (0, 1):
+      chunks = list(zip(data.iter_chunks(axis, 4), full.iter_chunks(axis, 4)))
+      assert len(chunks) == 2
+      for (grid, values), (ref_grid, ref_values) in chunks:
+        np.testing.assert_array_equal(values, ref_values)
+        for coord, ref_coord in zip(grid, ref_grid):
+          assert coord.shape == ref_coord.shape
+          np.testing.assert_array_equal(coord, ref_coord)
+        # end
+      # end
+    # end
+    assert not data.is_loaded()
+
+  def test_gkyl_steps(self):  # Single-step files yield the dataset itself
+    data = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl")
+    assert data.get_num_steps() == 1
+    assert list(data.iter_steps()) == [data]
+    stacked = data.stack_steps()
+    assert stacked.values.shape == (1,) + data.values.shape
+    np.testing.assert_array_equal(stacked.grid[0], [data.ctx["time"]])
+
+  def test_gkyl_prefetch(self):  # Frames are read ahead and released afterwards
+    files = [f"{self.dir_path:s}/hll-euler.gkyl", f"{self.dir_path:s}/twostream-f-p2.gkyl"] * 3
+    datasets = pg.GData.load_many(files, load=False)
+    out = list(pg.data.prefetch(datasets, depth=2, release=True))
+    assert out == datasets and not any(dat.is_loaded() for dat in datasets)
+    frames = pg.data.FramePrefetcher([[dat] for dat in datasets], depth=2)
+    np.testing.assert_array_equal(frames[4][0].values, pg.GData(files[4]).values)
+    frames[5]
+    frames.close()  # wait for the reads of the frames 0 and 1
+    assert [dat.is_loaded() for dat in datasets] == [True, True, False, False, False, True]
+
+  def test_gkyl_prefetch_memory_budget(self, monkeypatch):  # Prefetched frames are pinned
+    from postgkyl.commands import DataSpace
+    files = [f"{self.dir_path:s}/hll-euler.gkyl"] * 8
+    space = DataSpace(max_memory=parse_size("50K"))  # --max-memory 50K, below a frame
+    for dat in pg.GData.load_many(files, load=False):
+      space.add(dat)
+    # end
+    evicted = []
+    evict = pg.GData.evict
+    monkeypatch.setattr(pg.GData, "evict",
+        lambda dat, *args: evicted.append(id(dat) in space._pinned) or evict(dat, *args))
+    for dat in space.iterator(prefetch=2):  # --prefetch 2
+      space.enforce_memory()  # e.g., values read by the command
+      assert dat.is_loaded()  # read ahead and not evicted before it is processed
+    # end
+    assert not any(evicted) and not space._pinned
+    assert not any(dat.is_loaded() for dat in space.iterator())
+
+  def test_gkyl_stats_compute(self):  # Single and slab-wise passes agree with NumPy
+    full = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl")
+    vals = full.get_values()
+    st = pg.data.stats.compute_stats([vals])
+    np.testing.assert_allclose(st["min"], np.nanmin(vals, axis=(0, 1)))
+    np.testing.assert_allclose(st["mean"], np.mean(vals, axis=(0, 1)))
+    np.testing.assert_allclose(st["l2"], np.sqrt(np.sum(vals**2, axis=(0, 1))))
+    slab_st = pg.data.stats.compute_stats(v for _, v in full.iter_chunks(chunk_size=7))
+    for key in ("min", "max", "argmin", "argmax", "nan_count"):
+      assert slab_st[key] == st[key]
+    # end
+    np.testing.assert_allclose(slab_st["l2"], st["l2"])
+
+  def test_gkyl_stats_extremes(self):  # First occurrence, NaNs skipped, complex values
+    vals = pg.GData(f"{self.dir_path:s}/hll-euler.gkyl").get_values().copy()
+    vals[0, 0, 1] = np.nan
+    vals[3, 5, 0] = vals[7, 2, 4] = 10.0
+    maximum, max_idx, minimum, min_idx = pg.data.stats.get_extremes(
+        pg.data.stats.compute_stats([vals], workers=2, block_bytes=1000))
+    assert maximum == 10.0 and max_idx == (3, 5, 0)
+    assert minimum == np.nanmin(vals)
+    assert min_idx == np.unravel_index(np.nanargmin(vals), vals.shape)
+    # Complex values (e.g., 'fft' output) keep the imaginary parts
+    cvals = vals * (1.0 - 5.0j)
+    cvals[4, 4, 2] = 10.0 + 1.0j
+    data = pg.GData(ctx={"grid_type": "uniform"}).push([np.linspace(0, 1, 51)] * 2, cvals)
+    maximum, max_idx, minimum, min_idx = pg.data.stats.get_extremes(
+        data.get_stats(build=True))
+    assert maximum == np.nanmax(cvals) and maximum.imag == 1.0
+    assert max_idx == np.unravel_index(np.nanargmax(cvals), cvals.shape)
+    assert min_idx == np.unravel_index(np.nanargmin(cvals), cvals.shape)
+    assert "+1.000000e+00j" in data.info()
+
+  def test_gkyl_stats_index(self, tmp_path):  # Sidecar statistics replace the value passes
+    shutil.copy(f"{self.dir_path:s}/hll-euler.gkyl", tmp_path / "sim_0.gkyl")
+    full = pg.GData(str(tmp_path / "sim_0.gkyl"))
+    assert full.get_stats() is None
+    st = full.get_stats(build=True)
+    vals = full.values
+    assert os.path.isfile(tmp_path / pg.data.stats.StatsIndex.index_name)
+    # The stored statistics are used without reading the values
+    data = pg.GData(str(tmp_path / "sim_0.gkyl"), load=False)
+    assert data.get_stats() == st
+    assert data.info() == full.info()
+    assert data.get_value_range() == (np.nanmin(vals), np.nanmax(vals))
+    assert not data.is_loaded()
+    # Partial loads are not served from the index
+    assert pg.GData(str(tmp_path / "sim_0.gkyl"), z0="1:").get_stats() is None
+
+  def test_gkyl_stats_save_failure(self, tmp_path, monkeypatch):  # No temporary files left
+    monkeypatch.setenv("PGKYL_CACHE_DIR", str(tmp_path / "cache"))
+    index = pg.data.stats.StatsIndex(str(tmp_path))
+    index.entries["sim_0.gkyl"] = {"stats": object()}  # not serializable
+    assert not index.save()
+    assert [p.name for p in tmp_path.rglob("*") if p.is_file()] == []
+
+  def test_gkyl_catalog(self, tmp_path):  # Frame selection from the directory index
+    for i in range(4):
+      src = "twostream-f-p2.gkyl" if i < 2 else "hll-euler.gkyl"
+      shutil.copy(f"{self.dir_path:s}/{src:s}", tmp_path / f"sim-elc_{i:d}.gkyl")
+    # end
+    shutil.copy(f"{self.dir_path:s}/hll-euler.gkyl", tmp_path / "sim-elc_restart.gkyl")
+    cat = pg.data.Catalog(str(tmp_path), save=True)
+    assert cat.get_stems() == ["sim-elc"]
+    assert cat.get_frames("sim-elc") == [0, 1, 2, 3]
+    assert cat.get_frames("sim-elc", frames="1:") == [1, 2, 3]
+    assert cat.get_frames("sim-elc", frames="0,3") == [0, 3]
+    assert not any(e["header"] for e in cat.entries.values())  # names only so far
+    assert cat.get_frames("sim-elc", time="0.5:1") == [2, 3]
+    entry = cat.get_entry("sim-elc_2.gkyl")
+    assert entry["shape"] == [50, 50, 5] and entry["file_type"] == 3
+    # The stored index is reused
+    assert os.path.isfile(tmp_path / cat.index_name)
+    assert not pg.data.Catalog(str(tmp_path), update=False).update()
+    os.remove(tmp_path / "sim-elc_0.gkyl")
+    assert pg.data.Catalog(str(tmp_path)).get_frames("sim-elc") == [1, 2, 3]
+
+  def test_gkyl_reader_sniff(self, tmp_path):  # Readers are selected from the signature
+    registry = pg.data.reader_registry
+    assert registry.sniff(f"{self.dir_path:s}/hll-euler.gkyl")[0] == "gkyl"
+    candidates = registry.sniff(f"{self.dir_path:s}/twostream-f-p1.bp")
+    assert "gkyl" not in candidates and "h5" not in candidates
+    for i in range(2):
+      shutil.copy(f"{self.dir_path:s}/hll-euler.gkyl", tmp_path / f"sim-elc_{i:d}.gkyl")
+      pg.GData(str(tmp_path / f"sim-elc_{i:d}.gkyl"), load=False)
+    # end
+    assert registry._decisions[registry._get_family(str(tmp_path / "sim-elc_7.gkyl"))] == "gkyl"
+
+    class TextReader(object):
+      def __init__(self, file_name, ctx=None, **kwargs):
+        self.file_name, self.ctx = file_name, ctx
+      def is_compatible(self):
+        return True
+      def preload(self):
+        pass
+      def load(self):
+        values = np.loadtxt(self.file_name, skiprows=1)[:, np.newaxis]
+        return [np.arange(values.shape[0] + 1.0)], values
+    # end
+
+    (tmp_path / "profile.txt").write_text("#text\n1.0\n2.0\n3.0\n")
+    registry.register_reader("text", TextReader, magic=(b"#text",))
+    try:
+      assert registry.sniff(str(tmp_path / "profile.txt"))[0] == "text"
+      data = pg.GData(str(tmp_path / "profile.txt"))
+      np.testing.assert_array_equal(data.get_values()[:, 0], [1.0, 2.0, 3.0])
+    finally:
+      del registry._readers["text"]
+    # end
+
+
+class TestH5:
+  """Test legacy Gkeyll HDF5 and FLASH formats."""
+
+  tables_missing = importlib.util.find_spec("tables") is None
+
+  def _write_gkyl_h5(self, file_name, values):
+    import tables
+    with tables.open_file(file_name, "w") as fh:
+      grid = fh.create_group("/", "StructGrid")
+      grid._v_attrs.vsLowerBounds = np.zeros(2)
+      grid._v_attrs.vsUpperBounds = np.ones(2)
+      grid._v_attrs.vsNumCells = np.array(values.shape[:2])
+      fh.create_array("/", "StructGridField", values)
+    # end
+
+  def _write_flash(self, file_name, values):
+    # 2x2 coarse blocks; the first one is refined into 2x2 blocks
+    coords, sizes, types = [], [], []
+    for cx, cy in ((0.5, 0.5), (0.5, 1.5), (1.5, 0.5), (1.5, 1.5)):
+      coords.append((cx, cy, 0))
+      sizes.append((1, 1, 0))
+      types.append(2 if cx == cy == 0.5 else 1)
+    # end
+    for cx, cy in ((0.25, 0.25), (0.25, 0.75), (0.75, 0.25), (0.75, 0.75)):
+      coords.append((cx, cy, 0))
+      sizes.append((0.5, 0.5, 0))
+      types.append(1)
+    # end
+    import tables
+    with warnings.catch_warnings(), tables.open_file(file_name, "w") as fh:
+      warnings.simplefilter("ignore", tables.NaturalNameWarning)
+      fh.create_array("/", "coordinates", np.array(coords, dtype=float))
+      fh.create_array("/", "block size", np.array(sizes, dtype=float))
+      fh.create_array("/", "node type", np.array(types, dtype=np.int32))
+      fh.create_array("/", "dens", values)
+    # end
+
+  @pytest.mark.skipif(tables_missing, reason="PyTables is not installed")
+  def test_h5_frame_partial(self, tmp_path):  # Cuts are read as hyperslabs
+    values = np.random.rand(8, 6, 3)
+    self._write_gkyl_h5(str(tmp_path / "frame.h5"), values)
+    full = pg.GData(str(tmp_path / "frame.h5"), reader_name="h5")
+    np.testing.assert_array_equal(full.values, values)
+    data = pg.GData(str(tmp_path / "frame.h5"), reader_name="h5", z0="2:5", z1=4, comp=1)
+    np.testing.assert_array_equal(data.values, values[2:5, 4:5, 1:2])
+    np.testing.assert_allclose(data.grid[0], full.grid[0][2:6])
+    np.testing.assert_allclose(data.grid[1], full.grid[1][4:6])
+
+  @pytest.mark.skipif(tables_missing, reason="PyTables is not installed")
+  def test_h5_frame_negative(self, tmp_path):  # Negative indices count from the end
+    values = np.random.rand(8, 6, 3)
+    self._write_gkyl_h5(str(tmp_path / "frame.h5"), values)
+    data = pg.GData(str(tmp_path / "frame.h5"), reader_name="h5", z0="-1", z1=":-2")
+    np.testing.assert_array_equal(data.values, values[-1:, :-2])
+    data = pg.GData(str(tmp_path / "frame.h5"), reader_name="h5", z0="-3:", comp=-1)
+    np.testing.assert_array_equal(data.values, values[-3:, :, -1:])
+
+  @pytest.mark.skipif(tables_missing, reason="PyTables is not installed")
+  def test_flash_partial(self, tmp_path):  # Blocks outside of the cut are skipped
+    values = np.random.rand(8, 1, 4, 4)
+    self._write_flash(str(tmp_path / "flash.h5"), values)
+    full = pg.GData(str(tmp_path / "flash.h5"), var_name="dens", reader_name="flash")
+    assert full.values.shape == (16, 16, 1)
+    # Cells of the coarse blocks are repeated on the finest grid
+    assert full.values[9, 9, 0] == values[3, 0, 0, 0]
+    data = pg.GData(str(tmp_path / "flash.h5"), var_name="dens", reader_name="flash",
+        z0="2:6", z1=3)
+    np.testing.assert_array_equal(data.values, full.values[2:6, 3:4])
+    np.testing.assert_allclose(data.grid[0], full.grid[0][2:7])
+
+
 class TestAdios:
   """Test Gkeyll's ADIOS2 output format."""
   dir_path =  f"{os.path.dirname(__file__)}/test_data"
@@ -66,6 +532,14 @@ class TestAdios:
     data = pg.GData(f"{self.dir_path:s}/twostream-f-p2_0.bp", z0=32, comp=0)
     np.testing.assert_array_equal(data.values.shape, (1, 32, 1))
 
+  @pytest.mark.skipif(adios_missing, reason="ADIOS2 is not installed")
+  def test_adios_steps(self):
+    data = pg.GData(f"{self.dir_path:s}/twostream-f-p2_0.bp", load=False)
+    steps = list(data.iter_steps("0:1"))
+    assert len(steps) == data.get_num_steps() == 1
+    np.testing.assert_array_equal(steps[0].values, data.values)
+    np.testing.assert_array_equal(data.stack_steps().values[0], data.values)
+
   @pytest.mark.skipif(adios_missing, reason="ADIOS2 is not installed")
   def test_adios_dynvector(self):
     data = pg.GData(f"{self.dir_path:s}/twostream-field-energy.bp")